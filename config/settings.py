@@ -122,7 +122,7 @@ LOGGING = {
     "disable_existing_loggers": False,
     "formatters": {
         "structured": {
-            "format": '{"timestamp": "%(asctime)s", "level": "%(levelname)s", "logger": "%(name)s", "message": "%(message)s", "module": "%(module)s", "function": "%(funcName)s", "line": "%(lineno)d"}',
+            "()": "magasin.log_formatter.OrjsonFormatter",
         },
         "verbose": {
             "format": "{levelname} {asctime} {module} {process:d} {thread:d} {message}",
@@ -158,6 +158,9 @@ LOGGING = {
     },
 }
 
+# Préchauffage des connexions Kong au démarrage (voir magasin/apps.py)
+MAGASIN_WARMUP = os.getenv("MAGASIN_WARMUP", "false").lower() == "true"
+
 # Configuration du cache Redis
 CACHES = {
     "default": {
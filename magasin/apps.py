@@ -0,0 +1,30 @@
+import logging
+import threading
+
+from django.apps import AppConfig
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+def prechauffer_clients():
+    """Ouvre une connexion keep-alive vers Kong pour chaque session partagée"""
+    from magasin.infrastructure.catalogue_client import CatalogueClient
+    from magasin.infrastructure.commandes_client import CommandesClient
+    from magasin.infrastructure.ecommerce_client import EcommerceClient
+
+    for client in (CatalogueClient(), CommandesClient(), EcommerceClient()):
+        client.prechauffer()
+    logger.info("Connexions Kong préchauffées")
+
+
+class MagasinConfig(AppConfig):
+    name = "magasin"
+    verbose_name = "Frontend Magasin (orchestrateur)"
+
+    def ready(self):
+        # Thread daemon: un Kong indisponible ne bloque pas le démarrage
+        if getattr(settings, "MAGASIN_WARMUP", False):
+            threading.Thread(
+                target=prechauffer_clients, name="magasin-warmup", daemon=True
+            ).start()
@@ -0,0 +1,447 @@
+"""
+Utilitaires HTTP partagés par les clients de l'infrastructure
+Configuration du pool de connexions keep-alive vers Kong API Gateway
+et client de base commun (appel, décodage, journalisation des erreurs)
+"""
+
+import contextvars
+import logging
+import os
+import sys
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import wraps
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import orjson
+import requests
+from django.core.cache import cache
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+# Clé API Kong lue une seule fois: rotation sans modifier le code
+API_KEY = os.getenv("MAGASIN_API_KEY", "magasin-secret-key-2025")
+
+# Content-Type n'est envoyé qu'avec un corps JSON (voir _BaseHttpClient._request)
+DEFAULT_HEADERS = {
+    "Accept": "application/json",
+    "X-API-Key": API_KEY,
+}
+JSON_CONTENT_TYPE = {"Content-Type": "application/json"}
+
+# Taille du pool: le défaut de requests (10) sature sous charge concurrente
+POOL_CONNECTIONS = 32
+POOL_MAXSIZE = 64
+
+# Pool de threads partagé pour les appels concurrents (I/O: le GIL est relâché)
+_EXECUTOR = ThreadPoolExecutor(max_workers=16, thread_name_prefix="magasin-http")
+
+# Timeout (connexion, lecture) par défaut: un service lent ne doit pas bloquer
+# indéfiniment un thread Django. Pire cas d'un GET avec retentatives:
+# 4 x (1 s + 5 s) + backoff (0 + 0.5 + 1 s)
+DEFAULT_TIMEOUT = (1.0, 5.0)
+
+# Taille des blocs lus sur les grosses réponses en flux (stocks, magasins)
+TAILLE_BLOC_FLUX = 64 * 1024
+
+# Seules les méthodes idempotentes sont rejouées automatiquement: les POST
+# (création de demande, validation avec rollback, mouvements de stock) ne le
+# sont jamais, les PUT d'approbation/rejet le sont
+RETRY_METHODS = frozenset(["GET", "PUT", "DELETE"])
+RETRY_STATUS = (502, 503, 504)
+# Backoff exponentiel tronqué: 0 s, 0.5 s, 1 s (plafond 2 s)
+RETRY_TOTAL = 3
+RETRY_BACKOFF_FACTOR = 0.25
+RETRY_BACKOFF_MAX = 2.0
+
+
+def creer_adaptateur() -> HTTPAdapter:
+    """
+    HTTPAdapter dimensionné pour Kong avec retentatives courtes
+    sur les erreurs transitoires de la passerelle
+    """
+    retry = Retry(
+        total=RETRY_TOTAL,
+        backoff_factor=RETRY_BACKOFF_FACTOR,
+        backoff_max=RETRY_BACKOFF_MAX,
+        status_forcelist=RETRY_STATUS,
+        allowed_methods=RETRY_METHODS,
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    return HTTPAdapter(
+        pool_connections=POOL_CONNECTIONS,
+        pool_maxsize=POOL_MAXSIZE,
+        max_retries=retry,
+    )
+
+
+def configurer_session(session: requests.Session) -> requests.Session:
+    """
+    Monte l'adaptateur dimensionné sur http/https et force le keep-alive
+    """
+    adapter = creer_adaptateur()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers["Connection"] = "keep-alive"
+    return session
+
+
+def construire_session() -> requests.Session:
+    """
+    Session destinée à être partagée par toutes les instances d'un client:
+    le pool keep-alive survit ainsi d'une requête Django à l'autre
+    """
+    session = requests.Session()
+    session.headers.update(DEFAULT_HEADERS)
+    return configurer_session(session)
+
+
+def decoder_json(response: requests.Response) -> Any:
+    """
+    Décode le corps JSON avec orjson (2 à 5x plus rapide que json.loads)
+    Une réponse invalide lève requests.JSONDecodeError comme response.json()
+    """
+    try:
+        return orjson.loads(response.content)
+    except orjson.JSONDecodeError as e:
+        raise requests.exceptions.JSONDecodeError(e.msg, e.doc, e.pos)
+
+
+def decoder_json_en_flux(response: requests.Response) -> Any:
+    """
+    Décode une réponse obtenue avec stream=True, lue par blocs de 64 Ko
+    Moins d'itérations que response.content (blocs de 10 Ko) sur les grosses
+    listes, et pas de copie texte intermédiaire avant le décodage
+    """
+    try:
+        return orjson.loads(b"".join(response.iter_content(TAILLE_BLOC_FLUX)))
+    except orjson.JSONDecodeError as e:
+        raise requests.exceptions.JSONDecodeError(e.msg, e.doc, e.pos)
+
+
+def decoder_reponse_ecriture(response: requests.Response) -> Any:
+    """
+    Décode la réponse d'une écriture (suppression, approbation, validation)
+    Un 204 ou un corps vide est un succès: aucun passage par le décodeur
+    """
+    if response.status_code == 204 or not response.content:
+        return {"success": True}
+    return decoder_json(response)
+
+
+def encoder_json(data: Any) -> bytes:
+    """Sérialise un corps de requête avec orjson (bytes prêts à l'envoi)"""
+    return orjson.dumps(data)
+
+
+class _BaseHttpClient:
+    """
+    Base des clients HTTP vers Kong
+    Centralise l'appel, la vérification du statut, le décodage JSON et la
+    journalisation des erreurs: toute optimisation du transport se fait ici
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        session: requests.Session,
+        timeout: Tuple[float, float] = DEFAULT_TIMEOUT,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.session = session
+        self.timeout = timeout
+
+    def _request(
+        self,
+        method: str,
+        path: str,
+        *,
+        params: Optional[Dict[str, Any]] = None,
+        json: Any = None,
+    ) -> Tuple[bool, Any]:
+        """
+        Exécute `method path` relativement à base_url
+
+        Returns:
+            (True, corps JSON décodé) ou (False, exception RequestException)
+        """
+        kwargs = {"timeout": self.timeout}
+        if params is not None:
+            kwargs["params"] = params
+        if json is not None:
+            kwargs["data"] = encoder_json(json)
+            kwargs["headers"] = JSON_CONTENT_TYPE
+        try:
+            envoyer = getattr(self.session, method.lower())
+            response = envoyer(f"{self.base_url}{path}", **kwargs)
+            response.raise_for_status()
+            return True, decoder_json(response)
+        except requests.exceptions.RequestException as e:
+            logging.getLogger(type(self).__module__).error(
+                "Erreur %s (%s %s): %s",
+                sys._getframe(1).f_code.co_name,
+                method,
+                path,
+                e,
+            )
+            return False, e
+
+    def prechauffer(self) -> bool:
+        """
+        Ouvre une connexion keep-alive du pool (HEAD, réponse ignorée)
+        La première vraie requête ne paie plus l'établissement TCP
+        """
+        try:
+            self.session.head(self.base_url, timeout=self.timeout).close()
+            return True
+        except requests.exceptions.RequestException as e:
+            logging.getLogger(type(self).__module__).warning(
+                "Préchauffage %s impossible: %s", self.base_url, e
+            )
+            return False
+
+
+# Mémo des réponses pour la requête Django en cours (posé par le middleware):
+# un même GET appelé deux fois pendant un rendu ne repart pas sur le réseau
+_memo_requete: "contextvars.ContextVar[Optional[dict]]" = contextvars.ContextVar(
+    "memo_requete", default=None
+)
+
+
+def activer_memo_requete(memo: Optional[dict]) -> None:
+    """Associe (ou retire avec None) le mémo de la requête au contexte courant"""
+    _memo_requete.set(memo)
+
+
+def _invalider_memo(prefixes) -> None:
+    memo = _memo_requete.get()
+    if memo:
+        for cle in [c for c in memo if c[0] in prefixes]:
+            del memo[cle]
+
+
+def executer_en_parallele(*appels: Callable[[], Any]) -> List[Any]:
+    """
+    Exécute des appels HTTP indépendants de façon concurrente
+    Le temps total passe de la somme des RTT au RTT le plus long;
+    les résultats sont retournés dans l'ordre des appels
+    """
+    if len(appels) <= 1:
+        return [appel() for appel in appels]
+    # Chaque appel hérite du contexte (mémo de la requête) du thread appelant
+    futures = [
+        _EXECUTOR.submit(contextvars.copy_context().run, appel) for appel in appels
+    ]
+    return [future.result() for future in futures]
+
+
+class _CacheTTL:
+    """
+    Cache LRU en mémoire avec expiration, partagé par les threads du processus
+    Les clés sont préfixées par service pour permettre l'invalidation ciblée
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        self._maxsize = maxsize
+        self._donnees: "OrderedDict[tuple, tuple]" = OrderedDict()
+        self._lock = threading.RLock()
+
+    def get(self, cle: tuple) -> Optional[Any]:
+        with self._lock:
+            entree = self._donnees.get(cle)
+            if entree is None:
+                return None
+            expiration, valeur = entree
+            if expiration < time.monotonic():
+                del self._donnees[cle]
+                return None
+            self._donnees.move_to_end(cle)
+            return valeur
+
+    def set(self, cle: tuple, valeur: Any, ttl: float) -> None:
+        with self._lock:
+            self._donnees[cle] = (time.monotonic() + ttl, valeur)
+            self._donnees.move_to_end(cle)
+            while len(self._donnees) > self._maxsize:
+                self._donnees.popitem(last=False)
+
+    def invalider(self, prefixe: Optional[str] = None) -> None:
+        with self._lock:
+            if prefixe is None:
+                self._donnees.clear()
+                return
+            for cle in [c for c in self._donnees if c[0] == prefixe]:
+                del self._donnees[cle]
+
+
+_cache = _CacheTTL()
+
+
+class _Singleflight:
+    """
+    Un seul appel en vol par clé: les threads qui demandent la même ressource
+    pendant qu'elle est chargée attendent ce résultat au lieu de rappeler Kong
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._en_vol: Dict[Any, Future] = {}
+
+    def executer(self, cle: Any, appel: Callable[[], Any]) -> Any:
+        with self._lock:
+            future = self._en_vol.get(cle)
+            proprietaire = future is None
+            if proprietaire:
+                future = Future()
+                self._en_vol[cle] = future
+        if not proprietaire:
+            return future.result()
+        try:
+            resultat = appel()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(resultat)
+            return resultat
+        finally:
+            with self._lock:
+                del self._en_vol[cle]
+
+
+_singleflight = _Singleflight()
+
+
+def _est_cachable(resultat: Any) -> bool:
+    """Les réponses d'erreur (ou vides) ne sont jamais mises en cache"""
+    if isinstance(resultat, dict) and resultat.get("success") is False:
+        return False
+    return bool(resultat)
+
+
+def cache_ttl(prefixe: str, ttl: float = 30):
+    """
+    Met en cache le résultat d'une méthode GET idempotente pendant `ttl` secondes
+    Clé = (service, méthode, arguments)
+    """
+
+    def decorateur(methode):
+        @wraps(methode)
+        def wrapper(self, *args, **kwargs):
+            cle = (prefixe, methode.__name__, args, frozenset(kwargs.items()))
+            memo = _memo_requete.get()
+            try:
+                resultat = memo.get(cle) if memo else None
+                if resultat is None:
+                    resultat = _cache.get(cle)
+            except TypeError:
+                # Arguments non hachables: pas de cache
+                return methode(self, *args, **kwargs)
+            if resultat is not None:
+                logger.debug("cache_hit %s.%s", prefixe, methode.__name__)
+                return resultat
+            logger.debug("cache_miss %s.%s", prefixe, methode.__name__)
+            resultat = _singleflight.executer(
+                cle, lambda: methode(self, *args, **kwargs)
+            )
+            if _est_cachable(resultat):
+                _cache.set(cle, resultat, ttl)
+                if memo is not None:
+                    memo[cle] = resultat
+            return resultat
+
+        return wrapper
+
+    return decorateur
+
+
+def invalider_cache(prefixe: Optional[str] = None) -> None:
+    """Invalide les entrées d'un service (ou tout le cache)"""
+    _cache.invalider(prefixe)
+    if prefixe is None:
+        memo = _memo_requete.get()
+        if memo:
+            memo.clear()
+    else:
+        _invalider_memo((prefixe,))
+
+
+def _version_cache_partage(prefixe: str) -> str:
+    """
+    Jeton de version d'un service dans Redis: l'invalider revient à le
+    remplacer, sans parcourir ni supprimer les clés existantes (elles expirent)
+    """
+    cle = f"{prefixe}:version"
+    version = cache.get(cle)
+    if version is None:
+        version = uuid.uuid4().hex
+        if not cache.add(cle, version, timeout=None):
+            version = cache.get(cle)
+    return version
+
+
+def cache_partage(prefixe: str, ttl: int = 15):
+    """
+    Cache read-through Redis (cache Django "default") d'une méthode GET
+    Partagé par tous les workers; un Redis indisponible dégrade vers l'appel HTTP
+    Clé = service:version:méthode:arguments
+    """
+
+    def decorateur(methode):
+        @wraps(methode)
+        def wrapper(self, *args, **kwargs):
+            memo = _memo_requete.get()
+            cle_memo = (prefixe, methode.__name__, repr(args), repr(kwargs))
+            if memo and cle_memo in memo:
+                return memo[cle_memo]
+            try:
+                cle = "{}:{}:{}:{!r}:{!r}".format(
+                    prefixe,
+                    _version_cache_partage(prefixe),
+                    methode.__name__,
+                    args,
+                    sorted(kwargs.items()),
+                )
+                resultat = cache.get(cle)
+            except Exception as e:
+                logger.warning("Cache partagé indisponible (%s): %s", prefixe, e)
+                return methode(self, *args, **kwargs)
+            if resultat is not None:
+                logger.debug("cache_hit %s.%s", prefixe, methode.__name__)
+                if memo is not None:
+                    memo[cle_memo] = resultat
+                return resultat
+            logger.debug("cache_miss %s.%s", prefixe, methode.__name__)
+            resultat = _singleflight.executer(
+                cle, lambda: methode(self, *args, **kwargs)
+            )
+            if _est_cachable(resultat):
+                if memo is not None:
+                    memo[cle_memo] = resultat
+                try:
+                    cache.set(cle, resultat, ttl)
+                except Exception as e:
+                    logger.warning("Cache partagé indisponible (%s): %s", prefixe, e)
+            return resultat
+
+        return wrapper
+
+    return decorateur
+
+
+def invalider_cache_partage(*prefixes: str) -> None:
+    """Invalide les entrées Redis des services donnés en un seul aller-retour"""
+    _invalider_memo(prefixes)
+    try:
+        cache.set_many(
+            {f"{prefixe}:version": uuid.uuid4().hex for prefixe in prefixes},
+            timeout=None,
+        )
+    except Exception as e:
+        logger.warning("Invalidation du cache partagé impossible: %s", e)
@@ -5,44 +5,52 @@ Communication avec les endpoints DDD du service-catalogue
 
 import requests
 import logging
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
+
+from magasin.infrastructure._http import (
+    DEFAULT_TIMEOUT,
+    _BaseHttpClient,
+    cache_ttl,
+    construire_session,
+    invalider_cache,
+)
 
 logger = logging.getLogger(__name__)
 
 BASE_URL = "http://kong:8000/api/catalogue"
 
+# Session partagée par toutes les instances du client (pool keep-alive)
+_SESSION = construire_session()
+
+
+def set_session(session: requests.Session) -> None:
+    """Remplace la session partagée (tests, configuration spécifique)"""
+    global _SESSION
+    _SESSION = session
+
 
-class CatalogueClient:
+class CatalogueClient(_BaseHttpClient):
     """
     Client HTTP pour communiquer avec le service-catalogue
     Encapsule tous les appels REST vers les endpoints DDD
     """
 
-    def __init__(self, base_url: str = BASE_URL):
-        self.base_url = base_url.rstrip("/")
-        self.session = requests.Session()
-        self.session.headers.update(
-            {
-                "Content-Type": "application/json",
-                "Accept": "application/json",
-                "X-API-Key": "magasin-secret-key-2025",  # Clé API Kong
-            }
-        )
+    def __init__(
+        self,
+        base_url: str = BASE_URL,
+        timeout: Tuple[float, float] = DEFAULT_TIMEOUT,
+    ):
+        super().__init__(base_url, _SESSION, timeout)
 
     def health_check(self) -> Dict[str, Any]:
         """
         GET /api/ddd/catalogue/health-check/
         Vérification de l'état du service catalogue
         """
-        try:
-            response = self.session.get(
-                f"{self.base_url}/api/ddd/catalogue/health-check/"
-            )
-            response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Erreur health check catalogue: {e}")
-            return {"status": "error", "message": str(e)}
+        ok, resultat = self._request("GET", "/api/ddd/catalogue/health-check/")
+        if ok:
+            return resultat
+        return {"status": "error", "message": str(resultat)}
 
     def rechercher_produits(
         self,
@@ -58,38 +66,34 @@ class CatalogueClient:
         Use Case: RechercherProduitsUseCase
         """
         logger.info("🔍 Client API: Recherche produits avec critères")
-        try:
-            params = {}
-
-            # Si des critères sont fournis, les utiliser
-            if criteres:
-                params.update(criteres)
-            else:
-                # Sinon, utiliser les paramètres individuels
-                if nom:
-                    params["nom"] = nom
-                if categorie_id:
-                    params["categorie_id"] = categorie_id
-                if prix_min is not None:
-                    params["prix_min"] = prix_min
-                if prix_max is not None:
-                    params["prix_max"] = prix_max
-                if actifs_seulement is not None:
-                    params["actifs_seulement"] = actifs_seulement
-
-            response = self.session.get(
-                f"{self.base_url}/api/ddd/catalogue/rechercher/", params=params
-            )
-            response.raise_for_status()
-            return response.json()
-
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Erreur recherche produits: {e}")
-            return {
-                "success": False,
-                "error": f"Erreur de communication avec le service catalogue: {str(e)}",
-                "data": {"produits": [], "total": 0},
-            }
+        params = {}
+
+        # Si des critères sont fournis, les utiliser
+        if criteres:
+            params.update(criteres)
+        else:
+            # Sinon, utiliser les paramètres individuels
+            if nom:
+                params["nom"] = nom
+            if categorie_id:
+                params["categorie_id"] = categorie_id
+            if prix_min is not None:
+                params["prix_min"] = prix_min
+            if prix_max is not None:
+                params["prix_max"] = prix_max
+            if actifs_seulement is not None:
+                params["actifs_seulement"] = actifs_seulement
+
+        ok, resultat = self._request(
+            "GET", "/api/ddd/catalogue/rechercher/", params=params
+        )
+        if ok:
+            return resultat
+        return {
+            "success": False,
+            "error": f"Erreur de communication avec le service catalogue: {resultat}",
+            "data": {"produits": [], "total": 0},
+        }
 
     def ajouter_produit(
         self, nom: str, categorie: str, prix: float, description: str = ""
@@ -99,47 +103,40 @@ class CatalogueClient:
         Use Case: AjouterProduitUseCase
         """
         logger.info("➕ Client API: Ajout nouveau produit '%s'", nom)
-        try:
-            data = {
-                "nom": nom,
-                "categorie": categorie,
-                "prix": prix,
-                "description": description,
-            }
-
-            response = self.session.post(
-                f"{self.base_url}/api/ddd/catalogue/ajouter/", json=data
-            )
-            response.raise_for_status()
-            return response.json()
-
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Erreur ajout produit: {e}")
-            return {
-                "success": False,
-                "error": f"Erreur lors de l'ajout du produit: {str(e)}",
-            }
-
+        data = {
+            "nom": nom,
+            "categorie": categorie,
+            "prix": prix,
+            "description": description,
+        }
+
+        ok, resultat = self._request("POST", "/api/ddd/catalogue/ajouter/", json=data)
+        if ok:
+            invalider_cache("catalogue")
+            return resultat
+        return {
+            "success": False,
+            "error": f"Erreur lors de l'ajout du produit: {resultat}",
+        }
+
+    @cache_ttl("catalogue")
     def obtenir_produit_par_id(self, produit_id: str) -> Dict[str, Any]:
         """
         GET /api/ddd/catalogue/produits/<uuid>/
         Récupère les détails d'un produit spécifique par son ID
         """
         logger.info("📦 Client API: Récupération produit ID %s", produit_id)
-        try:
-            response = self.session.get(
-                f"{self.base_url}/api/ddd/catalogue/produits/{produit_id}/"
-            )
-            response.raise_for_status()
-            return response.json()
-
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Erreur récupération produit {produit_id}: {e}")
-            return {
-                "success": False,
-                "error": f"Produit {produit_id} non trouvé: {str(e)}",
-            }
-
+        ok, resultat = self._request(
+            "GET", f"/api/ddd/catalogue/produits/{produit_id}/"
+        )
+        if ok:
+            return resultat
+        return {
+            "success": False,
+            "error": f"Produit {produit_id} non trouvé: {resultat}",
+        }
+
+    @cache_ttl("catalogue")
     def obtenir_tous_produits(self) -> List[Dict[str, Any]]:
         """
         Récupère tous les produits actifs
@@ -150,10 +147,11 @@ class CatalogueClient:
                 return resultat.get("data", {}).get("produits", [])
             else:
                 logger.warning(
-                    f"Échec récupération tous produits: {resultat.get('error', 'Erreur inconnue')}"
+                    "Échec récupération tous produits: %s",
+                    resultat.get("error", "Erreur inconnue"),
                 )
                 return []
 
         except Exception as e:
-            logger.error(f"Erreur récupération tous produits: {e}")
+            logger.error("Erreur récupération tous produits: %s", e)
             return []
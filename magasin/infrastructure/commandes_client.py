@@ -3,32 +3,48 @@ Client HTTP pour le Service Commandes via Kong API Gateway
 Communication avec les endpoints DDD du service-commandes
 """
 
+import ijson
 import requests
 import logging
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 import uuid
+from collections import defaultdict
+
+from magasin.infrastructure._http import (
+    DEFAULT_TIMEOUT,
+    _BaseHttpClient,
+    cache_ttl,
+    construire_session,
+    invalider_cache,
+    invalider_cache_partage,
+)
 
 logger = logging.getLogger(__name__)
 
 BASE_URL = "http://kong:8000/api/commandes"
 
+# Session partagée par toutes les instances du client (pool keep-alive)
+_SESSION = construire_session()
+
+
+def set_session(session: requests.Session) -> None:
+    """Remplace la session partagée (tests, configuration spécifique)"""
+    global _SESSION
+    _SESSION = session
 
-class CommandesClient:
+
+class CommandesClient(_BaseHttpClient):
     """
     Client HTTP pour communiquer avec le service-commandes
     Encapsule tous les appels REST vers les endpoints DDD des ventes
     """
 
-    def __init__(self, base_url: str = BASE_URL):
-        self.base_url = base_url.rstrip("/")
-        self.session = requests.Session()
-        self.session.headers.update(
-            {
-                "Content-Type": "application/json",
-                "Accept": "application/json",
-                "X-API-Key": "magasin-secret-key-2025",  # Clé API Kong
-            }
-        )
+    def __init__(
+        self,
+        base_url: str = BASE_URL,
+        timeout: Tuple[float, float] = DEFAULT_TIMEOUT,
+    ):
+        super().__init__(base_url, _SESSION, timeout)
 
     def enregistrer_vente(
         self, magasin_id: str, produit_id: str, quantite: int, client_id: str
@@ -49,26 +65,25 @@ class CommandesClient:
         logger.info(
             "💰 Client API: Enregistrement vente P%s (Qté: %s)", produit_id, quantite
         )
-        try:
-            data = {
-                "magasin_id": magasin_id,
-                "produit_id": produit_id,
-                "quantite": quantite,
-                "client_id": client_id,
-            }
-
-            response = self.session.post(
-                f"{self.base_url}/api/v1/ventes-ddd/enregistrer/", json=data
-            )
-            response.raise_for_status()
-            return response.json()
-
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Erreur enregistrement vente: {e}")
-            return {
-                "success": False,
-                "error": f"Erreur lors de l'enregistrement de la vente: {str(e)}",
-            }
+        data = {
+            "magasin_id": magasin_id,
+            "produit_id": produit_id,
+            "quantite": quantite,
+            "client_id": client_id,
+        }
+
+        ok, resultat = self._request(
+            "POST", "/api/v1/ventes-ddd/enregistrer/", json=data
+        )
+        if ok:
+            invalider_cache("commandes")
+            # Une vente modifie le stock local côté inventaire
+            invalider_cache_partage("inventaire")
+            return resultat
+        return {
+            "success": False,
+            "error": f"Erreur lors de l'enregistrement de la vente: {resultat}",
+        }
 
     def annuler_vente(self, vente_id: str, motif: str) -> Dict[str, Any]:
         """
@@ -82,21 +97,18 @@ class CommandesClient:
         Returns:
             Dict avec le résultat de l'annulation
         """
-        try:
-            data = {"motif": motif}
-
-            response = self.session.patch(
-                f"{self.base_url}/api/v1/ventes-ddd/{vente_id}/annuler/", json=data
-            )
-            response.raise_for_status()
-            return response.json()
-
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Erreur annulation vente {vente_id}: {e}")
-            return {
-                "success": False,
-                "error": f"Erreur lors de l'annulation de la vente: {str(e)}",
-            }
+        ok, resultat = self._request(
+            "PATCH", f"/api/v1/ventes-ddd/{vente_id}/annuler/", json={"motif": motif}
+        )
+        if ok:
+            invalider_cache("commandes")
+            # Une vente modifie le stock local côté inventaire
+            invalider_cache_partage("inventaire")
+            return resultat
+        return {
+            "success": False,
+            "error": f"Erreur lors de l'annulation de la vente: {resultat}",
+        }
 
     def lister_toutes_ventes(self) -> Dict[str, Any]:
         """
@@ -106,19 +118,45 @@ class CommandesClient:
         Returns:
             Dict avec la liste des ventes et métadonnées
         """
-        try:
-            response = self.session.get(f"{self.base_url}/api/v1/ventes-ddd/")
-            response.raise_for_status()
-            return response.json()
+        ok, resultat = self._request("GET", "/api/v1/ventes-ddd/")
+        if ok:
+            return resultat
+        return {
+            "success": False,
+            "ventes": [],
+            "total_ventes": 0,
+            "error": f"Erreur lors de la récupération des ventes: {resultat}",
+        }
+
+    def lister_ventes(
+        self, magasin_id: Optional[str] = None, statut: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        GET /api/v1/ventes-ddd/?magasin_id=<uuid>&statut=<statut>
+        Récupère les ventes filtrées côté service (le filtre est appliqué en SQL)
 
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Erreur récupération toutes ventes: {e}")
-            return {
-                "success": False,
-                "ventes": [],
-                "total_ventes": 0,
-                "error": f"Erreur lors de la récupération des ventes: {str(e)}",
-            }
+        Args:
+            magasin_id: UUID du magasin (optionnel)
+            statut: Statut des ventes, ex. "active" ou "annulee" (optionnel)
+
+        Returns:
+            Dict avec la liste des ventes filtrées et métadonnées
+        """
+        params = {}
+        if magasin_id:
+            params["magasin_id"] = magasin_id
+        if statut:
+            params["statut"] = statut
+        ok, resultat = self._request("GET", "/api/v1/ventes-ddd/", params=params)
+        if ok:
+            return resultat
+        return {
+            "success": False,
+            "ventes": [],
+            "total_ventes": 0,
+            "status_code": getattr(resultat.response, "status_code", None),
+            "error": f"Erreur lors de la récupération des ventes: {resultat}",
+        }
 
     def consulter_vente(self, vente_id: str) -> Dict[str, Any]:
         """
@@ -131,20 +169,15 @@ class CommandesClient:
         Returns:
             Dict avec les détails de la vente ou erreur
         """
-        try:
-            response = self.session.get(
-                f"{self.base_url}/api/v1/ventes-ddd/{vente_id}/"
-            )
-            response.raise_for_status()
-            return response.json()
-
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Erreur consultation vente {vente_id}: {e}")
-            return {
-                "success": False,
-                "error": f"Vente {vente_id} non trouvée: {str(e)}",
-            }
-
+        ok, resultat = self._request("GET", f"/api/v1/ventes-ddd/{vente_id}/")
+        if ok:
+            return resultat
+        return {
+            "success": False,
+            "error": f"Vente {vente_id} non trouvée: {resultat}",
+        }
+
+    @cache_ttl("commandes")
     def generer_indicateurs(self) -> Dict[str, Any]:
         """
         GET /api/v1/indicateurs/
@@ -154,19 +187,16 @@ class CommandesClient:
         Returns:
             Dict avec les indicateurs de performance de tous les magasins
         """
-        try:
-            response = self.session.get(f"{self.base_url}/api/v1/indicateurs/")
-            response.raise_for_status()
-            return response.json()
-
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Erreur génération indicateurs: {e}")
-            return {
-                "success": False,
-                "indicateurs": [],
-                "error": f"Erreur lors de la génération des indicateurs: {str(e)}",
-            }
-
+        ok, resultat = self._request("GET", "/api/v1/indicateurs/")
+        if ok:
+            return resultat
+        return {
+            "success": False,
+            "indicateurs": [],
+            "error": f"Erreur lors de la génération des indicateurs: {resultat}",
+        }
+
+    @cache_ttl("commandes")
     def generer_rapport_consolide(self) -> Dict[str, Any]:
         """
         GET /api/v1/rapport-consolide/
@@ -177,22 +207,18 @@ class CommandesClient:
             Dict avec le rapport consolidé tous magasins
         """
         logger.info("📊 Client API: Génération rapport consolidé")
-        try:
-            response = self.session.get(f"{self.base_url}/api/v1/rapport-consolide/")
-            response.raise_for_status()
-            return response.json()
-
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Erreur génération rapport consolidé: {e}")
-            return {
-                "success": False,
-                "rapport": {},
-                "error": f"Erreur lors de la génération du rapport consolidé: {str(e)}",
-            }
+        ok, resultat = self._request("GET", "/api/v1/rapport-consolide/")
+        if ok:
+            return resultat
+        return {
+            "success": False,
+            "rapport": {},
+            "error": f"Erreur lors de la génération du rapport consolidé: {resultat}",
+        }
 
     def obtenir_ventes_par_magasin(self, magasin_id: str) -> List[Dict[str, Any]]:
         """
-        Filtre les ventes d'un magasin spécifique depuis toutes les ventes
+        Récupère les ventes d'un magasin spécifique (filtre côté service)
 
         Args:
             magasin_id: UUID du magasin
@@ -201,64 +227,100 @@ class CommandesClient:
             Liste des ventes du magasin spécifié
         """
         try:
-            toutes_ventes = self.lister_toutes_ventes()
-            if toutes_ventes.get("success", False):
-                ventes = toutes_ventes.get("ventes", [])
-                ventes_magasin = [
-                    vente for vente in ventes if vente.get("magasin_id") == magasin_id
-                ]
-                return ventes_magasin
-            else:
-                logger.warning(f"Échec récupération ventes magasin {magasin_id}")
-                return []
+            resultat = self.lister_ventes(magasin_id=magasin_id)
+            if resultat.get("success", False):
+                return resultat.get("ventes", [])
+
+            if resultat.get("status_code") in (400, 404):
+                # Service ne supportant pas le filtre: repli sur l'index local
+                # (construit une seule fois pour tous les magasins)
+                index = self.obtenir_ventes_groupees_par_magasin()
+                return list(index.get(magasin_id, []))
+
+            logger.warning("Échec récupération ventes magasin %s", magasin_id)
+            return []
 
         except Exception as e:
-            logger.error(f"Erreur récupération ventes magasin {magasin_id}: {e}")
+            logger.error("Erreur récupération ventes magasin %s: %s", magasin_id, e)
             return []
 
+    @cache_ttl("commandes")
+    def obtenir_ventes_groupees_par_magasin(self) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Index {magasin_id: [ventes]} construit en une seule passe
+        Un tableau de bord interrogeant M magasins fait O(N + M) au lieu de O(N·M)
+
+        Returns:
+            Dict des ventes groupées par UUID de magasin (vide en cas d'erreur)
+        """
+        toutes_ventes = self.lister_toutes_ventes()
+        if not toutes_ventes.get("success", False):
+            return {}
+
+        index = defaultdict(list)
+        for vente in toutes_ventes.get("ventes", []):
+            index[vente.get("magasin_id")].append(vente)
+        return dict(index)
+
     def obtenir_statistiques_ventes(self) -> Dict[str, Any]:
         """
         Calcule des statistiques générales sur toutes les ventes
+        La réponse est lue en flux (ijson) et agrégée en une seule passe:
+        la liste complète des ventes n'est jamais matérialisée en mémoire
 
         Returns:
             Dict avec statistiques agrégées des ventes
         """
         try:
-            toutes_ventes = self.lister_toutes_ventes()
-            if not toutes_ventes.get("success", False):
-                return {"error": "Impossible de récupérer les ventes"}
-
-            ventes = toutes_ventes.get("ventes", [])
-
-            # Calculs statistiques
-            total_ventes = len(ventes)
-            chiffre_affaires_total = sum(vente.get("total", 0) for vente in ventes)
-            ventes_actives = [v for v in ventes if v.get("statut") == "active"]
-            ventes_annulees = [v for v in ventes if v.get("statut") == "annulee"]
+            response = self.session.get(
+                f"{self.base_url}/api/v1/ventes-ddd/",
+                stream=True,
+                timeout=self.timeout,
+            )
+            try:
+                response.raise_for_status()
+                response.raw.decode_content = True
+
+                total_ventes = 0
+                ventes_actives = 0
+                ventes_annulees = 0
+                chiffre_affaires_total = 0
+                chiffre_affaires_actif = 0
+                for vente in ijson.items(response.raw, "ventes.item", use_float=True):
+                    total = vente.get("total", 0)
+                    total_ventes += 1
+                    chiffre_affaires_total += total
+                    statut = vente.get("statut")
+                    if statut == "active":
+                        ventes_actives += 1
+                        chiffre_affaires_actif += total
+                    elif statut == "annulee":
+                        ventes_annulees += 1
+            finally:
+                response.close()
 
             return {
                 "total_ventes": total_ventes,
-                "ventes_actives": len(ventes_actives),
-                "ventes_annulees": len(ventes_annulees),
+                "ventes_actives": ventes_actives,
+                "ventes_annulees": ventes_annulees,
                 "chiffre_affaires_total": chiffre_affaires_total,
-                "chiffre_affaires_actif": sum(
-                    v.get("total", 0) for v in ventes_actives
-                ),
+                "chiffre_affaires_actif": chiffre_affaires_actif,
             }
 
+        except requests.exceptions.RequestException as e:
+            logger.error("Erreur récupération ventes pour statistiques: %s", e)
+            return {"error": "Impossible de récupérer les ventes"}
         except Exception as e:
-            logger.error(f"Erreur calcul statistiques ventes: {e}")
+            logger.error("Erreur calcul statistiques ventes: %s", e)
             return {"error": f"Erreur calcul statistiques: {str(e)}"}
 
+    @cache_ttl("commandes")
     def lister_magasins(self) -> Dict[str, Any]:
         """
         GET /api/v1/magasins/
         Récupère la liste des magasins avec leurs vrais UUIDs depuis le service-commandes
         """
-        try:
-            response = self.session.get(f"{self.base_url}/api/v1/magasins/")
-            response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Erreur lors de la récupération des magasins: {e}")
-            return {"success": False, "magasins": [], "error": str(e)}
+        ok, resultat = self._request("GET", "/api/v1/magasins/")
+        if ok:
+            return resultat
+        return {"success": False, "magasins": [], "error": str(resultat)}
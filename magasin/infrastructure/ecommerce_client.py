@@ -5,29 +5,42 @@ Communication avec les endpoints DDD du service-ecommerce
 
 import requests
 import logging
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
+
+from magasin.infrastructure._http import (
+    DEFAULT_TIMEOUT,
+    _BaseHttpClient,
+    cache_ttl,
+    construire_session,
+    invalider_cache,
+)
 
 logger = logging.getLogger(__name__)
 
 BASE_URL = "http://kong:8000/api/ecommerce"
 
+# Session partagée par toutes les instances du client (pool keep-alive)
+_SESSION = construire_session()
+
+
+def set_session(session: requests.Session) -> None:
+    """Remplace la session partagée (tests, configuration spécifique)"""
+    global _SESSION
+    _SESSION = session
 
-class EcommerceClient:
+
+class EcommerceClient(_BaseHttpClient):
     """
     Client HTTP pour communiquer avec le service-ecommerce
     Encapsule tous les appels REST vers les endpoints DDD
     """
 
-    def __init__(self, base_url: str = BASE_URL):
-        self.base_url = base_url.rstrip("/")
-        self.session = requests.Session()
-        self.session.headers.update(
-            {
-                "Content-Type": "application/json",
-                "Accept": "application/json",
-                "X-API-Key": "magasin-secret-key-2025",  # Clé API Kong
-            }
-        )
+    def __init__(
+        self,
+        base_url: str = BASE_URL,
+        timeout: Tuple[float, float] = DEFAULT_TIMEOUT,
+    ):
+        super().__init__(base_url, _SESSION, timeout)
 
     # === GESTION DES CLIENTS ===
 
@@ -48,57 +61,45 @@ class EcommerceClient:
         Use Case: CreerCompteClientUseCase
         """
         logger.info("👤 Client API: Création compte client '%s %s'", prenom, nom)
-        try:
-            data = {
-                "prenom": prenom,
-                "nom": nom,
-                "email": email,
-                "adresse_rue": adresse_rue,
-                "adresse_ville": adresse_ville,
-                "adresse_code_postal": adresse_code_postal,
-                "adresse_province": adresse_province,
-                "adresse_pays": adresse_pays,
-            }
-            if telephone:
-                data["telephone"] = telephone
-
-            response = self.session.post(f"{self.base_url}/api/clients/", json=data)
-            response.raise_for_status()
-            return response.json()
-
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Erreur création compte client: {e}")
-            return {"success": False, "error": str(e)}
-
+        data = {
+            "prenom": prenom,
+            "nom": nom,
+            "email": email,
+            "adresse_rue": adresse_rue,
+            "adresse_ville": adresse_ville,
+            "adresse_code_postal": adresse_code_postal,
+            "adresse_province": adresse_province,
+            "adresse_pays": adresse_pays,
+        }
+        if telephone:
+            data["telephone"] = telephone
+
+        ok, resultat = self._request("POST", "/api/clients/", json=data)
+        if ok:
+            invalider_cache("ecommerce")
+            return resultat
+        return {"success": False, "error": str(resultat)}
+
+    @cache_ttl("ecommerce")
     def lister_clients(self) -> Dict[str, Any]:
         """
         GET /api/clients/
         Use Case: ListerClientsUseCase
         """
-        try:
-            response = self.session.get(f"{self.base_url}/api/clients/")
-            response.raise_for_status()
-            return response.json()
-
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Erreur liste clients: {e}")
-            return {"success": False, "clients": [], "error": str(e)}
+        ok, resultat = self._request("GET", "/api/clients/")
+        if ok:
+            return resultat
+        return {"success": False, "clients": [], "error": str(resultat)}
 
     def valider_client(self, client_id: str) -> Dict[str, Any]:
         """
         GET /api/clients/<client_id>/valider/
         Use Case: ValiderClientUseCase
         """
-        try:
-            response = self.session.get(
-                f"{self.base_url}/api/clients/{client_id}/valider/"
-            )
-            response.raise_for_status()
-            return response.json()
-
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Erreur validation client {client_id}: {e}")
-            return {"valid": False, "error": str(e)}
+        ok, resultat = self._request("GET", f"/api/clients/{client_id}/valider/")
+        if ok:
+            return resultat
+        return {"valid": False, "error": str(resultat)}
 
     # === GESTION DU PANIER ===
 
@@ -107,16 +108,10 @@ class EcommerceClient:
         GET /api/panier/clients/<client_id>/panier/
         Use Case: VoirPanierUseCase
         """
-        try:
-            response = self.session.get(
-                f"{self.base_url}/api/panier/clients/{client_id}/panier/"
-            )
-            response.raise_for_status()
-            return response.json()
-
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Erreur consultation panier {client_id}: {e}")
-            return {"success": False, "error": str(e)}
+        ok, resultat = self._request("GET", f"/api/panier/clients/{client_id}/panier/")
+        if ok:
+            return resultat
+        return {"success": False, "error": str(resultat)}
 
     def ajouter_produit_panier(
         self, client_id: str, produit_id: str, quantite: int
@@ -125,34 +120,26 @@ class EcommerceClient:
         POST /api/panier/clients/<client_id>/panier/
         Use Case: AjouterProduitPanierUseCase
         """
-        try:
-            data = {"produit_id": produit_id, "quantite": quantite}
-
-            response = self.session.post(
-                f"{self.base_url}/api/panier/clients/{client_id}/panier/", json=data
-            )
-            response.raise_for_status()
-            return response.json()
+        data = {"produit_id": produit_id, "quantite": quantite}
 
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Erreur ajout produit panier: {e}")
-            return {"success": False, "error": str(e)}
+        ok, resultat = self._request(
+            "POST", f"/api/panier/clients/{client_id}/panier/", json=data
+        )
+        if ok:
+            return resultat
+        return {"success": False, "error": str(resultat)}
 
     def vider_panier(self, client_id: str) -> Dict[str, Any]:
         """
         DELETE /api/panier/clients/<client_id>/panier/
         Use Case: ViderPanierUseCase
         """
-        try:
-            response = self.session.delete(
-                f"{self.base_url}/api/panier/clients/{client_id}/panier/"
-            )
-            response.raise_for_status()
-            return response.json()
-
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Erreur vidage panier {client_id}: {e}")
-            return {"success": False, "error": str(e)}
+        ok, resultat = self._request(
+            "DELETE", f"/api/panier/clients/{client_id}/panier/"
+        )
+        if ok:
+            return resultat
+        return {"success": False, "error": str(resultat)}
 
     def modifier_quantite_panier(
         self, client_id: str, produit_id: str, quantite: int
@@ -161,19 +148,14 @@ class EcommerceClient:
         PUT /api/panier/clients/<client_id>/panier/<produit_id>/
         Use Case: ModifierQuantitePanierUseCase
         """
-        try:
-            data = {"quantite": quantite}
-
-            response = self.session.put(
-                f"{self.base_url}/api/panier/clients/{client_id}/panier/{produit_id}/",
-                json=data,
-            )
-            response.raise_for_status()
-            return response.json()
+        data = {"quantite": quantite}
 
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Erreur modification quantité panier: {e}")
-            return {"success": False, "error": str(e)}
+        ok, resultat = self._request(
+            "PUT", f"/api/panier/clients/{client_id}/panier/{produit_id}/", json=data
+        )
+        if ok:
+            return resultat
+        return {"success": False, "error": str(resultat)}
 
     # === CHECKOUT ET COMMANDES ===
 
@@ -188,52 +170,102 @@ class EcommerceClient:
         Use Case: CheckoutEcommerceUseCase
         """
         logger.info("🛒 Client API: Checkout e-commerce client %s", client_id)
-        try:
-            data = {}
-            if adresse_livraison:
-                data["adresse_livraison"] = adresse_livraison
-            if notes:
-                data["notes"] = notes
-
-            response = self.session.post(
-                f"{self.base_url}/api/commandes/clients/{client_id}/checkout/",
-                json=data,
-            )
-            response.raise_for_status()
-            return response.json()
-
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Erreur checkout client {client_id}: {e}")
-            return {"success": False, "error": str(e)}
+        data = {}
+        if adresse_livraison:
+            data["adresse_livraison"] = adresse_livraison
+        if notes:
+            data["notes"] = notes
+
+        ok, resultat = self._request(
+            "POST", f"/api/commandes/clients/{client_id}/checkout/", json=data
+        )
+        if ok:
+            return resultat
+        return {"success": False, "error": str(resultat)}
 
     def verifier_prerequis_checkout(self, client_id: str) -> Dict[str, Any]:
         """
         GET /api/commandes/clients/<client_id>/checkout/prerequis/
         Vérifie les prérequis pour le check-out
         """
-        try:
-            response = self.session.get(
-                f"{self.base_url}/api/commandes/clients/{client_id}/checkout/prerequis/"
-            )
-            response.raise_for_status()
-            return response.json()
-
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Erreur vérification prérequis checkout {client_id}: {e}")
-            return {"peut_commander": False, "error": str(e)}
+        ok, resultat = self._request(
+            "GET", f"/api/commandes/clients/{client_id}/checkout/prerequis/"
+        )
+        if ok:
+            return resultat
+        return {"peut_commander": False, "error": str(resultat)}
 
     def historique_commandes_client(self, client_id: str) -> Dict[str, Any]:
         """
         GET /api/commandes/clients/<client_id>/historique/
         Récupère l'historique des commandes d'un client
         """
-        try:
-            response = self.session.get(
-                f"{self.base_url}/api/commandes/clients/{client_id}/historique/"
-            )
-            response.raise_for_status()
-            return response.json()
+        ok, resultat = self._request(
+            "GET", f"/api/commandes/clients/{client_id}/historique/"
+        )
+        if ok:
+            return resultat
+        return {"success": False, "commandes": [], "error": str(resultat)}
+
+    # === BATCH ===
+
+    def batch(self, appels: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        POST /api/batch/
+        Exécute plusieurs appels du service en un seul aller-retour Kong
+
+        Args:
+            appels: Liste de {"id", "method", "path", "body", "input_from"};
+                    `input_from` référence l'appel dont celui-ci dépend
+
+        Returns:
+            Dict {"success": bool, "results": [{"id", "status", "data"}, ...]}
+        """
+        ok, resultat = self._request("POST", "/api/batch/", json=appels)
+        if ok:
+            return resultat
+        return {"success": False, "results": [], "error": str(resultat)}
 
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Erreur historique commandes {client_id}: {e}")
-            return {"success": False, "commandes": [], "error": str(e)}
+    def checkout_batch(
+        self,
+        client_id: str,
+        adresse_livraison: Optional[Dict] = None,
+        notes: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Prérequis + panier + checkout en un seul aller-retour
+        Le checkout dépend des prérequis: il n'est pas exécuté s'ils échouent
+        """
+        logger.info("🛒 Client API: Checkout batch client %s", client_id)
+        data = {}
+        if adresse_livraison:
+            data["adresse_livraison"] = adresse_livraison
+        if notes:
+            data["notes"] = notes
+
+        commandes = f"/api/commandes/clients/{client_id}/checkout/"
+        resultat = self.batch(
+            [
+                {"id": 0, "method": "GET", "path": f"{commandes}prerequis/"},
+                {
+                    "id": 1,
+                    "method": "GET",
+                    "path": f"/api/panier/clients/{client_id}/panier/",
+                },
+                {
+                    "id": 2,
+                    "method": "POST",
+                    "path": commandes,
+                    "body": data,
+                    "input_from": 0,
+                },
+            ]
+        )
+        par_id = {r.get("id"): r for r in resultat.get("results", [])}
+        return {
+            "success": resultat.get("success", False),
+            "prerequis": par_id.get(0, {}).get("data"),
+            "panier": par_id.get(1, {}).get("data"),
+            "checkout": par_id.get(2, {}).get("data"),
+            "error": resultat.get("error"),
+        }
@@ -5,12 +5,33 @@ Communication avec les endpoints DDD du service-inventaire
 
 import requests
 import logging
-from typing import Dict, List, Optional, Any
+from typing import Dict, Optional, Any, Tuple
+
+from magasin.infrastructure._http import (
+    DEFAULT_TIMEOUT,
+    JSON_CONTENT_TYPE,
+    cache_partage,
+    construire_session,
+    decoder_json,
+    decoder_json_en_flux,
+    decoder_reponse_ecriture,
+    encoder_json,
+    invalider_cache_partage,
+)
 
 logger = logging.getLogger(__name__)
 
 BASE_URL = "http://kong:8000/api/inventaire"
 
+# Session partagée par toutes les instances du client (pool keep-alive)
+_SESSION = construire_session()
+
+
+def set_session(session: requests.Session) -> None:
+    """Remplace la session partagée (tests, configuration spécifique)"""
+    global _SESSION
+    _SESSION = session
+
 
 class InventaireClient:
     """
@@ -18,16 +39,25 @@ class InventaireClient:
     Encapsule tous les appels REST vers les endpoints DDD
     """
 
-    def __init__(self, base_url: str = BASE_URL):
+    def __init__(
+        self,
+        base_url: str = BASE_URL,
+        timeout: Tuple[float, float] = DEFAULT_TIMEOUT,
+    ):
         self.base_url = base_url.rstrip("/")
-        self.session = requests.Session()
-        self.session.headers.update(
-            {
-                "Content-Type": "application/json",
-                "Accept": "application/json",
-                "X-API-Key": "magasin-secret-key-2025",  # Clé API Kong
-            }
-        )
+        self.session = _SESSION
+        # Connexion et lecture bornées: un appel bloqué ne retient pas un
+        # worker du pool parallèle indéfiniment
+        self.timeout = timeout
+        # URLs précalculées: seul le segment dynamique est formaté par appel
+        self._api = f"{self.base_url}/api/ddd/inventaire"
+        self._url_health_check = f"{self._api}/health-check/"
+        self._url_augmenter_stock = f"{self._api}/augmenter-stock/"
+        self._url_diminuer_stock = f"{self._api}/diminuer-stock/"
+        self._url_stocks_centraux = f"{self._api}/stocks-centraux/"
+        self._url_tous_magasins_stocks = f"{self._api}/tous-magasins-stocks/"
+        self._url_demandes = f"{self._api}/demandes/"
+        self._url_demandes_en_attente = f"{self._api}/demandes/en-attente/"
 
     def health_check(self) -> Dict[str, Any]:
         """
@@ -35,13 +65,11 @@ class InventaireClient:
         Vérification de l'état du service inventaire
         """
         try:
-            response = self.session.get(
-                f"{self.base_url}/api/ddd/inventaire/health-check/"
-            )
+            response = self.session.get(self._url_health_check, timeout=self.timeout)
             response.raise_for_status()
-            return response.json()
+            return decoder_json(response)
         except requests.exceptions.RequestException as e:
-            logger.error(f"Erreur health check inventaire: {e}")
+            logger.error("Erreur health check inventaire: %s", e)
             return {"status": "error", "message": str(e)}
 
     # === GESTION DES STOCKS ===
@@ -59,13 +87,17 @@ class InventaireClient:
                 data["magasin_id"] = magasin_id
 
             response = self.session.post(
-                f"{self.base_url}/api/ddd/inventaire/augmenter-stock/", json=data
+                self._url_augmenter_stock,
+                data=encoder_json(data),
+                headers=JSON_CONTENT_TYPE,
+                timeout=self.timeout,
             )
             response.raise_for_status()
-            return response.json()
+            invalider_cache_partage("inventaire", "supply-chain")
+            return decoder_json(response)
 
         except requests.exceptions.RequestException as e:
-            logger.error(f"Erreur augmentation stock: {e}")
+            logger.error("Erreur augmentation stock: %s", e)
             return {"success": False, "error": str(e)}
 
     def diminuer_stock(
@@ -81,15 +113,20 @@ class InventaireClient:
                 data["magasin_id"] = magasin_id
 
             response = self.session.post(
-                f"{self.base_url}/api/ddd/inventaire/diminuer-stock/", json=data
+                self._url_diminuer_stock,
+                data=encoder_json(data),
+                headers=JSON_CONTENT_TYPE,
+                timeout=self.timeout,
             )
             response.raise_for_status()
-            return response.json()
+            invalider_cache_partage("inventaire", "supply-chain")
+            return decoder_json(response)
 
         except requests.exceptions.RequestException as e:
-            logger.error(f"Erreur diminution stock: {e}")
+            logger.error("Erreur diminution stock: %s", e)
             return {"success": False, "error": str(e)}
 
+    @cache_partage("inventaire")
     def consulter_stock_central(self, produit_id: int) -> Dict[str, Any]:
         """
         GET /api/ddd/inventaire/stock-central/<produit_id>/
@@ -97,13 +134,13 @@ class InventaireClient:
         """
         try:
             response = self.session.get(
-                f"{self.base_url}/api/ddd/inventaire/stock-central/{produit_id}/"
+                f"{self._api}/stock-central/{produit_id}/", timeout=self.timeout
             )
             response.raise_for_status()
-            return response.json()
+            return decoder_json(response)
 
         except requests.exceptions.RequestException as e:
-            logger.error(f"Erreur consultation stock central {produit_id}: {e}")
+            logger.error("Erreur consultation stock central %s: %s", produit_id, e)
             return {"success": False, "error": str(e)}
 
     def consulter_stock_local(self, produit_id: int, magasin_id: int) -> Dict[str, Any]:
@@ -113,17 +150,19 @@ class InventaireClient:
         """
         try:
             response = self.session.get(
-                f"{self.base_url}/api/ddd/inventaire/stock-local/{produit_id}/{magasin_id}/"
+                f"{self._api}/stock-local/{produit_id}/{magasin_id}/",
+                timeout=self.timeout,
             )
             response.raise_for_status()
-            return response.json()
+            return decoder_json(response)
 
         except requests.exceptions.RequestException as e:
             logger.error(
-                f"Erreur consultation stock local {produit_id}/{magasin_id}: {e}"
+                "Erreur consultation stock local %s/%s: %s", produit_id, magasin_id, e
             )
             return {"success": False, "error": str(e)}
 
+    @cache_partage("inventaire")
     def lister_stocks_centraux(self) -> Dict[str, Any]:
         """
         GET /api/ddd/inventaire/stocks-centraux/
@@ -131,11 +170,12 @@ class InventaireClient:
         """
         logger.info("🏪 Client API: Récupération stocks centraux")
         try:
-            response = self.session.get(
-                f"{self.base_url}/api/ddd/inventaire/stocks-centraux/"
-            )
-            response.raise_for_status()
-            data = response.json()
+            # Lecture en flux: la connexion revient au pool à la sortie du with
+            with self.session.get(
+                self._url_stocks_centraux, stream=True, timeout=self.timeout
+            ) as response:
+                response.raise_for_status()
+                data = decoder_json_en_flux(response)
 
             # L'API retourne {"stocks": [...]} sans clé success, on l'ajoute
             if "success" not in data:
@@ -144,7 +184,7 @@ class InventaireClient:
             return data
 
         except requests.exceptions.RequestException as e:
-            logger.error(f"Erreur liste stocks centraux: {e}")
+            logger.error("Erreur liste stocks centraux: %s", e)
             return {"success": False, "stocks": [], "error": str(e)}
 
     def lister_stocks_locaux_magasin(self, magasin_id: int) -> Dict[str, Any]:
@@ -154,29 +194,30 @@ class InventaireClient:
         """
         try:
             response = self.session.get(
-                f"{self.base_url}/api/ddd/inventaire/stocks-locaux/{magasin_id}/"
+                f"{self._api}/stocks-locaux/{magasin_id}/", timeout=self.timeout
             )
             response.raise_for_status()
-            return response.json()
+            return decoder_json(response)
 
         except requests.exceptions.RequestException as e:
-            logger.error(f"Erreur liste stocks magasin {magasin_id}: {e}")
+            logger.error("Erreur liste stocks magasin %s: %s", magasin_id, e)
             return {"success": False, "stocks": [], "error": str(e)}
 
+    @cache_partage("inventaire")
     def lister_tous_magasins_avec_stocks(self) -> Dict[str, Any]:
         """
         GET /api/ddd/inventaire/tous-magasins-stocks/
         Liste tous les magasins avec leurs stocks locaux
         """
         try:
-            response = self.session.get(
-                f"{self.base_url}/api/ddd/inventaire/tous-magasins-stocks/"
-            )
-            response.raise_for_status()
-            return response.json()
+            with self.session.get(
+                self._url_tous_magasins_stocks, stream=True, timeout=self.timeout
+            ) as response:
+                response.raise_for_status()
+                return decoder_json_en_flux(response)
 
         except requests.exceptions.RequestException as e:
-            logger.error(f"Erreur liste tous magasins stocks: {e}")
+            logger.error("Erreur liste tous magasins stocks: %s", e)
             return {"success": False, "magasins": [], "error": str(e)}
 
     # === GESTION DES DEMANDES ===
@@ -201,20 +242,25 @@ class InventaireClient:
             }
 
             response = self.session.post(
-                f"{self.base_url}/api/ddd/inventaire/demandes/", json=data
+                self._url_demandes,
+                data=encoder_json(data),
+                headers=JSON_CONTENT_TYPE,
+                timeout=self.timeout,
             )
             response.raise_for_status()
-            return response.json()
+            invalider_cache_partage("inventaire", "supply-chain")
+            return decoder_json(response)
 
         except requests.exceptions.RequestException as e:
             if hasattr(e, "response") and e.response is not None:
                 logger.error(
-                    f"Erreur création demande: {e} | Réponse: {e.response.text}"
+                    "Erreur création demande: %s | Réponse: %s", e, e.response.text
                 )
             else:
-                logger.error(f"Erreur création demande: {e}")
+                logger.error("Erreur création demande: %s", e)
             return {"success": False, "error": str(e)}
 
+    @cache_partage("inventaire")
     def lister_demandes_en_attente(self) -> Dict[str, Any]:
         """
         GET /api/ddd/inventaire/demandes/en-attente/
@@ -222,13 +268,13 @@ class InventaireClient:
         """
         try:
             response = self.session.get(
-                f"{self.base_url}/api/ddd/inventaire/demandes/en-attente/"
+                self._url_demandes_en_attente, timeout=self.timeout
             )
             response.raise_for_status()
-            return response.json()
+            return decoder_json(response)
 
         except requests.exceptions.RequestException as e:
-            logger.error(f"Erreur liste demandes en attente: {e}")
+            logger.error("Erreur liste demandes en attente: %s", e)
             return {"success": False, "demandes": [], "error": str(e)}
 
     def lister_demandes_par_magasin(self, magasin_id: int) -> Dict[str, Any]:
@@ -238,13 +284,13 @@ class InventaireClient:
         """
         try:
             response = self.session.get(
-                f"{self.base_url}/api/ddd/inventaire/demandes/magasin/{magasin_id}/"
+                f"{self._api}/demandes/magasin/{magasin_id}/", timeout=self.timeout
             )
             response.raise_for_status()
-            return response.json()
+            return decoder_json(response)
 
         except requests.exceptions.RequestException as e:
-            logger.error(f"Erreur liste demandes magasin {magasin_id}: {e}")
+            logger.error("Erreur liste demandes magasin %s: %s", magasin_id, e)
             return {"success": False, "demandes": [], "error": str(e)}
 
     def obtenir_demande_par_id(self, demande_id: str) -> Dict[str, Any]:
@@ -254,13 +300,13 @@ class InventaireClient:
         """
         try:
             response = self.session.get(
-                f"{self.base_url}/api/ddd/inventaire/demandes/{demande_id}/"
+                f"{self._api}/demandes/{demande_id}/", timeout=self.timeout
             )
             response.raise_for_status()
-            return response.json()
+            return decoder_json(response)
 
         except requests.exceptions.RequestException as e:
-            logger.error(f"Erreur obtention demande {demande_id}: {e}")
+            logger.error("Erreur obtention demande %s: %s", demande_id, e)
             return {"success": False, "error": str(e)}
 
     def supprimer_demande(self, demande_id: str) -> Dict[str, Any]:
@@ -270,13 +316,14 @@ class InventaireClient:
         """
         try:
             response = self.session.delete(
-                f"{self.base_url}/api/ddd/inventaire/demandes/{demande_id}/"
+                f"{self._api}/demandes/{demande_id}/", timeout=self.timeout
             )
             response.raise_for_status()
-            return response.json()
+            invalider_cache_partage("inventaire", "supply-chain")
+            return decoder_reponse_ecriture(response)
 
         except requests.exceptions.RequestException as e:
-            logger.error(f"Erreur suppression demande {demande_id}: {e}")
+            logger.error("Erreur suppression demande %s: %s", demande_id, e)
             return {"success": False, "error": str(e)}
 
     def approuver_demande(self, demande_id: str) -> Dict[str, Any]:
@@ -286,13 +333,14 @@ class InventaireClient:
         """
         try:
             response = self.session.put(
-                f"{self.base_url}/api/ddd/inventaire/demandes/{demande_id}/approuver/"
+                f"{self._api}/demandes/{demande_id}/approuver/", timeout=self.timeout
             )
             response.raise_for_status()
-            return response.json()
+            invalider_cache_partage("inventaire", "supply-chain")
+            return decoder_reponse_ecriture(response)
 
         except requests.exceptions.RequestException as e:
-            logger.error(f"Erreur approbation demande {demande_id}: {e}")
+            logger.error("Erreur approbation demande %s: %s", demande_id, e)
             return {"success": False, "error": str(e)}
 
     def rejeter_demande(self, demande_id: str) -> Dict[str, Any]:
@@ -302,15 +350,17 @@ class InventaireClient:
         """
         try:
             response = self.session.put(
-                f"{self.base_url}/api/ddd/inventaire/demandes/{demande_id}/rejeter/"
+                f"{self._api}/demandes/{demande_id}/rejeter/", timeout=self.timeout
             )
             response.raise_for_status()
-            return response.json()
+            invalider_cache_partage("inventaire", "supply-chain")
+            return decoder_reponse_ecriture(response)
 
         except requests.exceptions.RequestException as e:
-            logger.error(f"Erreur rejet demande {demande_id}: {e}")
+            logger.error("Erreur rejet demande %s: %s", demande_id, e)
             return {"success": False, "error": str(e)}
 
+    @cache_partage("inventaire")
     def analyser_besoins_reapprovisionnement(self, magasin_id: int) -> Dict[str, Any]:
         """
         GET /api/ddd/inventaire/analyser-besoins/<magasin_id>/
@@ -318,11 +368,11 @@ class InventaireClient:
         """
         try:
             response = self.session.get(
-                f"{self.base_url}/api/ddd/inventaire/analyser-besoins/{magasin_id}/"
+                f"{self._api}/analyser-besoins/{magasin_id}/", timeout=self.timeout
             )
             response.raise_for_status()
-            return response.json()
+            return decoder_json(response)
 
         except requests.exceptions.RequestException as e:
-            logger.error(f"Erreur analyse besoins magasin {magasin_id}: {e}")
+            logger.error("Erreur analyse besoins magasin %s: %s", magasin_id, e)
             return {"success": False, "error": str(e)}
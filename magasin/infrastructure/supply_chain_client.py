@@ -3,14 +3,36 @@ Client HTTP pour le Service Supply Chain via Kong API Gateway
 Communication avec les endpoints DDD du service-supply-chain
 """
 
+import heapq
 import requests
 import logging
-from typing import Dict, List, Optional, Any
+from collections import defaultdict
+from typing import Dict, Any, Tuple
+
+from magasin.infrastructure._http import (
+    DEFAULT_TIMEOUT,
+    JSON_CONTENT_TYPE,
+    cache_partage,
+    construire_session,
+    decoder_json,
+    decoder_reponse_ecriture,
+    encoder_json,
+    invalider_cache_partage,
+)
 
 logger = logging.getLogger(__name__)
 
 BASE_URL = "http://kong:8000/api/supply-chain"
 
+# Session partagée par toutes les instances du client (pool keep-alive)
+_SESSION = construire_session()
+
+
+def set_session(session: requests.Session) -> None:
+    """Remplace la session partagée (tests, configuration spécifique)"""
+    global _SESSION
+    _SESSION = session
+
 
 class SupplyChainClient:
     """
@@ -18,17 +40,21 @@ class SupplyChainClient:
     Encapsule tous les appels REST vers les endpoints DDD
     """
 
-    def __init__(self, base_url: str = BASE_URL):
+    def __init__(
+        self,
+        base_url: str = BASE_URL,
+        timeout: Tuple[float, float] = DEFAULT_TIMEOUT,
+    ):
         self.base_url = base_url.rstrip("/")
-        self.session = requests.Session()
-        self.session.headers.update(
-            {
-                "Content-Type": "application/json",
-                "Accept": "application/json",
-                "X-API-Key": "magasin-secret-key-2025",  # Clé API Kong
-            }
-        )
-
+        self.session = _SESSION
+        # Connexion et lecture bornées: un appel bloqué ne retient pas un
+        # worker du pool parallèle indéfiniment
+        self.timeout = timeout
+        # URLs précalculées: seul le segment dynamique est formaté par appel
+        self._api = f"{self.base_url}/api/ddd/supply-chain"
+        self._url_demandes_en_attente = f"{self._api}/demandes-en-attente/"
+
+    @cache_partage("supply-chain")
     def lister_demandes_en_attente(self) -> Dict[str, Any]:
         """
         GET /api/ddd/supply-chain/demandes-en-attente/
@@ -37,13 +63,13 @@ class SupplyChainClient:
         """
         try:
             response = self.session.get(
-                f"{self.base_url}/api/ddd/supply-chain/demandes-en-attente/"
+                self._url_demandes_en_attente, timeout=self.timeout
             )
             response.raise_for_status()
-            return response.json()
+            return decoder_json(response)
 
         except requests.exceptions.RequestException as e:
-            logger.error(f"Erreur liste demandes en attente supply-chain: {e}")
+            logger.error("Erreur liste demandes en attente supply-chain: %s", e)
             return {
                 "success": False,
                 "count": 0,
@@ -66,13 +92,14 @@ class SupplyChainClient:
         logger.info("✅ Client API: Validation demande supply-chain %s", demande_id)
         try:
             response = self.session.post(
-                f"{self.base_url}/api/ddd/supply-chain/valider-demande/{demande_id}/"
+                f"{self._api}/valider-demande/{demande_id}/", timeout=self.timeout
             )
             response.raise_for_status()
-            return response.json()
+            invalider_cache_partage("inventaire", "supply-chain")
+            return decoder_reponse_ecriture(response)
 
         except requests.exceptions.RequestException as e:
-            logger.error(f"Erreur validation demande {demande_id}: {e}")
+            logger.error("Erreur validation demande %s: %s", demande_id, e)
             return {
                 "success": False,
                 "use_case": "ValiderDemandeUseCase",
@@ -99,14 +126,17 @@ class SupplyChainClient:
             data = {"motif": motif}
 
             response = self.session.post(
-                f"{self.base_url}/api/ddd/supply-chain/rejeter-demande/{demande_id}/",
-                json=data,
+                f"{self._api}/rejeter-demande/{demande_id}/",
+                data=encoder_json(data),
+                headers=JSON_CONTENT_TYPE,
+                timeout=self.timeout,
             )
             response.raise_for_status()
-            return response.json()
+            invalider_cache_partage("inventaire", "supply-chain")
+            return decoder_json(response)
 
         except requests.exceptions.RequestException as e:
-            logger.error(f"Erreur rejet demande {demande_id}: {e}")
+            logger.error("Erreur rejet demande %s: %s", demande_id, e)
             return {
                 "success": False,
                 "use_case": "RejeterDemandeUseCase",
@@ -134,39 +164,38 @@ class SupplyChainClient:
 
             demandes = demandes_data.get("demandes", [])
 
-            # Analyse des demandes
-            total_demandes = len(demandes)
-            demandes_importantes = [
-                d for d in demandes if d.get("est_quantite_importante", False)
-            ]
-            quantite_totale = sum(d.get("quantite", 0) for d in demandes)
-
-            # Analyse par produit
-            produits_demandes = {}
+            # Une seule passe: totaux et regroupement par produit [count, quantité]
+            demandes_importantes = 0
+            quantite_totale = 0
+            produits_demandes = defaultdict(lambda: [0, 0])
             for demande in demandes:
+                quantite = demande.get("quantite", 0)
+                quantite_totale += quantite
+                if demande.get("est_quantite_importante", False):
+                    demandes_importantes += 1
                 produit_id = demande.get("produit_id")
                 if produit_id:
-                    if produit_id not in produits_demandes:
-                        produits_demandes[produit_id] = {
-                            "count": 0,
-                            "quantite_totale": 0,
-                        }
-                    produits_demandes[produit_id]["count"] += 1
-                    produits_demandes[produit_id]["quantite_totale"] += demande.get(
-                        "quantite", 0
-                    )
+                    agregat = produits_demandes[produit_id]
+                    agregat[0] += 1
+                    agregat[1] += quantite
+
+            # Top 5 sans trier tous les produits
+            top_produits = heapq.nlargest(
+                5, produits_demandes.items(), key=lambda x: x[1][0]
+            )
 
             return {
                 "success": True,
-                "total_demandes": total_demandes,
-                "demandes_importantes": len(demandes_importantes),
+                "total_demandes": len(demandes),
+                "demandes_importantes": demandes_importantes,
                 "quantite_totale_demandee": quantite_totale,
                 "produits_uniques": len(produits_demandes),
-                "produits_les_plus_demandes": sorted(
-                    produits_demandes.items(), key=lambda x: x[1]["count"], reverse=True
-                )[:5],
+                "produits_les_plus_demandes": [
+                    (produit_id, {"count": count, "quantite_totale": quantite})
+                    for produit_id, (count, quantite) in top_produits
+                ],
             }
 
         except Exception as e:
-            logger.error(f"Erreur calcul statistiques workflow: {e}")
+            logger.error("Erreur calcul statistiques workflow: %s", e)
             return {"success": False, "error": f"Erreur calcul statistiques: {str(e)}"}
@@ -0,0 +1,37 @@
+"""
+Formatter de logs JSON pour le frontend magasin
+Sérialise chaque enregistrement avec orjson, champs `extra` inclus
+"""
+
+import logging
+
+import orjson
+
+# Attributs standards d'un LogRecord: tout le reste vient de `extra=`
+_ATTRIBUTS_STANDARDS = frozenset(
+    logging.LogRecord("", 0, "", 0, "", (), None).__dict__
+) | {"message", "asctime"}
+
+
+class OrjsonFormatter(logging.Formatter):
+    """
+    Une ligne JSON valide par enregistrement (guillemets du message échappés),
+    produite en un seul appel orjson.dumps
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entree = {
+            "timestamp": self.formatTime(record, self.datefmt),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "module": record.module,
+            "function": record.funcName,
+            "line": record.lineno,
+        }
+        for cle, valeur in record.__dict__.items():
+            if cle not in _ATTRIBUTS_STANDARDS:
+                entree[cle] = valeur
+        if record.exc_info:
+            entree["exception"] = self.formatException(record.exc_info)
+        return orjson.dumps(entree, default=str).decode()
@@ -1,9 +1,9 @@
 import logging
 import time
-import json
-from django.utils.deprecation import MiddlewareMixin
 from prometheus_client import Counter, Histogram, Gauge
 
+from magasin.infrastructure._http import activer_memo_requete
+
 # Configuration du logger
 logger = logging.getLogger("magasin")
 
@@ -18,76 +18,90 @@ REQUEST_DURATION = Histogram(
     "django_http_request_duration_seconds",
     "Durée des requêtes HTTP",
     ["method", "endpoint"],
+    # Seuils resserrés sur la plage 20-300 ms des pages qui appellent Kong
+    buckets=(0.01, 0.025, 0.05, 0.075, 0.1, 0.15, 0.2, 0.3, 0.5, 0.75, 1.0, 2.0, 5.0),
 )
 
 ACTIVE_REQUESTS = Gauge("django_http_requests_active", "Requêtes actives", ["method"])
 
 
-class ObservabilityMiddleware(MiddlewareMixin):
+class ObservabilityMiddleware:
     """
     Middleware pour l'observabilité : logging structuré et métriques Prometheus
+    Le cycle de vie complet est encadré par un try/finally: la jauge des
+    requêtes actives est décrémentée exactement une fois
     """
 
-    def process_request(self, request):
-        # Marquer le début de la requête
-        request.start_time = time.time()
-
-        # Incrémenter le compteur de requêtes actives
-        ACTIVE_REQUESTS.labels(method=request.method).inc()
+    def __init__(self, get_response):
+        self.get_response = get_response
 
-        # Log de début de requête
+    def __call__(self, request):
+        # Marquer le début de la requête
+        request.start_time = time.perf_counter()
+        method = request.method
+
+        # Incrémenter le compteur de requêtes actives (label résolu une fois)
+        actives = ACTIVE_REQUESTS.labels(method=method)
+        actives.inc()
+
+        # Mémo des réponses des clients HTTP, limité à cette requête
+        request._client_cache = {}
+        activer_memo_requete(request._client_cache)
+        try:
+            self._log_debut(request, method)
+            response = self.get_response(request)
+            self._observer_fin(request, response, method)
+            return response
+        finally:
+            activer_memo_requete(None)
+            actives.dec()
+
+    def _log_debut(self, request, method):
+        # Log de début de requête (dict extra construit seulement si émis)
+        if not logger.isEnabledFor(logging.INFO):
+            return
         logger.info(
             "Début de requête",
             extra={
                 "request_id": getattr(request, "id", "unknown"),
-                "method": request.method,
+                "method": method,
                 "path": request.path,
                 "user_agent": request.META.get("HTTP_USER_AGENT", ""),
                 "ip": self._get_client_ip(request),
-                "user": (
-                    str(request.user) if request.user.is_authenticated else "anonymous"
-                ),
+                "user": self._get_user(request),
             },
         )
 
-    def process_response(self, request, response):
+    def _observer_fin(self, request, response, method):
         # Calculer la durée de la requête
-        duration = time.time() - getattr(request, "start_time", time.time())
+        duration = time.perf_counter() - request.start_time
 
-        # Décrémenter le compteur de requêtes actives
-        ACTIVE_REQUESTS.labels(method=request.method).dec()
-
-        # Enregistrer les métriques Prometheus
+        # Enregistrer les métriques Prometheus (libellé borné: nom de route)
+        endpoint = self._get_endpoint(request)
         REQUEST_COUNT.labels(
-            method=request.method, endpoint=request.path, status=response.status_code
+            method=method, endpoint=endpoint, status=response.status_code
         ).inc()
 
-        REQUEST_DURATION.labels(method=request.method, endpoint=request.path).observe(
-            duration
-        )
+        REQUEST_DURATION.labels(method=method, endpoint=endpoint).observe(duration)
 
-        # Log de fin de requête
+        # Log de fin de requête (dict extra construit seulement si émis)
+        if not logger.isEnabledFor(logging.INFO):
+            return
         logger.info(
             "Fin de requête",
             extra={
                 "request_id": getattr(request, "id", "unknown"),
-                "method": request.method,
+                "method": method,
                 "path": request.path,
                 "status_code": response.status_code,
                 "duration_ms": round(duration * 1000, 2),
-                "content_length": (
-                    len(response.content) if hasattr(response, "content") else 0
-                ),
-                "user": (
-                    str(request.user) if request.user.is_authenticated else "anonymous"
-                ),
+                "content_length": self._get_content_length(response),
+                "user": self._get_user(request),
             },
         )
 
-        return response
-
     def process_exception(self, request, exception):
-        # Log des erreurs
+        # Log des erreurs (la jauge est gérée par __call__)
         logger.error(
             "Exception dans la requête",
             extra={
@@ -96,15 +110,42 @@ class ObservabilityMiddleware(MiddlewareMixin):
                 "path": request.path,
                 "exception_type": type(exception).__name__,
                 "exception_message": str(exception),
-                "user": (
-                    str(request.user) if request.user.is_authenticated else "anonymous"
-                ),
+                "user": self._get_user(request),
             },
             exc_info=True,
         )
 
-        # Décrémenter le compteur de requêtes actives en cas d'erreur
-        ACTIVE_REQUESTS.labels(method=request.method).dec()
+    def _get_endpoint(self, request):
+        """
+        Nom de la route résolue plutôt que le chemin brut: les UUID et IDs
+        dans l'URL créeraient une série Prometheus par valeur
+        """
+        match = getattr(request, "resolver_match", None)
+        if match is None:
+            return "unknown"
+        return match.url_name or match.route or "unknown"
+
+    def _get_user(self, request):
+        """
+        Utilisateur seulement s'il a déjà été chargé: évaluer le
+        SimpleLazyObject request.user pour un log coûterait une requête DB
+        """
+        user = getattr(request, "_cached_user", None)
+        if user is None:
+            return "unknown"
+        return str(user) if user.is_authenticated else "anonymous"
+
+    def _get_content_length(self, response):
+        """
+        Taille du corps sans jamais consommer une réponse en flux
+        Content-Length si déjà posé, sinon le corps déjà rendu en mémoire
+        """
+        content_length = response.get("Content-Length")
+        if content_length:
+            return int(content_length)
+        if getattr(response, "streaming", False):
+            return 0
+        return len(response.content)
 
     def _get_client_ip(self, request):
         """Extraire l'IP du client"""
@@ -10,6 +10,7 @@ import logging
 # Import du client HTTP vers service-inventaire
 from magasin.infrastructure.inventaire_client import InventaireClient
 from magasin.infrastructure.commandes_client import CommandesClient
+from magasin.infrastructure._http import executer_en_parallele
 
 logger = logging.getLogger(__name__)
 
@@ -21,11 +22,16 @@ def uc2_stock(request):
     """
     logger.info("🏪 Consultation des stocks centraux demandée")
     try:
-        # Initialisation du client HTTP
+        # Initialisation des clients HTTP
         inventaire_client = InventaireClient()
+        commandes_client = CommandesClient()
 
-        # Récupération des stocks centraux via l'API DDD
-        stocks_data = inventaire_client.lister_stocks_centraux()
+        # Stocks centraux et magasins (pour les demandes de réapprovisionnement)
+        # sont indépendants: les deux appels partent en même temps
+        stocks_data, magasins_data = executer_en_parallele(
+            inventaire_client.lister_stocks_centraux,
+            commandes_client.lister_magasins,
+        )
 
         if not stocks_data.get("success", False):
             # En cas d'erreur API, afficher un message et des données vides
@@ -50,14 +56,6 @@ def uc2_stock(request):
         # Extraction des stocks
         stocks = stocks_data.get("stocks", [])
 
-        # Récupération des magasins (pour les demandes de réapprovisionnement)
-        # Utilisation du client HTTP Commandes pour la vraie liste
-        commandes_client = CommandesClient()
-        magasins_data = (
-            commandes_client.lister_magasins()
-            if hasattr(commandes_client, "lister_magasins")
-            else None
-        )
         if magasins_data and magasins_data.get("success"):
             magasins = magasins_data.get("magasins", [])
         else:
@@ -12,6 +12,7 @@ import logging
 from magasin.infrastructure.commandes_client import CommandesClient
 from magasin.infrastructure.catalogue_client import CatalogueClient
 from magasin.infrastructure.inventaire_client import InventaireClient
+from magasin.infrastructure._http import executer_en_parallele
 
 logger = logging.getLogger(__name__)
 
@@ -110,28 +111,37 @@ def afficher_formulaire_vente(request):
     """
     logger.info("📝 Affichage formulaire de nouvelle vente")
     try:
-        # Récupérer la liste des magasins via le service-commandes
         commandes_client = CommandesClient()
-        magasins_data = (
-            commandes_client.lister_magasins()
-            if hasattr(commandes_client, "lister_magasins")
-            else None
+        inventaire_client = InventaireClient()
+
+        # Déterminer le magasin sélectionné
+        magasin_id = request.GET.get("magasin_id") or request.POST.get("magasin_id")
+
+        # Magasins, rapport et stocks locaux sont indépendants: les trois appels
+        # partent en même temps. Les stocks de tous les magasins arrivent en un
+        # seul appel au lieu d'un appel par magasin.
+        magasins_data, rapport_data, tous_stocks_data = executer_en_parallele(
+            commandes_client.lister_magasins,
+            commandes_client.generer_rapport_consolide,
+            inventaire_client.lister_tous_magasins_avec_stocks,
         )
         if magasins_data and magasins_data.get("success"):
             magasins = magasins_data.get("magasins", [])
         else:
             magasins = []
 
-        # Déterminer le magasin sélectionné
-        magasin_id = request.GET.get("magasin_id") or request.POST.get("magasin_id")
+        stocks_par_magasin = {
+            str(m.get("magasin_id")): m.get("stocks", [])
+            for m in tous_stocks_data.get("magasins", [])
+        }
+
         produits = []
         quantites = {}
         if magasin_id:
-            # Récupérer les produits en stock pour ce magasin
-            inventaire_client = InventaireClient()
-            stocks_data = inventaire_client.lister_stocks_locaux_magasin(magasin_id)
-            logger.info(f"STOCKS LOCAUX POUR {magasin_id}: {stocks_data}")
-            for stock in stocks_data.get("stocks", []):
+            # Produits en stock pour ce magasin
+            stocks = stocks_par_magasin.get(str(magasin_id), [])
+            logger.info(f"STOCKS LOCAUX POUR {magasin_id}: {stocks}")
+            for stock in stocks:
                 produits.append(
                     {
                         "id": stock.get("produit_id"),
@@ -141,8 +151,7 @@ def afficher_formulaire_vente(request):
                 quantites[stock.get("produit_id")] = stock.get("quantite", 0)
         # Si aucun magasin sélectionné, pas de produits
 
-        # Récupérer aussi les rapports pour l'affichage (comme attendu par le template)
-        rapport_data = commandes_client.generer_rapport_consolide()
+        # Rapports pour l'affichage (comme attendu par le template)
         rapports = []
         if isinstance(rapport_data, list):
             for item in rapport_data:
@@ -173,13 +182,13 @@ def afficher_formulaire_vente(request):
                     )
 
         # Section informative : liste des stocks par magasin (pour affichage, toujours alimentée)
-        magasins_avec_stocks = []
-        for magasin in magasins:
-            stocks_data = InventaireClient().lister_stocks_locaux_magasin(magasin["id"])
-            produits_stock = stocks_data.get("stocks", [])
-            magasins_avec_stocks.append(
-                {"nom": magasin["nom"], "produits": produits_stock}
-            )
+        magasins_avec_stocks = [
+            {
+                "nom": magasin["nom"],
+                "produits": stocks_par_magasin.get(str(magasin["id"]), []),
+            }
+            for magasin in magasins
+        ]
 
         context = {
             "produits": produits,
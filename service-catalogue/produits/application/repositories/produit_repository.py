@@ -43,6 +43,19 @@ class ProduitRepository(ABC):
         """
         pass
 
+    @abstractmethod
+    def get_by_ids(self, produit_ids: List[ProduitId]) -> List[Produit]:
+        """
+        Récupère plusieurs produits en une seule requête
+
+        Args:
+            produit_ids: UUID des produits recherchés
+
+        Returns:
+            Produits trouvés (les IDs inconnus sont ignorés)
+        """
+        pass
+
     @abstractmethod
     def get_by_nom(self, nom: str) -> Optional[Produit]:
         """
@@ -8,6 +8,7 @@ from .interfaces.catalogue_views import (
     DDDCatalogueAPI,
     catalogue_health_check,
     get_produit_by_id,
+    get_produits_par_ids,
 )
 
 app_name = "catalogue_ddd"
@@ -20,4 +21,6 @@ urlpatterns = [
     path("ajouter/", DDDCatalogueAPI.as_view(), name="ajouter-produit"),
     # Récupération d'un produit par ID (pour communication inter-services)
     path("produits/<uuid:produit_id>/", get_produit_by_id, name="get-produit-by-id"),
+    # Récupération groupée: un seul appel pour tous les produits d'un rapport
+    path("produits/lot/", get_produits_par_ids, name="get-produits-par-ids"),
 ]
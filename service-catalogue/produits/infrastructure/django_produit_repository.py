@@ -55,6 +55,13 @@ class DjangoProduitRepository(ProduitRepository):
         except ProduitDjango.DoesNotExist:
             return None
 
+    def get_by_ids(self, produit_ids: List[ProduitId]) -> List[Produit]:
+        """
+        Récupère plusieurs produits en une seule requête (filtre IN)
+        """
+        produits_django = ProduitDjango.objects.filter(id__in=produit_ids)
+        return [self._to_domain_entity(p) for p in produits_django]
+
     def get_by_nom(self, nom: str) -> Optional[Produit]:
         """
         Récupère un produit par son nom
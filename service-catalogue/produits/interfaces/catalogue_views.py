@@ -11,6 +11,7 @@ from rest_framework.decorators import api_view
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
 import os
+import uuid
 
 from ..application.use_cases.rechercher_produits_use_case import (
     RechercherProduitsUseCase,
@@ -432,3 +433,57 @@ def get_produit_by_id(request, produit_id):
             {"success": False, "error": "Erreur interne du serveur", "details": str(e)},
             status=status.HTTP_500_INTERNAL_SERVER_ERROR,
         )
+
+
+@swagger_auto_schema(
+    method="get",
+    operation_summary="Récupérer plusieurs produits par ID",
+    operation_description="""
+    Récupère en un seul appel les produits dont les IDs sont passés
+    dans le paramètre ids (séparés par des virgules).
+
+    **Utilisé pour la communication inter-services (rapports).**
+    """,
+    manual_parameters=[
+        openapi.Parameter(
+            "ids",
+            openapi.IN_QUERY,
+            description="UUID des produits séparés par des virgules",
+            type=openapi.TYPE_STRING,
+            required=True,
+        )
+    ],
+    tags=["Catalogue DDD"],
+)
+@api_view(["GET"])
+def get_produits_par_ids(request):
+    """
+    GET /api/ddd/catalogue/produits/lot/?ids=a,b - Récupération groupée
+    """
+    try:
+        produit_ids = [
+            uuid.UUID(produit_id)
+            for produit_id in request.query_params.get("ids", "").split(",")
+            if produit_id
+        ]
+    except ValueError as e:
+        return Response(
+            {"success": False, "error": f"ID de produit invalide: {str(e)}"},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    produits = DjangoProduitRepository().get_by_ids(produit_ids) if produit_ids else []
+
+    return Response(
+        {
+            "produits": [
+                {
+                    "id": str(produit.id),
+                    "nom": produit.nom.valeur,
+                    "prix": float(produit.prix.montant),
+                }
+                for produit in produits
+            ]
+        },
+        status=status.HTTP_200_OK,
+    )
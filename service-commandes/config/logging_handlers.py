@@ -0,0 +1,37 @@
+"""
+Handlers de logging du service commandes
+La sortie console est déportée sur un thread dédié
+"""
+
+import atexit
+import copy
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+
+
+class ConsoleAsynchroneHandler(QueueHandler):
+    """
+    Dépose les enregistrements dans une file: l'écriture sur stdout (et son
+    verrou) est faite par un QueueListener, hors du thread de la requête
+    """
+
+    def __init__(self):
+        super().__init__(queue.SimpleQueue())
+        self._console = logging.StreamHandler()
+        self._listener = QueueListener(self.queue, self._console)
+        self._listener.start()
+        atexit.register(self._listener.stop)
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Le listener est dans le même processus: seul le message est figé ici
+        # (arguments mutables), la pile d'une exception est formatée par le
+        # thread du listener et non par celui de la requête
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def setFormatter(self, fmt: logging.Formatter) -> None:
+        # Le format configuré s'applique à l'écriture console
+        self._console.setFormatter(fmt)
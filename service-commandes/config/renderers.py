@@ -0,0 +1,27 @@
+"""
+Renderers DRF du service commandes
+Les réponses JSON sont sérialisées par orjson (UUID et datetime natifs, en C)
+"""
+
+import orjson
+from rest_framework.utils.encoders import JSONEncoder
+from rest_framework.renderers import BaseRenderer
+
+# Repli pour les types inconnus d'orjson (Decimal, chaînes paresseuses...)
+_ENCODEUR_DRF = JSONEncoder()
+
+
+class ORJSONRenderer(BaseRenderer):
+    """
+    Remplace le JSONRenderer de DRF: orjson produit directement des bytes,
+    les types qu'il ne connaît pas passent par l'encodeur de DRF
+    """
+
+    media_type = "application/json"
+    format = "json"
+    charset = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        return orjson.dumps(data, default=_ENCODEUR_DRF.default)
@@ -4,7 +4,7 @@ Interface d'accès aux données selon DDD
 """
 
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import Dict, List, Optional
 from uuid import UUID
 
 from ...domain.entities import Magasin
@@ -21,6 +21,11 @@ class MagasinRepository(ABC):
         """Récupère un magasin par son ID"""
         pass
 
+    @abstractmethod
+    def get_by_ids(self, magasin_ids: List[UUID]) -> Dict[UUID, Magasin]:
+        """Récupère plusieurs magasins en une fois, indexés par ID"""
+        pass
+
     @abstractmethod
     def get_all(self) -> List[Magasin]:
         """Récupère tous les magasins"""
@@ -4,11 +4,13 @@ Interface d'accès aux données selon DDD
 """
 
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import Dict, List, Optional
 from datetime import datetime
+from decimal import Decimal
 from uuid import UUID
 
 from ...domain.entities import Vente
+from ...domain.value_objects import MagasinId, VentesProduitAgregees
 
 
 class VenteRepository(ABC):
@@ -28,8 +30,27 @@ class VenteRepository(ABC):
         pass
 
     @abstractmethod
-    def get_all(self) -> List[Vente]:
-        """Récupère toutes les ventes"""
+    def get_all(
+        self,
+        magasin_id: Optional[UUID] = None,
+        statut: Optional[str] = None,
+        offset: int = 0,
+        limite: Optional[int] = None,
+    ) -> List[Vente]:
+        """
+        Récupère les ventes, filtrées par magasin et/ou statut si fournis,
+        des plus récentes aux plus anciennes; `limite` borne une page
+        """
+        pass
+
+    @abstractmethod
+    def get_empreinte(
+        self, magasin_id: Optional[UUID] = None, statut: Optional[str] = None
+    ) -> str:
+        """
+        Empreinte des ventes filtrées comme get_all: change dès qu'une vente
+        est enregistrée, annulée, remboursée ou supprimée
+        """
         pass
 
     @abstractmethod
@@ -44,6 +65,33 @@ class VenteRepository(ABC):
         """Récupère les ventes actives d'un magasin sur une période"""
         pass
 
+    @abstractmethod
+    def get_ventes_agregees_by_period(
+        self, debut: datetime, fin: datetime
+    ) -> List[VentesProduitAgregees]:
+        """
+        Quantités et chiffre d'affaires des ventes actives sur une période,
+        agrégés par magasin et par produit
+        """
+        pass
+
+    @abstractmethod
+    def get_chiffre_affaires_par_magasin(
+        self, debut: datetime, fin: datetime
+    ) -> Dict[MagasinId, Decimal]:
+        """Chiffre d'affaires des ventes actives sur une période, par magasin"""
+        pass
+
+    @abstractmethod
+    def get_top_produits_vendus(
+        self, debut: datetime, fin: datetime, limite: int = 3
+    ) -> List[VentesProduitAgregees]:
+        """
+        Produits les plus vendus (en quantité) de chaque magasin sur une période,
+        au plus `limite` par magasin, du plus vendu au moins vendu
+        """
+        pass
+
     @abstractmethod
     def delete(self, vente_id: str) -> None:
         """Supprime une vente"""
@@ -4,7 +4,7 @@ Interface de communication avec le service externe produits
 """
 
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import Dict, List, Optional
 from uuid import UUID
 
 from ...domain.value_objects import ProduitInfo
@@ -28,3 +28,22 @@ class ProduitService(ABC):
             ProduitInfo si trouvé, None sinon
         """
         pass
+
+    def get_produits_details(self, produit_ids: List[UUID]) -> Dict[UUID, ProduitInfo]:
+        """
+        Récupère les détails de plusieurs produits
+        Implémentation unitaire par défaut: un adaptateur réseau peut
+        regrouper les IDs dans un seul appel
+
+        Args:
+            produit_ids: IDs des produits à récupérer
+
+        Returns:
+            Dict produit_id -> ProduitInfo (les produits introuvables sont absents)
+        """
+        produits = {}
+        for produit_id in produit_ids:
+            produit_info = self.get_produit_details(produit_id)
+            if produit_info:
+                produits[produit_id] = produit_info
+        return produits
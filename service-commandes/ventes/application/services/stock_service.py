@@ -4,7 +4,7 @@ Interface de communication avec le service externe stock
 """
 
 from abc import ABC, abstractmethod
-from typing import List
+from typing import Any, Dict, List
 from uuid import UUID
 
 from ...domain.value_objects import StockInfo
@@ -43,6 +43,25 @@ class StockService(ABC):
         """
         pass
 
+    def get_all_stock_local_par_magasin(
+        self, magasin_ids: List[UUID]
+    ) -> Dict[UUID, List[StockInfo]]:
+        """
+        Récupère les stocks locaux de plusieurs magasins
+        Implémentation séquentielle par défaut: un adaptateur réseau peut
+        lancer les appels en parallèle
+
+        Args:
+            magasin_ids: IDs des magasins
+
+        Returns:
+            Dict magasin_id -> liste des StockInfo du magasin
+        """
+        return {
+            magasin_id: self.get_all_stock_local(magasin_id)
+            for magasin_id in magasin_ids
+        }
+
     @abstractmethod
     def decrease_stock(self, magasin_id: UUID, produit_id: UUID, quantite: int) -> None:
         """
@@ -52,6 +71,9 @@ class StockService(ABC):
             magasin_id: ID du magasin
             produit_id: ID du produit
             quantite: Quantité à décrémenter
+
+        Raises:
+            MiseAJourStockError: Si la diminution est refusée ou non confirmée
         """
         pass
 
@@ -66,3 +88,16 @@ class StockService(ABC):
             quantite: Quantité à incrémenter
         """
         pass
+
+    @abstractmethod
+    def batch_increase_stock(
+        self, magasin_id: UUID, items: List[Dict[str, Any]]
+    ) -> None:
+        """
+        Augmente en un seul appel le stock de plusieurs produits d'un magasin
+
+        Args:
+            magasin_id: ID du magasin
+            items: Liste de {"produit_id": UUID, "quantite": int}
+        """
+        pass
@@ -54,9 +54,14 @@ class AnnulerVenteUseCase:
         # 3. Annulation (logique métier protégée dans l'entité)
         vente.annuler(motif)
 
-        # 4. Restauration du stock (effet de bord)
-        for produit_id, quantite in quantites_par_produit.items():
-            self._stock_service.increase_stock(magasin_id, produit_id, quantite)
+        # 4. Restauration du stock (effet de bord), toutes les lignes en un appel
+        self._stock_service.batch_increase_stock(
+            magasin_id,
+            [
+                {"produit_id": produit_id, "quantite": quantite}
+                for produit_id, quantite in quantites_par_produit.items()
+            ],
+        )
 
         # 5. Persistance de la vente annulée
         self._vente_repo.save(vente)
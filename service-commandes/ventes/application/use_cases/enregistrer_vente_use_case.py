@@ -4,6 +4,7 @@ Fonctionnalité métier complète pour créer une nouvelle vente
 """
 
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from decimal import Decimal
 from typing import Dict, Any
 
@@ -19,6 +20,9 @@ from ...domain.exceptions import (
     StockInsuffisantError,
 )
 
+# Pool partagé pour lire produit et stock en parallèle (appels réseau)
+_EXECUTOR = ThreadPoolExecutor(max_workers=16, thread_name_prefix="enregistrer-vente")
+
 
 class EnregistrerVenteUseCase:
     """
@@ -29,8 +33,8 @@ class EnregistrerVenteUseCase:
     2. Récupération des infos produit
     3. Vérification du stock
     4. Création de la vente (entité riche)
-    5. Mise à jour du stock
-    6. Persistance
+    5. Mise à jour du stock (en parallèle de la persistance)
+    6. Persistance (compensation si l'une des deux écritures échoue)
     """
 
     def __init__(
@@ -61,20 +65,29 @@ class EnregistrerVenteUseCase:
             StockInsuffisantError: Si le stock est insuffisant
         """
 
+        # Lectures indépendantes: produit et stock partent en parallèle pendant
+        # que le magasin est lu en base sur le thread de la requête (ORM)
+        produit_future = _EXECUTOR.submit(
+            self._produit_service.get_produit_details, commande.produit_id
+        )
+        stock_future = _EXECUTOR.submit(
+            self._stock_service.get_stock_local,
+            commande.magasin_id,
+            commande.produit_id,
+        )
+
         # 1. Validation du magasin (règle métier)
         magasin = self._magasin_repo.get_by_id(commande.magasin_id)
         if not magasin:
             raise MagasinInexistantError(f"Magasin {commande.magasin_id} non trouvé")
 
         # 2. Récupération des informations produit
-        produit_info = self._produit_service.get_produit_details(commande.produit_id)
+        produit_info = produit_future.result()
         if not produit_info:
             raise ProduitInexistantError(f"Produit {commande.produit_id} non trouvé")
 
         # 3. Vérification du stock (règle métier déléguée au magasin)
-        stock_info = self._stock_service.get_stock_local(
-            commande.magasin_id, commande.produit_id
-        )
+        stock_info = stock_future.result()
         if not magasin.peut_vendre(
             commande.produit_id, commande.quantite, stock_info.quantite_disponible
         ):
@@ -97,13 +110,29 @@ class EnregistrerVenteUseCase:
             prix_unitaire=produit_info.prix,
         )
 
-        # 5. Mise à jour du stock (effet de bord)
-        self._stock_service.decrease_stock(
-            commande.magasin_id, commande.produit_id, commande.quantite
+        # 5. et 6. Mise à jour du stock (réseau) pendant la persistance (ORM):
+        # l'effet de bord qui réussit est compensé si l'autre échoue
+        # (decrease_stock lève MiseAJourStockError si l'inventaire refuse)
+        stock_future = _EXECUTOR.submit(
+            self._stock_service.decrease_stock,
+            commande.magasin_id,
+            commande.produit_id,
+            commande.quantite,
         )
-
-        # 6. Persistance de la vente
-        self._vente_repo.save(vente)
+        try:
+            self._vente_repo.save(vente)
+        except Exception:
+            if stock_future.exception() is None:
+                self._stock_service.increase_stock(
+                    commande.magasin_id, commande.produit_id, commande.quantite
+                )
+            raise
+
+        try:
+            stock_future.result()
+        except Exception:
+            self._vente_repo.delete(str(vente.id))
+            raise
 
         # 7. Retour des données pour la réponse API
         return {
@@ -3,14 +3,22 @@ Use Case: Générer Indicateurs de Performance
 Fonctionnalité métier complète pour générer les rapports de performance
 """
 
+from collections import defaultdict
 from typing import List, Dict, Any
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from uuid import UUID
 
 from ..repositories.vente_repository import VenteRepository
 from ..repositories.magasin_repository import MagasinRepository
 from ..services.stock_service import StockService
 from ..services.produit_service import ProduitService
-from ...domain.entities import Magasin
+from ...domain.value_objects import (
+    AnalyseStock,
+    ProduitInfo,
+    StockInfo,
+    VentesProduitAgregees,
+)
 
 
 class GenererIndicateursUseCase:
@@ -48,23 +56,46 @@ class GenererIndicateursUseCase:
         # 1. Récupération de tous les magasins
         magasins = self._magasin_repo.get_all()
 
-        # 2. Calcul de la période d'analyse (7 derniers jours)
-        fin_periode = datetime.now()
+        # 2. Calcul de la période d'analyse (7 derniers jours), bornes UTC (USE_TZ)
+        fin_periode = datetime.now(timezone.utc)
         debut_periode = fin_periode - timedelta(days=7)
 
+        # Stocks de tous les magasins récupérés d'un coup (appels indépendants)
+        stocks_par_magasin = self._stock_service.get_all_stock_local_par_magasin(
+            [magasin.id for magasin in magasins]
+        )
+
+        # Chiffre d'affaires par magasin, sommé en SQL
+        chiffres_affaires = self._vente_repo.get_chiffre_affaires_par_magasin(
+            debut_periode, fin_periode
+        )
+
+        # Top 3 de chaque magasin classé en SQL: au plus 3 lignes par magasin
+        top_produits = self._vente_repo.get_top_produits_vendus(
+            debut_periode, fin_periode, limite=3
+        )
+        top_par_magasin = defaultdict(list)
+        for agregat in top_produits:
+            top_par_magasin[agregat.magasin_id].append(agregat)
+
+        # Noms des seuls produits retenus, en un seul appel au catalogue
+        produits = self._produit_service.get_produits_details(
+            list({agregat.produit_id for agregat in top_produits})
+        )
+
         indicateurs = []
 
         for magasin in magasins:
-            # 3. Calcul du chiffre d'affaires (ventes actives sur la même période que tendances)
-            chiffre_affaires = self._calculer_chiffre_affaires(
-                magasin, debut_periode, fin_periode
-            )
+            # 3. Chiffre d'affaires (ventes actives sur la même période que tendances)
+            chiffre_affaires = chiffres_affaires.get(magasin.id, Decimal("0"))
 
             # 4. Analyse du stock (métier: ruptures et surstock)
-            ruptures, surstock = self._analyser_stock(magasin)
+            ruptures, surstock = self._analyser_stock(stocks_par_magasin[magasin.id])
 
             # 5. Calcul des tendances (métier: top 3 produits de la semaine)
-            tendances = self._calculer_tendances(magasin, debut_periode, fin_periode)
+            tendances = self._formater_tendances(
+                top_par_magasin.get(magasin.id, []), produits
+            )
 
             # 6. Agrégation des indicateurs
             indicateurs.append(
@@ -79,77 +110,26 @@ class GenererIndicateursUseCase:
 
         return indicateurs
 
-    def _calculer_chiffre_affaires(
-        self, magasin: Magasin, debut_periode: datetime, fin_periode: datetime
-    ) -> float:
-        """
-        Calcule le chiffre d'affaires du magasin sur une période (ventes actives uniquement)
-        """
-        ventes_periode = self._vente_repo.get_ventes_actives_by_magasin_and_period(
-            magasin.id, debut_periode, fin_periode
-        )
-        total = 0.0
-        for vente in ventes_periode:
-            total += float(vente.calculer_total())
-        return total
-
-    def _analyser_stock(self, magasin: Magasin) -> tuple[int, int]:
+    def _analyser_stock(self, stocks: List[StockInfo]) -> tuple[int, int]:
         """
         Analyse le stock pour détecter ruptures et surstock
-        Règles métier:
-        - Rupture = stock = 0
-        - Surstock = stock > 10
+        Règles métier portées par AnalyseStock (partagées avec le rapport)
         """
-        stocks = self._stock_service.get_all_stock_local(magasin.id)
+        analyse = AnalyseStock.depuis_stocks(stocks)
+        return analyse.ruptures, analyse.surstock
 
-        ruptures = 0
-        surstock = 0
-
-        for stock_info in stocks:
-            if stock_info.quantite_disponible == 0:
-                ruptures += 1
-            elif stock_info.quantite_disponible > 10:
-                surstock += 1
-
-        return ruptures, surstock
-
-    def _calculer_tendances(
-        self, magasin: Magasin, debut: datetime, fin: datetime
+    def _formater_tendances(
+        self,
+        top_produits: List[VentesProduitAgregees],
+        produits: Dict[UUID, ProduitInfo],
     ) -> str:
-        """
-        Calcule les tendances de vente (top 3 produits de la période)
-        Règle métier: Seules les ventes actives comptent
-        """
-        ventes_periode = self._vente_repo.get_ventes_actives_by_magasin_and_period(
-            magasin.id, debut, fin
-        )
-
-        # Comptage des produits vendus
-        produits_vendus = {}
-        produits_noms = {}  # Cache des noms de produits
-
-        for vente in ventes_periode:
-            for ligne in vente.lignes:
-                produit_id = ligne.produit_id
-
-                # Récupération du nom du produit (avec cache)
-                if produit_id not in produits_noms:
-                    produit_info = self._produit_service.get_produit_details(produit_id)
-                    produits_noms[produit_id] = (
-                        produit_info.nom if produit_info else f"Produit {produit_id}"
-                    )
-
-                nom_produit = produits_noms[produit_id]
-                produits_vendus[nom_produit] = (
-                    produits_vendus.get(nom_produit, 0) + ligne.quantite
-                )
-
-        # Top 3 produits
-        top_produits = sorted(
-            produits_vendus.items(), key=lambda x: x[1], reverse=True
-        )[:3]
-
+        """Libellé des tendances: nom et quantité des produits du top 3"""
         if not top_produits:
             return "Aucune vente cette semaine"
 
-        return ", ".join([f"{nom} ({quantite})" for nom, quantite in top_produits])
+        libelles = []
+        for agregat in top_produits:
+            produit_info = produits.get(agregat.produit_id)
+            nom = produit_info.nom if produit_info else f"Produit {agregat.produit_id}"
+            libelles.append(f"{nom} ({agregat.quantite_totale})")
+        return ", ".join(libelles)
@@ -3,15 +3,25 @@ Use Case: Générer Rapport Consolidé (UC1)
 Fonctionnalité métier complète pour générer le rapport consolidé tous magasins
 """
 
+import logging
+from collections import defaultdict
 from typing import Dict, Any, List
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from decimal import Decimal
+from uuid import UUID
 
 from ..repositories.vente_repository import VenteRepository
 from ..repositories.magasin_repository import MagasinRepository
 from ..services.stock_service import StockService
 from ..services.produit_service import ProduitService
-from ...domain.entities import Magasin
+from ...domain.value_objects import (
+    AnalyseStock,
+    ProduitInfo,
+    StockInfo,
+    VentesProduitAgregees,
+)
+
+logger = logging.getLogger(__name__)
 
 
 class GenererRapportConsolideUseCase:
@@ -48,22 +58,46 @@ class GenererRapportConsolideUseCase:
         magasins = self._magasin_repo.get_all()
 
         # Définir la période d'analyse (7 derniers jours)
-        fin_periode = datetime.now()
+        fin_periode = datetime.now(timezone.utc)
         debut_periode = fin_periode - timedelta(days=7)
 
+        # Ventes actives agrégées en SQL par magasin et produit, en une requête
+        agregats = self._vente_repo.get_ventes_agregees_by_period(
+            debut_periode, fin_periode
+        )
+        agregats_par_magasin = defaultdict(list)
+        for agregat in agregats:
+            agregats_par_magasin[agregat.magasin_id].append(agregat)
+
+        # Détails de tous les produits vendus en un seul appel au catalogue
+        produits = self._produit_service.get_produits_details(
+            list({agregat.produit_id for agregat in agregats})
+        )
+
+        # Stocks de tous les magasins en parallèle (pool borné de l'adaptateur)
+        try:
+            stocks_par_magasin = self._stock_service.get_all_stock_local_par_magasin(
+                [magasin.id for magasin in magasins]
+            )
+        except Exception:
+            logger.exception("Erreur lors du calcul des stocks des magasins")
+            stocks_par_magasin = {}
+
         rapports = []
 
         for magasin in magasins:
+            agregats_magasin = agregats_par_magasin.get(magasin.id, [])
+
             # Calcul du total (chiffre d'affaires sur la même période que produits_vendus)
-            total = self._calculer_chiffre_affaires(magasin, debut_periode, fin_periode)
+            total = self._calculer_chiffre_affaires(agregats_magasin)
 
             # Liste des produits vendus
-            produits_vendus = self._calculer_produits_vendus(
-                magasin, debut_periode, fin_periode
-            )
+            produits_vendus = self._calculer_produits_vendus(agregats_magasin, produits)
 
             # Informations stock local
-            stock_local = self._calculer_stock_local(magasin)
+            stock_local = self._calculer_stock_local(
+                stocks_par_magasin.get(magasin.id, [])
+            )
 
             rapports.append(
                 {
@@ -77,69 +111,35 @@ class GenererRapportConsolideUseCase:
         return rapports
 
     def _calculer_chiffre_affaires(
-        self, magasin: Magasin, debut_periode: datetime, fin_periode: datetime
+        self, agregats: List[VentesProduitAgregees]
     ) -> Decimal:
         """Calcule le CA d'un magasin sur une période (ventes actives uniquement)"""
-        ventes_periode = self._vente_repo.get_ventes_actives_by_magasin_and_period(
-            magasin.id, debut_periode, fin_periode
-        )
-        total = sum(vente.calculer_total() for vente in ventes_periode)
-        return Decimal(str(total)) if total else Decimal("0")
+        return sum((agregat.chiffre_affaires for agregat in agregats), Decimal("0"))
 
     def _calculer_produits_vendus(
-        self, magasin: Magasin, debut_periode: datetime, fin_periode: datetime
+        self, agregats: List[VentesProduitAgregees], produits: Dict[UUID, ProduitInfo]
     ) -> List[Dict[str, Any]]:
         """Calcule la liste des produits vendus par ce magasin sur une période"""
-        ventes_periode = self._vente_repo.get_ventes_actives_by_magasin_and_period(
-            magasin.id, debut_periode, fin_periode
-        )
-        produits_vendus = {}
-        for vente in ventes_periode:
-            for ligne in vente.lignes:
-                produit_id = str(ligne.produit_id)
-                # Récupération du nom du produit
-                try:
-                    produit_info = self._produit_service.get_produit_details(
-                        ligne.produit_id
-                    )
-                    nom_produit = (
-                        produit_info.nom if produit_info else f"Produit {produit_id}"
-                    )
-                except:
-                    nom_produit = f"Produit {produit_id}"
-                if produit_id not in produits_vendus:
-                    produits_vendus[produit_id] = {
-                        "produit_id": produit_id,
-                        "nom": nom_produit,
-                        "quantite_totale": 0,
-                        "chiffre_affaires": 0.0,
-                    }
-                produits_vendus[produit_id]["quantite_totale"] += ligne.quantite
-                produits_vendus[produit_id]["chiffre_affaires"] += float(
-                    ligne.sous_total
-                )
-        return list(produits_vendus.values())
-
-    def _calculer_stock_local(self, magasin: Magasin) -> Dict[str, Any]:
+        # Quantités et CA déjà sommés par la base: une conversion par produit
+        produits_vendus = []
+        for agregat in agregats:
+            produit_info = produits.get(agregat.produit_id)
+            nom = produit_info.nom if produit_info else f"Produit {agregat.produit_id}"
+            produits_vendus.append(
+                {
+                    "produit_id": str(agregat.produit_id),
+                    "nom": nom,
+                    "quantite_totale": agregat.quantite_totale,
+                    "chiffre_affaires": float(agregat.chiffre_affaires),
+                }
+            )
+        return produits_vendus
+
+    def _calculer_stock_local(self, stocks: List[StockInfo]) -> Dict[str, Any]:
         """Calcule les informations de stock local pour ce magasin"""
-        try:
-            stocks = self._stock_service.get_all_stock_local(magasin.id)
-
-            ruptures = 0
-            surstock = 0
-            produits_en_stock = len(stocks)
-
-            for stock_info in stocks:
-                if stock_info.quantite_disponible == 0:
-                    ruptures += 1
-                elif stock_info.quantite_disponible > 10:
-                    surstock += 1
-
-            return {
-                "ruptures": ruptures,
-                "surstock": surstock,
-                "produits_en_stock": produits_en_stock,
-            }
-        except Exception as e:
-            print(f"Erreur lors du calcul des stocks: {e}")
-            return {"ruptures": 0, "surstock": 0, "produits_en_stock": 0}
+        analyse = AnalyseStock.depuis_stocks(stocks)
+        return {
+            "ruptures": analyse.ruptures,
+            "surstock": analyse.surstock,
+            "produits_en_stock": analyse.produits_en_stock,
+        }
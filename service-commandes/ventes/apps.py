@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class VentesConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "ventes"
+
+    def ready(self):
+        # Enregistrement des receivers d'invalidation de cache
+        from . import signals  # noqa: F401
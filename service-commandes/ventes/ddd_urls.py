@@ -3,8 +3,8 @@ URLs DDD - Routes pour les Use Cases
 Nouvelles routes basées sur les fonctionnalités métier plutôt que sur les entités
 """
 
-from django.urls import path, include
-from rest_framework.routers import DefaultRouter
+from django.urls import path
+from rest_framework.routers import SimpleRouter
 from .interfaces.ddd_views import (
     DDDVenteViewSet,
     DDDIndicateursAPI,
@@ -12,13 +12,14 @@ from .interfaces.ddd_views import (
     lister_magasins,
 )
 
-# Router pour les ViewSets DDD
-router = DefaultRouter()
+# Router pour les ViewSets DDD: SimpleRouter, la vue racine et les suffixes
+# de format de DefaultRouter ne sont pas utilisés par cette API
+router = SimpleRouter()
 router.register(r"ventes-ddd", DDDVenteViewSet, basename="ventes-ddd")
 
 urlpatterns = [
-    # Routes des Use Cases DDD
-    path("", include(router.urls)),
+    # Routes des Use Cases DDD (calculées une fois, sans include intermédiaire)
+    *router.urls,
     # Endpoints spécifiques DDD
     path("indicateurs/", DDDIndicateursAPI.as_view(), name="indicateurs-ddd"),
     path(
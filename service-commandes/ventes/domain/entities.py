@@ -32,6 +32,8 @@ class Vente:
         self._statut = StatutVente.ACTIVE
         self._date_annulation: Optional[datetime] = None
         self._motif_annulation: Optional[str] = None
+        # Total persisté, reconstitué par le repository (None: à recalculer)
+        self._total: Optional[Decimal] = None
 
     @property
     def id(self) -> uuid.UUID:
@@ -65,6 +67,15 @@ class Vente:
     def motif_annulation(self) -> Optional[str]:
         return self._motif_annulation
 
+    @property
+    def total(self) -> Decimal:
+        """
+        Total de la vente: valeur persistée si connue, sinon calculée
+        """
+        if self._total is None:
+            return self.calculer_total()
+        return self._total
+
     def ajouter_ligne(
         self, produit_id: ProduitId, quantite: int, prix_unitaire: Decimal
     ) -> None:
@@ -84,12 +95,13 @@ class Vente:
             prix_unitaire=prix_unitaire,
         )
         self._lignes.append(ligne)
+        self._total = None
 
     def calculer_total(self) -> Decimal:
         """
         Calcule le total de la vente (logique métier)
         """
-        return sum(ligne.sous_total for ligne in self._lignes)
+        return sum((ligne.sous_total for ligne in self._lignes), Decimal("0"))
 
     def annuler(self, motif: str) -> None:
         """
@@ -250,7 +262,7 @@ class CommandeEcommerce:
         """
         Calcule le sous-total (produits uniquement)
         """
-        return sum(ligne.sous_total for ligne in self._lignes)
+        return sum((ligne.sous_total for ligne in self._lignes), Decimal("0"))
 
     def calculer_total(self) -> Decimal:
         """
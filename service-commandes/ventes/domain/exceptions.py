@@ -53,3 +53,9 @@ class VenteInvalideError(VenteError):
     """Erreur quand une vente est invalide"""
 
     pass
+
+
+class MiseAJourStockError(VenteError):
+    """Erreur quand le service inventaire n'a pas appliqué une mise à jour de stock"""
+
+    pass
@@ -7,7 +7,7 @@ import uuid
 from enum import Enum
 from decimal import Decimal
 from dataclasses import dataclass
-from typing import NewType, Optional
+from typing import List, NewType, Optional
 
 
 # Type Aliases pour la sécurité des types
@@ -105,6 +105,46 @@ class StockInfo:
         return max(0, quantite_demandee - self.quantite_disponible)
 
 
+# Règle métier: au-delà de ce seuil, un produit est en surstock
+SEUIL_SURSTOCK = 10
+
+
+@dataclass(frozen=True)
+class AnalyseStock:
+    """
+    Value Object - Ruptures et surstock d'un ensemble de stocks
+    Règles métier:
+    - Rupture = stock = 0
+    - Surstock = stock > SEUIL_SURSTOCK
+    """
+
+    ruptures: int
+    surstock: int
+    produits_en_stock: int
+
+    @classmethod
+    def depuis_stocks(cls, stocks: List[StockInfo]) -> "AnalyseStock":
+        """Quantités extraites une fois, comptages faits par list.count et sum"""
+        quantites = [stock.quantite_disponible for stock in stocks]
+        return cls(
+            ruptures=quantites.count(0),
+            surstock=sum(quantite > SEUIL_SURSTOCK for quantite in quantites),
+            produits_en_stock=len(quantites),
+        )
+
+
+@dataclass(frozen=True)
+class VentesProduitAgregees:
+    """
+    Value Object - Ventes actives d'un produit dans un magasin, agrégées
+    """
+
+    magasin_id: MagasinId
+    produit_id: ProduitId
+    quantite_totale: int
+    chiffre_affaires: Decimal
+
+
 @dataclass(frozen=True)
 class CommandeVente:
     """
@@ -0,0 +1,43 @@
+"""
+Cache mémoire partagé des adaptateurs inter-services
+Infrastructure layer - LRU avec expiration, commun à tous les threads du processus
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+
+class CacheTTL:
+    """
+    Cache LRU en mémoire avec expiration, partagé par les threads du processus
+    """
+
+    def __init__(self, maxsize: int):
+        self._maxsize = maxsize
+        self._donnees: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, cle: Hashable) -> Optional[Any]:
+        with self._lock:
+            entree = self._donnees.get(cle)
+            if entree is None:
+                return None
+            expiration, valeur = entree
+            if expiration < time.monotonic():
+                del self._donnees[cle]
+                return None
+            self._donnees.move_to_end(cle)
+            return valeur
+
+    def set(self, cle: Hashable, valeur: Any, ttl: float) -> None:
+        with self._lock:
+            self._donnees[cle] = (time.monotonic() + ttl, valeur)
+            self._donnees.move_to_end(cle)
+            while len(self._donnees) > self._maxsize:
+                self._donnees.popitem(last=False)
+
+    def invalider(self, cle: Hashable) -> None:
+        with self._lock:
+            self._donnees.pop(cle, None)
@@ -0,0 +1,23 @@
+"""
+Sessions HTTP partagées des adaptateurs inter-services
+Infrastructure layer - réutilise les connexions TCP d'une requête à l'autre
+"""
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Assez de connexions pour les appels parallèles du service stock
+POOL_CONNECTIONS = 8
+POOL_MAXSIZE = 32
+
+
+def construire_session() -> requests.Session:
+    """
+    Session keep-alive avec un pool de connexions par hôte
+    Destinée à être créée une fois par module et partagée par les instances
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
@@ -0,0 +1,72 @@
+"""
+Décorateur de cache pour le ProduitService
+Infrastructure layer - mémorise les détails produits le temps d'une requête,
+et une minute entre requêtes pour les lectures groupées (libellés)
+"""
+
+from typing import Dict, List, Optional
+from uuid import UUID
+
+from ..application.services.produit_service import ProduitService
+from ..domain.value_objects import ProduitInfo
+from ._cache import CacheTTL
+
+# Les lectures groupées servent aux libellés (listes, rapports): une minute de
+# retard est acceptable. Le prix d'une vente (lecture unitaire) est toujours relu
+TTL_PRODUITS_SECONDES = 60
+MAX_PRODUITS_EN_CACHE = 10000
+
+# Partagé par toutes les instances: les vues sont recréées à chaque requête
+_CACHE = CacheTTL(maxsize=MAX_PRODUITS_EN_CACHE)
+
+
+class CachedProduitService(ProduitService):
+    """
+    Enveloppe un ProduitService et mémorise chaque produit déjà demandé
+    Instancié une fois par requête: un même produit n'est récupéré qu'une
+    fois, quel que soit le nombre de ventes ou de magasins qui le citent
+    """
+
+    def __init__(
+        self, produit_service: ProduitService, ttl: float = TTL_PRODUITS_SECONDES
+    ):
+        self._produit_service = produit_service
+        self._ttl = ttl
+        self._cache: Dict[UUID, Optional[ProduitInfo]] = {}
+
+    def get_produit_details(self, produit_id: UUID) -> Optional[ProduitInfo]:
+        """Détails d'un produit, récupérés au premier appel seulement"""
+        if produit_id not in self._cache:
+            self._cache[produit_id] = self._produit_service.get_produit_details(
+                produit_id
+            )
+        return self._cache[produit_id]
+
+    def get_produits_details(self, produit_ids: List[UUID]) -> Dict[UUID, ProduitInfo]:
+        """
+        Détails de plusieurs produits: cache de la requête, puis cache partagé,
+        seuls les IDs inconnus des deux sont demandés
+        """
+        produits = {}
+        manquants = []
+        for produit_id in dict.fromkeys(produit_ids):
+            if produit_id in self._cache:
+                produit_info = self._cache[produit_id]
+            else:
+                produit_info = _CACHE.get(produit_id)
+                if produit_info is None:
+                    manquants.append(produit_id)
+                    continue
+            if produit_info is not None:
+                produits[produit_id] = produit_info
+
+        if manquants:
+            trouves = self._produit_service.get_produits_details(manquants)
+            for produit_id in manquants:
+                produit_info = trouves.get(produit_id)
+                self._cache[produit_id] = produit_info
+                if produit_info is not None:
+                    _CACHE.set(produit_id, produit_info, self._ttl)
+                    produits[produit_id] = produit_info
+
+        return produits
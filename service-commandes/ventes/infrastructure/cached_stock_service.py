@@ -0,0 +1,93 @@
+"""
+Décorateur de cache pour le StockService
+Infrastructure layer - mémorise quelques secondes les stocks d'un magasin
+"""
+
+from typing import Any, Dict, List
+from uuid import UUID
+
+from ..application.services.stock_service import StockService
+from ..domain.value_objects import StockInfo
+from ._cache import CacheTTL
+
+# Durée de vie courte: les rapports tolèrent quelques secondes de retard
+TTL_STOCKS_SECONDES = 10
+MAX_MAGASINS_EN_CACHE = 512
+
+# Partagé par toutes les instances: les vues sont recréées à chaque requête
+_CACHE = CacheTTL(maxsize=MAX_MAGASINS_EN_CACHE)
+
+
+class CachedStockService(StockService):
+    """
+    Enveloppe un StockService et mémorise les stocks complets de chaque magasin
+    Les indicateurs et le rapport consolidé rafraîchis ensemble ne demandent
+    ainsi qu'une fois le stock d'un magasin. Toute écriture de stock passant
+    par ce service invalide l'entrée du magasin concerné
+    """
+
+    def __init__(self, stock_service: StockService, ttl: float = TTL_STOCKS_SECONDES):
+        self._stock_service = stock_service
+        self._ttl = ttl
+
+    def get_stock_local(self, magasin_id: UUID, produit_id: UUID) -> StockInfo:
+        """Stock d'un produit, toujours lu à la source (validation des ventes)"""
+        return self._stock_service.get_stock_local(magasin_id, produit_id)
+
+    def get_all_stock_local(self, magasin_id: UUID) -> List[StockInfo]:
+        """Stocks d'un magasin, lus à la source seulement si le cache a expiré"""
+        stocks = _CACHE.get(magasin_id)
+        if stocks is None:
+            stocks = self._stock_service.get_all_stock_local(magasin_id)
+            self._memoriser(magasin_id, stocks)
+        return list(stocks)
+
+    def get_all_stock_local_par_magasin(
+        self, magasin_ids: List[UUID]
+    ) -> Dict[UUID, List[StockInfo]]:
+        """Stocks de plusieurs magasins, seuls les magasins absents sont demandés"""
+        resultats = {}
+        manquants = []
+        for magasin_id in magasin_ids:
+            stocks = _CACHE.get(magasin_id)
+            if stocks is None:
+                manquants.append(magasin_id)
+            else:
+                resultats[magasin_id] = list(stocks)
+
+        if manquants:
+            # Délégué en un bloc: l'adaptateur HTTP garde ses appels parallèles
+            trouves = self._stock_service.get_all_stock_local_par_magasin(manquants)
+            for magasin_id, stocks in trouves.items():
+                self._memoriser(magasin_id, stocks)
+                resultats[magasin_id] = list(stocks)
+
+        return {magasin_id: resultats[magasin_id] for magasin_id in magasin_ids}
+
+    def _memoriser(self, magasin_id: UUID, stocks: List[StockInfo]) -> None:
+        # Une liste vide peut masquer une erreur réseau: elle n'est pas retenue
+        if stocks:
+            _CACHE.set(magasin_id, stocks, self._ttl)
+
+    def decrease_stock(self, magasin_id: UUID, produit_id: UUID, quantite: int) -> None:
+        """Diminue le stock puis invalide le cache du magasin"""
+        try:
+            self._stock_service.decrease_stock(magasin_id, produit_id, quantite)
+        finally:
+            _CACHE.invalider(magasin_id)
+
+    def increase_stock(self, magasin_id: UUID, produit_id: UUID, quantite: int) -> None:
+        """Augmente le stock puis invalide le cache du magasin"""
+        try:
+            self._stock_service.increase_stock(magasin_id, produit_id, quantite)
+        finally:
+            _CACHE.invalider(magasin_id)
+
+    def batch_increase_stock(
+        self, magasin_id: UUID, items: List[Dict[str, Any]]
+    ) -> None:
+        """Augmente le stock de plusieurs produits puis invalide le cache"""
+        try:
+            self._stock_service.batch_increase_stock(magasin_id, items)
+        finally:
+            _CACHE.invalider(magasin_id)
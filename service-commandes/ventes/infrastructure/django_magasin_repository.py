@@ -3,7 +3,7 @@ Implémentation Django du MagasinRepository
 Infrastructure layer - convertit entre entités domain et modèles Django
 """
 
-from typing import List, Optional
+from typing import Dict, List, Optional
 from uuid import UUID
 
 from ..application.repositories.magasin_repository import MagasinRepository
@@ -25,6 +25,14 @@ class DjangoMagasinRepository(MagasinRepository):
         except MagasinDjango.DoesNotExist:
             return None
 
+    def get_by_ids(self, magasin_ids: List[UUID]) -> Dict[UUID, Magasin]:
+        """Récupère plusieurs magasins en une requête (id IN ...)"""
+        if not magasin_ids:
+            return {}
+        magasins_django = MagasinDjango.objects.filter(id__in=magasin_ids)
+        magasins = (self._to_domain_entity(magasin) for magasin in magasins_django)
+        return {magasin.id: magasin for magasin in magasins}
+
     def get_all(self) -> List[Magasin]:
         """Récupère tous les magasins et les convertit en entités domain"""
         magasins_django = MagasinDjango.objects.all()
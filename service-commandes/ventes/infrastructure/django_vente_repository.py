@@ -3,19 +3,30 @@ Implémentation Django du VenteRepository
 Infrastructure layer - convertit entre entités domain et modèles Django
 """
 
-from typing import List, Optional
+from typing import Dict, List, Optional
 from datetime import datetime
+from decimal import Decimal
 from uuid import UUID
+from django.db.models import Count, DecimalField, F, Max, Q, Sum, Window
+from django.db.models.functions import RowNumber
 
 from ..application.repositories.vente_repository import VenteRepository
 from ..domain.entities import Vente
-from ..domain.value_objects import StatutVente, LigneVenteVO
+from ..domain.value_objects import (
+    LigneVenteVO,
+    MagasinId,
+    StatutVente,
+    VentesProduitAgregees,
+)
 from ..models import (
     Vente as VenteDjango,
     LigneVente as LigneVenteDjango,
     Magasin as MagasinDjango,
 )
 
+# Nombre de ventes (et de leurs lignes préchargées) lues par aller-retour SQL
+TAILLE_LOT_LECTURE = 500
+
 
 class DjangoVenteRepository(VenteRepository):
     """
@@ -67,10 +78,52 @@ class DjangoVenteRepository(VenteRepository):
         except VenteDjango.DoesNotExist:
             return None
 
-    def get_all(self) -> List[Vente]:
-        """Récupère toutes les ventes et les convertit en entités domain"""
-        ventes_django = VenteDjango.objects.prefetch_related("lignes").all()
-        return [self._to_domain_entity(vente) for vente in ventes_django]
+    def get_all(
+        self,
+        magasin_id: Optional[UUID] = None,
+        statut: Optional[str] = None,
+        offset: int = 0,
+        limite: Optional[int] = None,
+    ) -> List[Vente]:
+        """
+        Récupère les ventes (filtrées et paginées en SQL) et les convertit en
+        entités domain au fil de l'eau: les modèles Django sont lus par lots
+        """
+        ventes_django = (
+            self._filtrer(magasin_id, statut)
+            .prefetch_related("lignes")
+            .order_by("-date_vente", "id")
+        )
+        if limite is not None:
+            ventes_django = ventes_django[offset : offset + limite]
+        elif offset:
+            ventes_django = ventes_django[offset:]
+        return [
+            self._to_domain_entity(vente)
+            for vente in ventes_django.iterator(chunk_size=TAILLE_LOT_LECTURE)
+        ]
+
+    def get_empreinte(
+        self, magasin_id: Optional[UUID] = None, statut: Optional[str] = None
+    ) -> str:
+        """Une seule requête d'agrégats (nombre par statut, dernières dates)"""
+        agregats = self._filtrer(magasin_id, statut).aggregate(
+            nombre=Count("id"),
+            actives=Count("id", filter=Q(statut=StatutVente.ACTIVE.value)),
+            annulees=Count("id", filter=Q(statut=StatutVente.ANNULEE.value)),
+            derniere_vente=Max("date_vente"),
+            derniere_annulation=Max("date_annulation"),
+        )
+        return "|".join(str(agregats[cle]) for cle in sorted(agregats))
+
+    def _filtrer(self, magasin_id: Optional[UUID], statut: Optional[str]):
+        """Ventes filtrées par magasin et statut (filtres optionnels)"""
+        ventes_django = VenteDjango.objects.all()
+        if magasin_id is not None:
+            ventes_django = ventes_django.filter(magasin_id=magasin_id)
+        if statut is not None:
+            ventes_django = ventes_django.filter(statut=statut)
+        return ventes_django
 
     def get_ventes_actives_by_magasin(self, magasin_id: UUID) -> List[Vente]:
         """Récupère les ventes actives d'un magasin"""
@@ -90,6 +143,97 @@ class DjangoVenteRepository(VenteRepository):
         )
         return [self._to_domain_entity(vente) for vente in ventes_django]
 
+    def get_ventes_agregees_by_period(
+        self, debut: datetime, fin: datetime
+    ) -> List[VentesProduitAgregees]:
+        """Agrège les lignes de vente en SQL (GROUP BY magasin, produit)"""
+        lignes = (
+            LigneVenteDjango.objects.filter(
+                vente__statut=StatutVente.ACTIVE.value,
+                vente__date_vente__range=(debut, fin),
+            )
+            .values("vente__magasin_id", "produit_id")
+            .annotate(
+                quantite_totale=Sum("quantite"),
+                chiffre_affaires=Sum(
+                    F("quantite") * F("prix_unitaire"),
+                    output_field=DecimalField(max_digits=14, decimal_places=2),
+                ),
+            )
+            .order_by()
+        )
+        return [
+            VentesProduitAgregees(
+                magasin_id=ligne["vente__magasin_id"],
+                produit_id=ligne["produit_id"],
+                quantite_totale=ligne["quantite_totale"],
+                chiffre_affaires=ligne["chiffre_affaires"],
+            )
+            for ligne in lignes
+        ]
+
+    def get_chiffre_affaires_par_magasin(
+        self, debut: datetime, fin: datetime
+    ) -> Dict[MagasinId, Decimal]:
+        """Somme les lignes de vente en SQL (GROUP BY magasin)"""
+        totaux = (
+            LigneVenteDjango.objects.filter(
+                vente__statut=StatutVente.ACTIVE.value,
+                vente__date_vente__range=(debut, fin),
+            )
+            .values("vente__magasin_id")
+            .annotate(
+                chiffre_affaires=Sum(
+                    F("quantite") * F("prix_unitaire"),
+                    output_field=DecimalField(max_digits=14, decimal_places=2),
+                )
+            )
+            .order_by()
+        )
+        return {
+            total["vente__magasin_id"]: total["chiffre_affaires"] for total in totaux
+        }
+
+    def get_top_produits_vendus(
+        self, debut: datetime, fin: datetime, limite: int = 3
+    ) -> List[VentesProduitAgregees]:
+        """
+        Classement fait en SQL: ROW_NUMBER() par magasin sur SUM(quantite),
+        seules les `limite` premières lignes de chaque magasin sont lues
+        """
+        lignes = (
+            LigneVenteDjango.objects.filter(
+                vente__statut=StatutVente.ACTIVE.value,
+                vente__date_vente__range=(debut, fin),
+            )
+            .values("vente__magasin_id", "produit_id")
+            .annotate(
+                quantite_totale=Sum("quantite"),
+                chiffre_affaires=Sum(
+                    F("quantite") * F("prix_unitaire"),
+                    output_field=DecimalField(max_digits=14, decimal_places=2),
+                ),
+            )
+            .annotate(
+                rang=Window(
+                    RowNumber(),
+                    partition_by=F("vente__magasin_id"),
+                    order_by=[F("quantite_totale").desc(), F("produit_id").asc()],
+                )
+            )
+            .filter(rang__lte=limite)
+            .order_by("vente__magasin_id", "rang")
+        )
+        return [
+            VentesProduitAgregees(
+                magasin_id=ligne["vente__magasin_id"],
+                produit_id=ligne["produit_id"],
+                quantite_totale=ligne["quantite_totale"],
+                chiffre_affaires=ligne["chiffre_affaires"],
+            )
+            for ligne in lignes
+        ]
+
     def delete(self, vente_id: str) -> None:
         """Supprime une vente"""
         VenteDjango.objects.filter(id=vente_id).delete()
@@ -108,6 +252,7 @@ class DjangoVenteRepository(VenteRepository):
         vente._statut = StatutVente(vente_django.statut)
         vente._date_annulation = vente_django.date_annulation
         vente._motif_annulation = vente_django.motif_annulation
+        vente._total = vente_django.total
 
         # Reconstitution des lignes de vente
         for ligne_django in vente_django.lignes.all():
@@ -128,11 +273,15 @@ class DjangoVenteRepository(VenteRepository):
         # Suppression des anciennes lignes
         vente_django.lignes.all().delete()
 
-        # Création des nouvelles lignes
-        for ligne in lignes:
-            LigneVenteDjango.objects.create(
-                vente=vente_django,
-                produit_id=ligne.produit_id,
-                quantite=ligne.quantite,
-                prix_unitaire=ligne.prix_unitaire,
-            )
+        # Création des nouvelles lignes en un seul INSERT
+        LigneVenteDjango.objects.bulk_create(
+            [
+                LigneVenteDjango(
+                    vente=vente_django,
+                    produit_id=ligne.produit_id,
+                    quantite=ligne.quantite,
+                    prix_unitaire=ligne.prix_unitaire,
+                )
+                for ligne in lignes
+            ]
+        )
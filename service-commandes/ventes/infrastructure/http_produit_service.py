@@ -3,14 +3,28 @@ Implémentation HTTP du ProduitService
 Infrastructure layer - communication avec le service externe produits
 """
 
+import logging
 import os
 import requests
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
 from uuid import UUID
 from decimal import Decimal
 
 from ..application.services.produit_service import ProduitService
 from ..domain.value_objects import ProduitInfo, ProduitId
+from ._http import construire_session
+
+logger = logging.getLogger(__name__)
+
+# Pool partagé pour les appels unitaires quand le lot n'est pas disponible
+MAX_APPELS_PARALLELES = 16
+_EXECUTOR = ThreadPoolExecutor(
+    max_workers=MAX_APPELS_PARALLELES, thread_name_prefix="produit-service"
+)
+
+# Session partagée par toutes les instances (connexions keep-alive réutilisées)
+_SESSION = construire_session()
 
 
 class HttpProduitService(ProduitService):
@@ -19,13 +33,18 @@ class HttpProduitService(ProduitService):
     Responsabilité: Communication réseau avec le service produits externe
     """
 
-    def __init__(self, base_url: Optional[str] = None):
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        session: Optional[requests.Session] = None,
+    ):
         if base_url is None:
             # Utilise la variable d'environnement configurée dans docker-compose
             base_url = os.environ.get(
                 "PRODUCT_SERVICE_URL", "http://catalogue-service:8000"
             )
         self.base_url = base_url
+        self._session = session or _SESSION
 
     def get_produit_details(self, produit_id: UUID) -> Optional[ProduitInfo]:
         """
@@ -39,7 +58,7 @@ class HttpProduitService(ProduitService):
         """
         try:
             # Utilisation de l'API DDD du service-catalogue
-            response = requests.get(
+            response = self._session.get(
                 f"{self.base_url}/api/ddd/catalogue/produits/{produit_id}/", timeout=5
             )
 
@@ -54,10 +73,65 @@ class HttpProduitService(ProduitService):
                 return None
             else:
                 # Log de l'erreur en production
-                print(f"Erreur service produits: {response.status_code}")
+                logger.error("Erreur service produits: %s", response.status_code)
                 return None
 
         except (requests.RequestException, KeyError, ValueError) as e:
             # Log de l'erreur en production
-            print(f"Erreur communication service produits: {e}")
+            logger.error("Erreur communication service produits: %s", e)
             return None
+
+    def get_produits_details(self, produit_ids: List[UUID]) -> Dict[UUID, ProduitInfo]:
+        """
+        Récupère les détails de plusieurs produits en un seul appel HTTP
+
+        Args:
+            produit_ids: IDs des produits à récupérer
+
+        Returns:
+            Dict produit_id -> ProduitInfo, vide en cas d'erreur réseau
+        """
+        if not produit_ids:
+            return {}
+        try:
+            response = self._session.get(
+                f"{self.base_url}/api/ddd/catalogue/produits/lot/",
+                params={"ids": ",".join(str(produit_id) for produit_id in produit_ids)},
+                timeout=5,
+            )
+
+            if response.status_code == 404:
+                # Catalogue sans endpoint de lot: appels unitaires en parallèle
+                return self._get_produits_details_en_parallele(produit_ids)
+            if response.status_code != 200:
+                logger.error("Erreur service produits: %s", response.status_code)
+                return {}
+
+            produits = {}
+            for data in response.json().get("produits", []):
+                produit_id = ProduitId(UUID(data["id"]))
+                produits[produit_id] = ProduitInfo(
+                    id=produit_id,
+                    nom=data["nom"],
+                    prix=Decimal(str(data["prix"])),
+                )
+            return produits
+
+        except (requests.RequestException, KeyError, ValueError) as e:
+            logger.error("Erreur communication service produits: %s", e)
+            return {}
+
+    def _get_produits_details_en_parallele(
+        self, produit_ids: List[UUID]
+    ) -> Dict[UUID, ProduitInfo]:
+        """
+        Un GET par produit, lancés en parallèle: la latence totale est celle
+        du produit le plus lent et non la somme des appels
+        """
+        produit_ids = list(dict.fromkeys(produit_ids))
+        details = _EXECUTOR.map(self.get_produit_details, produit_ids)
+        return {
+            produit_id: produit_info
+            for produit_id, produit_info in zip(produit_ids, details)
+            if produit_info
+        }
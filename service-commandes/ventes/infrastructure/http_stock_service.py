@@ -3,26 +3,46 @@ Implémentation HTTP du service Stock
 Interface concrète pour communiquer avec le service-inventaire via HTTP.
 """
 
+import logging
 import requests
-from typing import List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
 from uuid import UUID
 from django.conf import settings
 
 from ..application.services.stock_service import StockService
+from ..domain.exceptions import MiseAJourStockError
 from ..domain.value_objects import StockInfo, ProduitId, MagasinId
+from ._http import construire_session
+
+logger = logging.getLogger(__name__)
+
+# Pool partagé pour les appels de stock indépendants (un par magasin)
+MAX_APPELS_PARALLELES = 16
+_EXECUTOR = ThreadPoolExecutor(
+    max_workers=MAX_APPELS_PARALLELES, thread_name_prefix="stock-service"
+)
+
+# Session partagée par toutes les instances (connexions keep-alive réutilisées)
+_SESSION = construire_session()
 
 
 class HttpStockService(StockService):
     """Implémentation HTTP du service Stock pour communication inter-services"""
 
-    def __init__(self, base_url: str = "http://inventaire-service:8000"):
+    def __init__(
+        self,
+        base_url: str = "http://inventaire-service:8000",
+        session: Optional[requests.Session] = None,
+    ):
         self.base_url = base_url.rstrip("/")
+        self._session = session or _SESSION
 
     def get_stock_local(self, magasin_id: UUID, produit_id: UUID) -> StockInfo:
         """Récupère les informations de stock local via l'API DDD du service-inventaire"""
         try:
             # Utilisation de l'API DDD du service-inventaire
-            response = requests.get(
+            response = self._session.get(
                 f"{self.base_url}/api/ddd/inventaire/stock-local/{produit_id}/{magasin_id}/",
                 timeout=30,
             )
@@ -54,7 +74,7 @@ class HttpStockService(StockService):
         """Diminue le stock d'un produit dans un magasin"""
         try:
             # Utilisation de l'API DDD du service-inventaire
-            response = requests.post(
+            response = self._session.post(
                 f"{self.base_url}/api/ddd/inventaire/diminuer-stock/",
                 json={
                     "produit_id": str(produit_id),
@@ -63,18 +83,22 @@ class HttpStockService(StockService):
                 },
                 timeout=30,
             )
-
-            if response.status_code != 200:
-                print(f"Erreur lors de la diminution de stock: {response.text}")
-
         except requests.RequestException as e:
-            print(f"Erreur de communication avec le service inventaire: {e}")
+            logger.error("Erreur de communication avec le service inventaire: %s", e)
+            raise MiseAJourStockError(f"Service inventaire injoignable: {e}") from e
+
+        # Levée plutôt que journalisée: la vente enregistrée doit être compensée
+        if response.status_code != 200:
+            logger.error("Erreur lors de la diminution de stock: %s", response.text)
+            raise MiseAJourStockError(
+                f"Diminution de stock refusée (HTTP {response.status_code})"
+            )
 
     def increase_stock(self, magasin_id: UUID, produit_id: UUID, quantite: int) -> None:
         """Augmente le stock d'un produit dans un magasin (pour annulation)"""
         try:
             # Utilisation de l'API DDD du service-inventaire
-            response = requests.post(
+            response = self._session.post(
                 f"{self.base_url}/api/ddd/inventaire/augmenter-stock/",
                 json={
                     "produit_id": str(produit_id),
@@ -85,16 +109,54 @@ class HttpStockService(StockService):
             )
 
             if response.status_code != 200:
-                print(f"Erreur lors de l'augmentation de stock: {response.text}")
+                logger.error(
+                    "Erreur lors de l'augmentation de stock: %s", response.text
+                )
+
+        except requests.RequestException as e:
+            logger.error("Erreur de communication avec le service inventaire: %s", e)
+
+    def batch_increase_stock(
+        self, magasin_id: UUID, items: List[Dict[str, Any]]
+    ) -> None:
+        """Augmente le stock de plusieurs produits en un seul aller-retour"""
+        self._envoyer_lot("augmenter-stock-lot", magasin_id, items)
+
+    def _envoyer_lot(
+        self, operation: str, magasin_id: UUID, items: List[Dict[str, Any]]
+    ) -> None:
+        """Poste toutes les lignes d'un mouvement de stock dans une seule requête"""
+        if not items:
+            return
+        try:
+            response = self._session.post(
+                f"{self.base_url}/api/ddd/inventaire/{operation}/",
+                json={
+                    "magasin_id": str(magasin_id),
+                    "lignes": [
+                        {
+                            "produit_id": str(item["produit_id"]),
+                            "quantite": item["quantite"],
+                        }
+                        for item in items
+                    ],
+                },
+                timeout=30,
+            )
+
+            if response.status_code != 200:
+                logger.error(
+                    "Erreur lors du mouvement de stock groupé: %s", response.text
+                )
 
         except requests.RequestException as e:
-            print(f"Erreur de communication avec le service inventaire: {e}")
+            logger.error("Erreur de communication avec le service inventaire: %s", e)
 
     def get_all_stock_local(self, magasin_id: UUID) -> List[StockInfo]:
         """Récupère tous les stocks locaux d'un magasin"""
         try:
             # Utilisation de l'API DDD du service-inventaire
-            response = requests.get(
+            response = self._session.get(
                 f"{self.base_url}/api/ddd/inventaire/stocks-locaux/{magasin_id}/",
                 timeout=30,
             )
@@ -115,3 +177,16 @@ class HttpStockService(StockService):
 
         except requests.RequestException:
             return []
+
+    def get_all_stock_local_par_magasin(
+        self, magasin_ids: List[UUID]
+    ) -> Dict[UUID, List[StockInfo]]:
+        """
+        Stocks locaux de plusieurs magasins, appels lancés en parallèle:
+        la latence totale est celle du magasin le plus lent
+        """
+        magasin_ids = list(magasin_ids)
+        if len(magasin_ids) <= 1:
+            return super().get_all_stock_local_par_magasin(magasin_ids)
+        stocks = _EXECUTOR.map(self.get_all_stock_local, magasin_ids)
+        return dict(zip(magasin_ids, stocks))
@@ -3,10 +3,16 @@ Vues DDD pour le service Ventes (Commandes)
 Architecture Domain-Driven Design - Interface Layer
 """
 
+import hashlib
+import logging
+from typing import Any, Dict, Optional, Tuple
+
+from django.core.cache import cache
 from django.http import JsonResponse
 from rest_framework import viewsets, status
 from rest_framework.response import Response
 from rest_framework.decorators import action, api_view
+from rest_framework.utils.urls import replace_query_param
 from rest_framework.views import APIView
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
@@ -19,9 +25,11 @@ from ..domain.value_objects import (
     ProduitId,
     ClientId,
     StockInfo,
+    StatutVente,
 )
 from ..domain.exceptions import (
     MagasinInexistantError,
+    MiseAJourStockError,
     ProduitInexistantError,
     StockInsuffisantError,
     VenteInvalideError,
@@ -42,10 +50,119 @@ from ..application.use_cases.generer_rapport_consolide_use_case import (
 from ..infrastructure.django_vente_repository import DjangoVenteRepository
 from ..infrastructure.django_magasin_repository import DjangoMagasinRepository
 from ..infrastructure.http_produit_service import HttpProduitService
+from ..infrastructure.cached_produit_service import CachedProduitService
+from ..infrastructure.cached_stock_service import CachedStockService
 from ..infrastructure.http_stock_service import HttpStockService
 
 # Models
 from ..models import Magasin
+from ..signals import CLE_CACHE_MAGASINS
+
+logger = logging.getLogger(__name__)
+
+# Dépendances sans état propre à une requête, créées une fois par processus:
+# repositories, adaptateur produit et cache de stock (déjà partagé). Seul le
+# CachedProduitService, qui mémorise les produits d'une requête, est recréé
+_VENTE_REPO = DjangoVenteRepository()
+_MAGASIN_REPO = DjangoMagasinRepository()
+_PRODUIT_SERVICE = HttpProduitService()
+_STOCK_SERVICE = CachedStockService(HttpStockService())
+
+# Durée de vie des listes de ventes en cache (clé = ETag, déjà invalidante)
+TTL_LISTE_VENTES_SECONDES = 60
+
+# Pagination optionnelle de la liste des ventes
+TAILLE_PAGE_DEFAUT = 50
+TAILLE_PAGE_MAX = 500
+
+# Les magasins changent rarement: liste gardée en cache (invalidée par signal)
+TTL_MAGASINS_SECONDES = 300
+
+# Nombre maximal de commandes acceptées par un enregistrement groupé
+TAILLE_LOT_VENTES_MAX = 100
+
+CHAMPS_REQUIS_VENTE = ("magasin_id", "produit_id", "quantite", "client_id")
+
+
+def _construire_commande(data: Dict[str, Any]) -> CommandeVente:
+    """
+    Construit la commande métier depuis un élément du corps de requête
+    Lève ValueError/TypeError si un champ manque ou est mal formé
+    """
+    for field in CHAMPS_REQUIS_VENTE:
+        if field not in data:
+            raise ValueError(f"Le champ '{field}' est requis")
+
+    return CommandeVente(
+        magasin_id=MagasinId(uuid.UUID(data["magasin_id"])),
+        produit_id=ProduitId(uuid.UUID(data["produit_id"])),
+        quantite=int(data["quantite"]),
+        client_id=ClientId(uuid.UUID(data["client_id"])),
+    )
+
+
+# Erreurs de l'enregistrement d'une vente: (statut HTTP, raison, message)
+_ERREURS_ENREGISTREMENT = {
+    MagasinInexistantError: (
+        status.HTTP_400_BAD_REQUEST,
+        "magasin_inexistant",
+        "Magasin invalide: {}",
+    ),
+    ProduitInexistantError: (
+        status.HTTP_400_BAD_REQUEST,
+        "produit_inexistant",
+        "Produit invalide: {}",
+    ),
+    StockInsuffisantError: (status.HTTP_400_BAD_REQUEST, "stock_insuffisant", "{}"),
+    MiseAJourStockError: (
+        status.HTTP_503_SERVICE_UNAVAILABLE,
+        "stock_non_mis_a_jour",
+        "Vente non enregistrée: {}",
+    ),
+    ValueError: (
+        status.HTTP_400_BAD_REQUEST,
+        "format_invalide",
+        "Format de données invalide: {}",
+    ),
+    TypeError: (
+        status.HTTP_400_BAD_REQUEST,
+        "format_invalide",
+        "Format de données invalide: {}",
+    ),
+}
+_ERREUR_INTERNE = (
+    status.HTTP_500_INTERNAL_SERVER_ERROR,
+    "internal_error",
+    "Erreur interne: {}",
+)
+
+
+def _decrire_erreur_enregistrement(erreur: Exception) -> Tuple[int, str, str]:
+    """
+    Statut HTTP, raison et message d'une erreur d'enregistrement
+    La classe la plus précise de l'erreur connue de la table l'emporte
+    """
+    for classe in type(erreur).__mro__:
+        if classe in _ERREURS_ENREGISTREMENT:
+            statut_http, raison, gabarit = _ERREURS_ENREGISTREMENT[classe]
+            break
+    else:
+        statut_http, raison, gabarit = _ERREUR_INTERNE
+    return statut_http, raison, gabarit.format(erreur)
+
+
+def _publier_evenement(niveau: int, event_type: str, **donnees) -> None:
+    """
+    Publie un événement métier dans les logs
+    Le handler console est asynchrone (QueueHandler): l'appel ne fait que
+    déposer l'enregistrement dans une file, hors de toute I/O
+    """
+    logger.log(
+        niveau,
+        "📢 EVENT: %s",
+        event_type,
+        extra={"event_type": event_type, **donnees, "timestamp": "NOW"},
+    )
 
 
 class DDDVenteViewSet(viewsets.GenericViewSet):
@@ -57,11 +174,11 @@ class DDDVenteViewSet(viewsets.GenericViewSet):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         # Injection de dépendances (à remplacer par un DI container en production)
-        self._vente_repo = DjangoVenteRepository()
-        self._magasin_repo = DjangoMagasinRepository()
-        self._produit_service = HttpProduitService()
+        self._vente_repo = _VENTE_REPO
+        self._magasin_repo = _MAGASIN_REPO
+        self._produit_service = CachedProduitService(_PRODUIT_SERVICE)
         # Service HTTP pour communication avec l'inventaire
-        self._stock_service = HttpStockService()
+        self._stock_service = _STOCK_SERVICE
 
     @swagger_auto_schema(
         operation_summary="Enregistrer une nouvelle vente (DDD)",
@@ -69,7 +186,7 @@ class DDDVenteViewSet(viewsets.GenericViewSet):
         tags=["Ventes DDD"],
         request_body=openapi.Schema(
             type=openapi.TYPE_OBJECT,
-            required=["magasin_id", "produit_id", "quantite", "client_id"],
+            required=list(CHAMPS_REQUIS_VENTE),
             properties={
                 "magasin_id": openapi.Schema(
                     type=openapi.TYPE_STRING,
@@ -101,51 +218,16 @@ class DDDVenteViewSet(viewsets.GenericViewSet):
     @action(detail=False, methods=["post"])
     def enregistrer(self, request):
         """Use Case: Enregistrer une vente"""
-        
-        import logging
-        logger = logging.getLogger(__name__)
 
-        # 1. Validation des données d'entrée
         try:
             data = request.data
-            print(f"DEBUG: Données reçues: {data}")
-
-            # Validation des champs requis
-            required_fields = ["magasin_id", "produit_id", "quantite", "client_id"]
-            for field in required_fields:
-                if field not in data:
-                    return Response(
-                        {"error": f"Le champ '{field}' est requis"},
-                        status=status.HTTP_400_BAD_REQUEST,
-                    )
-
-            # Validation de la quantité
-            quantite = int(data["quantite"])
-            if quantite <= 0:
-                print(f"DEBUG: Quantité invalide: {quantite}")
-                return Response(
-                    {"error": "La quantité doit être positive"},
-                    status=status.HTTP_400_BAD_REQUEST,
-                )
-
-            # 2. Construction de la commande métier (Value Object)
-            # Conversion des IDs en types appropriés
-            print(f"DEBUG: Conversion des IDs...")
-            magasin_id = MagasinId(uuid.UUID(data["magasin_id"]))
-            produit_id = ProduitId(uuid.UUID(data["produit_id"]))
-            client_id = ClientId(uuid.UUID(data["client_id"]))  # Obligatoire maintenant
 
-            print(f"DEBUG: Construction de CommandeVente...")
-            commande = CommandeVente(
-                magasin_id=magasin_id,
-                produit_id=produit_id,
-                quantite=quantite,
-                client_id=client_id,
-            )
-            print(f"DEBUG: Commande créée: {commande}")
+            # 1. et 2. Validation des champs et construction de la commande métier
+            # (champs requis, UUID et quantité positive vérifiés à la construction)
+            commande = _construire_commande(data)
+            logger.debug("Commande créée: %s", commande)
 
             # 3. Exécution du Use Case
-            print(f"DEBUG: Création du Use Case...")
             use_case = EnregistrerVenteUseCase(
                 self._vente_repo,
                 self._magasin_repo,
@@ -153,89 +235,123 @@ class DDDVenteViewSet(viewsets.GenericViewSet):
                 self._stock_service,
             )
 
-            print(f"DEBUG: Exécution du Use Case...")
             resultat = use_case.execute(commande)
-            print(f"DEBUG: Résultat: {resultat}")
 
             # 📢 EVENT: Publication d'événement de succès
-            logger.info("📢 EVENT: orders.command.creation.success", extra={
-                "event_type": "orders.command.creation.success",
-                "vente_id": resultat["vente"]["id"],
-                "magasin_id": data["magasin_id"],
-                "produit_id": data["produit_id"],
-                "client_id": data["client_id"],
-                "quantite": quantite,
-                "total": resultat["vente"]["total"],
-                "timestamp": "NOW"
-            })
+            _publier_evenement(
+                logging.INFO,
+                "orders.command.creation.success",
+                vente_id=resultat["vente"]["id"],
+                magasin_id=data["magasin_id"],
+                produit_id=data["produit_id"],
+                client_id=data["client_id"],
+                quantite=commande.quantite,
+                total=resultat["vente"]["total"],
+            )
 
             return Response(resultat, status=status.HTTP_201_CREATED)
 
-        except (ValueError, TypeError) as e:
+        except Exception as e:
+            statut_http, raison, message = _decrire_erreur_enregistrement(e)
             # 📢 EVENT: Publication d'événement d'échec
-            logger.error("📢 EVENT: orders.command.creation.failed", extra={
-                "event_type": "orders.command.creation.failed",
-                "error": f"Format de données invalide: {str(e)}",
-                "request_data": str(request.data),
-                "timestamp": "NOW"
-            })
-            print(f"DEBUG: Erreur ValueError/TypeError: {e}")
-            return Response(
-                {"error": "Format de données invalide"},
-                status=status.HTTP_400_BAD_REQUEST,
+            _publier_evenement(
+                logging.ERROR,
+                "orders.command.creation.failed",
+                error=message,
+                reason=raison,
+                request_data=str(request.data),
             )
-        except MagasinInexistantError as e:
-            # 📢 EVENT: Publication d'événement d'échec
-            logger.error("📢 EVENT: orders.command.creation.failed", extra={
-                "event_type": "orders.command.creation.failed",
-                "error": f"Magasin invalide: {str(e)}",
-                "reason": "magasin_inexistant",
-                "timestamp": "NOW"
-            })
-            print(f"DEBUG: Erreur MagasinInexistantError: {e}")
+            if statut_http == status.HTTP_500_INTERNAL_SERVER_ERROR:
+                # Pile formatée par le handler de logs (QueueListener, hors requête)
+                logger.exception("Échec inattendu de l'enregistrement d'une vente")
+            return Response({"error": message}, status=statut_http)
+
+    @swagger_auto_schema(
+        operation_summary="Enregistrer plusieurs ventes (DDD)",
+        operation_description="Use Case: Enregistrer un lot de ventes indépendantes",
+        tags=["Ventes DDD"],
+        request_body=openapi.Schema(
+            type=openapi.TYPE_ARRAY,
+            items=openapi.Schema(
+                type=openapi.TYPE_OBJECT,
+                required=list(CHAMPS_REQUIS_VENTE),
+                properties={
+                    "magasin_id": openapi.Schema(
+                        type=openapi.TYPE_STRING, format=openapi.FORMAT_UUID
+                    ),
+                    "produit_id": openapi.Schema(
+                        type=openapi.TYPE_STRING, format=openapi.FORMAT_UUID
+                    ),
+                    "quantite": openapi.Schema(type=openapi.TYPE_INTEGER, minimum=1),
+                    "client_id": openapi.Schema(
+                        type=openapi.TYPE_STRING, format=openapi.FORMAT_UUID
+                    ),
+                },
+            ),
+        ),
+        responses={
+            207: openapi.Response(description="Résultat de chaque vente du lot"),
+            400: openapi.Response(description="Corps de requête invalide"),
+        },
+    )
+    @action(detail=False, methods=["post"], url_path="batch")
+    def enregistrer_batch(self, request):
+        """Use Case: Enregistrer un lot de ventes"""
+
+        commandes = request.data
+        if not isinstance(commandes, list) or not commandes:
             return Response(
-                {"error": f"Magasin invalide: {str(e)}"},
+                {"error": "Une liste non vide de ventes est attendue"},
                 status=status.HTTP_400_BAD_REQUEST,
             )
-        except ProduitInexistantError as e:
-            # 📢 EVENT: Publication d'événement d'échec
-            logger.error("📢 EVENT: orders.command.creation.failed", extra={
-                "event_type": "orders.command.creation.failed",
-                "error": f"Produit invalide: {str(e)}",
-                "reason": "produit_inexistant",
-                "timestamp": "NOW"
-            })
-            print(f"DEBUG: Erreur ProduitInexistantError: {e}")
+        if len(commandes) > TAILLE_LOT_VENTES_MAX:
             return Response(
-                {"error": f"Produit invalide: {str(e)}"},
+                {"error": f"Au plus {TAILLE_LOT_VENTES_MAX} ventes par lot"},
                 status=status.HTTP_400_BAD_REQUEST,
             )
-        except StockInsuffisantError as e:
-            # 📢 EVENT: Publication d'événement d'échec
-            logger.error("📢 EVENT: orders.command.creation.failed", extra={
-                "event_type": "orders.command.creation.failed",
-                "error": str(e),
-                "reason": "stock_insuffisant",
-                "timestamp": "NOW"
-            })
-            print(f"DEBUG: Erreur StockInsuffisantError: {e}")
-            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
-        except Exception as e:
-            # 📢 EVENT: Publication d'événement d'échec
-            logger.error("📢 EVENT: orders.command.creation.failed", extra={
-                "event_type": "orders.command.creation.failed",
-                "error": f"Erreur interne: {str(e)}",
-                "reason": "internal_error",
-                "timestamp": "NOW"
-            })
-            print(f"DEBUG: Erreur générale: {e}")
-            import traceback
-
-            traceback.print_exc()
-            return Response(
-                {"error": f"Erreur interne: {str(e)}"},
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+
+        # Un seul use case pour tout le lot: le cache produit de la requête
+        # évite de relire le prix d'un produit présent dans plusieurs ventes
+        use_case = EnregistrerVenteUseCase(
+            self._vente_repo,
+            self._magasin_repo,
+            self._produit_service,
+            self._stock_service,
+        )
+
+        # Pas de transaction englobante: le stock est débité par appel HTTP,
+        # chaque vente garde sa propre compensation en cas d'échec
+        resultats = []
+        for index, data in enumerate(commandes):
+            try:
+                if not isinstance(data, dict):
+                    raise TypeError("Une vente doit être un objet JSON")
+                resultat = use_case.execute(_construire_commande(data))
+            except Exception as e:
+                statut_http, raison, erreur = _decrire_erreur_enregistrement(e)
+                if statut_http == status.HTTP_500_INTERNAL_SERVER_ERROR:
+                    logger.exception("Échec de la vente %s du lot", index)
+            else:
+                _publier_evenement(
+                    logging.INFO,
+                    "orders.command.creation.success",
+                    vente_id=resultat["vente"]["id"],
+                    total=resultat["vente"]["total"],
+                )
+                resultats.append(
+                    {"index": index, "id": resultat["vente"]["id"], "status": "ok"}
+                )
+                continue
+
+            _publier_evenement(
+                logging.ERROR,
+                "orders.command.creation.failed",
+                error=erreur,
+                reason=raison,
             )
+            resultats.append({"index": index, "status": "error", "error": erreur})
+
+        return Response(resultats, status=status.HTTP_207_MULTI_STATUS)
 
     @swagger_auto_schema(
         operation_summary="Annuler une vente (DDD)",
@@ -275,6 +391,7 @@ class DDDVenteViewSet(viewsets.GenericViewSet):
         except VenteDejaAnnuleeError as e:
             return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
         except Exception as e:
+            logger.exception("Échec inattendu de l'annulation de la vente %s", pk)
             return Response(
                 {"error": f"Erreur interne: {str(e)}"},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -284,7 +401,35 @@ class DDDVenteViewSet(viewsets.GenericViewSet):
         operation_summary="Lister toutes les ventes (DDD)",
         operation_description="Use Case: Consulter la liste de toutes les ventes avec détails complets",
         tags=["Ventes DDD"],
+        manual_parameters=[
+            openapi.Parameter(
+                "magasin_id",
+                openapi.IN_QUERY,
+                description="Filtre sur le magasin (UUID)",
+                type=openapi.TYPE_STRING,
+                format=openapi.FORMAT_UUID,
+            ),
+            openapi.Parameter(
+                "statut",
+                openapi.IN_QUERY,
+                description="Filtre sur le statut (active, annulee, remboursee)",
+                type=openapi.TYPE_STRING,
+            ),
+            openapi.Parameter(
+                "page",
+                openapi.IN_QUERY,
+                description="Numéro de page (optionnel, liste complète sinon)",
+                type=openapi.TYPE_INTEGER,
+            ),
+            openapi.Parameter(
+                "page_size",
+                openapi.IN_QUERY,
+                description="Ventes par page (défaut 50, maximum 500)",
+                type=openapi.TYPE_INTEGER,
+            ),
+        ],
         responses={
+            400: openapi.Response(description="Filtre invalide"),
             200: openapi.Response(
                 description="Liste des ventes récupérée avec succès",
                 examples={
@@ -318,65 +463,81 @@ class DDDVenteViewSet(viewsets.GenericViewSet):
     def list(self, request):
         """Use Case: Lister toutes les ventes"""
 
+        # Filtres optionnels appliqués côté base de données
+        magasin_id = request.query_params.get("magasin_id")
+        statut = request.query_params.get("statut")
         try:
-            # Récupération de toutes les ventes
-            ventes = self._vente_repo.get_all()
-
-            # Conversion en format de réponse
-            ventes_data = []
-            for vente in ventes:
-                # Récupération du nom du magasin
-                magasin = self._magasin_repo.get_by_id(vente.magasin_id)
-                magasin_nom = magasin.nom if magasin else f"Magasin {vente.magasin_id}"
-
-                # Construction des lignes avec noms des produits
-                lignes_data = []
-                for ligne in vente.lignes:
-                    produit_info = self._produit_service.get_produit_details(
-                        ligne.produit_id
-                    )
-                    produit_nom = (
-                        produit_info.nom
-                        if produit_info
-                        else f"Produit {ligne.produit_id}"
-                    )
-
-                    lignes_data.append(
-                        {
-                            "produit_id": str(ligne.produit_id),
-                            "produit_nom": produit_nom,
-                            "quantite": ligne.quantite,
-                            "prix_unitaire": float(ligne.prix_unitaire),
-                            "sous_total": float(ligne.sous_total),
-                        }
-                    )
+            magasin_id = uuid.UUID(magasin_id) if magasin_id else None
+        except ValueError:
+            return Response(
+                {"error": f"magasin_id invalide: {magasin_id}"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if statut and statut not in {s.value for s in StatutVente}:
+            return Response(
+                {"error": f"statut invalide: {statut}"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
 
-                ventes_data.append(
-                    {
-                        "id": str(vente.id),
-                        "magasin": magasin_nom,
-                        "date_vente": vente.date_vente.isoformat(),
-                        "total": float(vente.calculer_total()),
-                        "client_id": str(vente.client_id) if vente.client_id else None,
-                        "statut": vente.statut.value,
-                        "lignes": lignes_data,
-                        "date_annulation": (
-                            vente.date_annulation.isoformat()
-                            if vente.date_annulation
-                            else None
-                        ),
-                        "motif_annulation": vente.motif_annulation,
-                    }
-                )
+        statut = statut or None
 
+        # Pagination optionnelle: sans ?page= ni ?page_size=, liste complète
+        page = request.query_params.get("page")
+        page_size = request.query_params.get("page_size")
+        try:
+            page = int(page) if page else (1 if page_size else None)
+            page_size = int(page_size) if page_size else TAILLE_PAGE_DEFAUT
+        except ValueError:
             return Response(
-                {
-                    "success": True,
-                    "ventes": ventes_data,
-                    "total_ventes": len(ventes_data),
-                },
-                status=status.HTTP_200_OK,
+                {"error": "page et page_size doivent être des entiers"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if page is not None and (page < 1 or page_size < 1):
+            return Response(
+                {"error": "page et page_size doivent être positifs"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        page_size = min(page_size, TAILLE_PAGE_MAX)
+
+        try:
+            # Empreinte SQL des ventes filtrées (nombre, dates, statuts): l'ETag
+            # change à chaque vente enregistrée, annulée ou supprimée
+            empreinte = self._vente_repo.get_empreinte(
+                magasin_id=magasin_id, statut=statut
             )
+            signature = f"{magasin_id}|{statut}|{page}|{page_size}|{empreinte}"
+            etag = f'"{hashlib.md5(signature.encode()).hexdigest()}"'
+            if request.META.get("HTTP_IF_NONE_MATCH") == etag:
+                return Response(
+                    status=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag}
+                )
+
+            # Liste enrichie mise en cache sous son ETag
+            cle_cache = f"ventes:liste:{etag}"
+            en_cache = cache.get(cle_cache)
+            if en_cache is None:
+                en_cache = self._construire_liste_ventes(
+                    magasin_id, statut, page, page_size
+                )
+                cache.set(cle_cache, en_cache, TTL_LISTE_VENTES_SECONDES)
+            contenu, page_suivante = en_cache
+
+            if page is not None:
+                # Liens calculés à chaque réponse: ils dépendent de l'hôte appelé
+                url = request.build_absolute_uri()
+                contenu = {
+                    **contenu,
+                    "next": (
+                        replace_query_param(url, "page", page + 1)
+                        if page_suivante
+                        else None
+                    ),
+                    "previous": (
+                        replace_query_param(url, "page", page - 1) if page > 1 else None
+                    ),
+                }
+
+            return Response(contenu, status=status.HTTP_200_OK, headers={"ETag": etag})
 
         except Exception as e:
             return Response(
@@ -384,6 +545,91 @@ class DDDVenteViewSet(viewsets.GenericViewSet):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR,
             )
 
+    def _construire_liste_ventes(
+        self,
+        magasin_id: Optional[uuid.UUID],
+        statut: Optional[str],
+        page: Optional[int],
+        page_size: int,
+    ) -> Tuple[Dict[str, Any], bool]:
+        """
+        Liste (ou page) des ventes enrichie des noms de magasins et de produits
+        Retourne aussi l'existence d'une page suivante
+        """
+        # Récupération des ventes (filtrées si demandé), une de plus que la
+        # page pour savoir s'il en reste sans compter toute la table
+        if page is None:
+            ventes = self._vente_repo.get_all(magasin_id=magasin_id, statut=statut)
+            page_suivante = False
+        else:
+            ventes = self._vente_repo.get_all(
+                magasin_id=magasin_id,
+                statut=statut,
+                offset=(page - 1) * page_size,
+                limite=page_size + 1,
+            )
+            page_suivante = len(ventes) > page_size
+            ventes = ventes[:page_size]
+
+        # Magasins et produits cités récupérés une seule fois chacun:
+        # une requête SQL et un appel au catalogue, quel que soit N
+        magasins = self._magasin_repo.get_by_ids(
+            list({vente.magasin_id for vente in ventes})
+        )
+        produits = self._produit_service.get_produits_details(
+            list({ligne.produit_id for vente in ventes for ligne in vente.lignes})
+        )
+
+        # Conversion en format de réponse
+        ventes_data = []
+        for vente in ventes:
+            # Nom du magasin
+            magasin = magasins.get(vente.magasin_id)
+            magasin_nom = magasin.nom if magasin else f"Magasin {vente.magasin_id}"
+
+            # Construction des lignes avec noms des produits
+            lignes_data = []
+            for ligne in vente.lignes:
+                produit_info = produits.get(ligne.produit_id)
+                produit_nom = (
+                    produit_info.nom if produit_info else f"Produit {ligne.produit_id}"
+                )
+
+                lignes_data.append(
+                    {
+                        "produit_id": ligne.produit_id,
+                        "produit_nom": produit_nom,
+                        "quantite": ligne.quantite,
+                        "prix_unitaire": float(ligne.prix_unitaire),
+                        "sous_total": float(ligne.sous_total),
+                    }
+                )
+
+            ventes_data.append(
+                {
+                    "id": vente.id,
+                    "magasin_id": vente.magasin_id,
+                    "magasin": magasin_nom,
+                    "date_vente": vente.date_vente,
+                    "total": float(vente.total),
+                    "client_id": vente.client_id,
+                    "statut": vente.statut.value,
+                    "lignes": lignes_data,
+                    "date_annulation": vente.date_annulation,
+                    "motif_annulation": vente.motif_annulation,
+                }
+            )
+
+        contenu = {
+            "success": True,
+            "ventes": ventes_data,
+            "total_ventes": len(ventes_data),
+        }
+        if page is not None:
+            contenu["page"] = page
+            contenu["page_size"] = page_size
+        return contenu, page_suivante
+
     @swagger_auto_schema(
         operation_summary="Consulter une vente spécifique (DDD)",
         operation_description="Use Case: Récupérer les détails d'une vente par son ID",
@@ -409,19 +655,22 @@ class DDDVenteViewSet(viewsets.GenericViewSet):
             magasin = self._magasin_repo.get_by_id(vente.magasin_id)
             magasin_nom = magasin.nom if magasin else f"Magasin {vente.magasin_id}"
 
+            # Noms des produits de la vente en un seul appel au catalogue
+            produits = self._produit_service.get_produits_details(
+                list({ligne.produit_id for ligne in vente.lignes})
+            )
+
             # Construction des lignes avec noms des produits
             lignes_data = []
             for ligne in vente.lignes:
-                produit_info = self._produit_service.get_produit_details(
-                    ligne.produit_id
-                )
+                produit_info = produits.get(ligne.produit_id)
                 produit_nom = (
                     produit_info.nom if produit_info else f"Produit {ligne.produit_id}"
                 )
 
                 lignes_data.append(
                     {
-                        "produit_id": str(ligne.produit_id),
+                        "produit_id": ligne.produit_id,
                         "produit_nom": produit_nom,
                         "quantite": ligne.quantite,
                         "prix_unitaire": float(ligne.prix_unitaire),
@@ -430,16 +679,14 @@ class DDDVenteViewSet(viewsets.GenericViewSet):
                 )
 
             vente_data = {
-                "id": str(vente.id),
+                "id": vente.id,
                 "magasin": magasin_nom,
-                "date_vente": vente.date_vente.isoformat(),
-                "total": float(vente.calculer_total()),
-                "client_id": str(vente.client_id) if vente.client_id else None,
+                "date_vente": vente.date_vente,
+                "total": float(vente.total),
+                "client_id": vente.client_id,
                 "statut": vente.statut.value,
                 "lignes": lignes_data,
-                "date_annulation": (
-                    vente.date_annulation.isoformat() if vente.date_annulation else None
-                ),
+                "date_annulation": vente.date_annulation,
                 "motif_annulation": vente.motif_annulation,
             }
 
@@ -463,11 +710,11 @@ class DDDIndicateursAPI(APIView):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         # Injection de dépendances
-        self._vente_repo = DjangoVenteRepository()
-        self._magasin_repo = DjangoMagasinRepository()
-        self._produit_service = HttpProduitService()
+        self._vente_repo = _VENTE_REPO
+        self._magasin_repo = _MAGASIN_REPO
+        self._produit_service = CachedProduitService(_PRODUIT_SERVICE)
         # Service HTTP pour communication avec l'inventaire
-        self._stock_service = HttpStockService()
+        self._stock_service = _STOCK_SERVICE
 
     @swagger_auto_schema(
         operation_summary="Indicateurs de performance (DDD)",
@@ -522,11 +769,11 @@ class DDDRapportConsolideAPI(APIView):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         # Injection de dépendances
-        self._vente_repo = DjangoVenteRepository()
-        self._magasin_repo = DjangoMagasinRepository()
-        self._produit_service = HttpProduitService()
+        self._vente_repo = _VENTE_REPO
+        self._magasin_repo = _MAGASIN_REPO
+        self._produit_service = CachedProduitService(_PRODUIT_SERVICE)
         # Service HTTP pour communication avec l'inventaire
-        self._stock_service = HttpStockService()
+        self._stock_service = _STOCK_SERVICE
 
     @swagger_auto_schema(
         operation_summary="Rapport consolidé tous magasins (UC1 - DDD)",
@@ -540,15 +787,12 @@ class DDDRapportConsolideAPI(APIView):
         """Use Case: Générer le rapport consolidé tous magasins"""
 
         try:
-            # Injection des dépendances
-            vente_repo = DjangoVenteRepository()
-            magasin_repo = DjangoMagasinRepository()
-            produit_service = HttpProduitService()
-            stock_service = HttpStockService()  # Service HTTP réel
-
             # Exécution du Use Case
             use_case = GenererRapportConsolideUseCase(
-                vente_repo, magasin_repo, stock_service, produit_service
+                self._vente_repo,
+                self._magasin_repo,
+                self._stock_service,
+                self._produit_service,
             )
 
             rapport = use_case.execute()
@@ -572,15 +816,12 @@ def rapport_consolide(request):
     avec analyses, alertes et recommandations intelligentes.
     """
     try:
-        # Injection des dépendances
-        vente_repo = DjangoVenteRepository()
-        magasin_repo = DjangoMagasinRepository()
-        produit_service = HttpProduitService()
-        stock_service = HttpStockService()  # Service HTTP réel
-
         # Exécution du Use Case
         use_case = GenererRapportConsolideUseCase(
-            vente_repo, magasin_repo, stock_service, produit_service
+            _VENTE_REPO,
+            _MAGASIN_REPO,
+            _STOCK_SERVICE,
+            CachedProduitService(_PRODUIT_SERVICE),
         )
 
         rapport = use_case.execute()
@@ -601,15 +842,19 @@ def lister_magasins(request):
     Retourne la liste des magasins avec UUID, nom, adresse.
     """
     try:
-        magasins = Magasin.objects.all()
-        magasins_data = [
-            {"id": str(magasin.id), "nom": magasin.nom, "adresse": magasin.adresse}
-            for magasin in magasins
-        ]
-        return Response(
-            {"success": True, "magasins": magasins_data, "total": len(magasins_data)},
-            status=status.HTTP_200_OK,
-        )
+        contenu = cache.get(CLE_CACHE_MAGASINS)
+        if contenu is None:
+            magasins_data = [
+                {"id": magasin.id, "nom": magasin.nom, "adresse": magasin.adresse}
+                for magasin in Magasin.objects.all()
+            ]
+            contenu = {
+                "success": True,
+                "magasins": magasins_data,
+                "total": len(magasins_data),
+            }
+            cache.set(CLE_CACHE_MAGASINS, contenu, TTL_MAGASINS_SECONDES)
+        return Response(contenu, status=status.HTTP_200_OK)
     except Exception as e:
         return Response(
             {
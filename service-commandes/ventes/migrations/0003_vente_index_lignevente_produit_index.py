@@ -0,0 +1,41 @@
+# Generated by Django 4.2.7 on 2026-10-16 09:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ventes', '0002_vente_date_annulation_vente_motif_annulation_and_more'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='vente',
+            name='date_vente',
+            field=models.DateTimeField(auto_now_add=True, db_index=True),
+        ),
+        migrations.AlterField(
+            model_name='vente',
+            name='client_id',
+            field=models.UUIDField(blank=True, db_index=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='vente',
+            name='statut',
+            field=models.CharField(choices=[('active', 'Active'), ('annulee', 'Annulée'), ('remboursee', 'Remboursée')], db_index=True, default='active', max_length=20),
+        ),
+        migrations.AlterField(
+            model_name='lignevente',
+            name='produit_id',
+            field=models.UUIDField(db_index=True),
+        ),
+        migrations.AddIndex(
+            model_name='vente',
+            index=models.Index(fields=['magasin', 'date_vente'], name='vente_magasin_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vente',
+            index=models.Index(fields=['statut', 'date_vente'], name='vente_statut_date_idx'),
+        ),
+    ]
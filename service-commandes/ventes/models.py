@@ -24,13 +24,25 @@ class Vente(models.Model):
     magasin = models.ForeignKey(
         Magasin, on_delete=models.CASCADE, related_name="ventes"
     )
-    date_vente = models.DateTimeField(auto_now_add=True)
+    date_vente = models.DateTimeField(auto_now_add=True, db_index=True)
     total = models.DecimalField(max_digits=10, decimal_places=2)
-    client_id = models.UUIDField(null=True, blank=True)  # Référence au service client
-    statut = models.CharField(max_length=20, choices=STATUT_CHOICES, default="active")
+    # Référence au service client
+    client_id = models.UUIDField(null=True, blank=True, db_index=True)
+    statut = models.CharField(
+        max_length=20, choices=STATUT_CHOICES, default="active", db_index=True
+    )
     date_annulation = models.DateTimeField(null=True, blank=True)
     motif_annulation = models.TextField(null=True, blank=True)
 
+    class Meta:
+        # Listes et rapports: filtre magasin ou statut, puis tri/borne par date
+        indexes = [
+            models.Index(
+                fields=["magasin", "date_vente"], name="vente_magasin_date_idx"
+            ),
+            models.Index(fields=["statut", "date_vente"], name="vente_statut_date_idx"),
+        ]
+
     def __str__(self):
         return f"Vente {self.id} - {self.date_vente.date()} [{self.statut}]"
 
@@ -38,7 +50,7 @@ class Vente(models.Model):
 class LigneVente(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     vente = models.ForeignKey(Vente, on_delete=models.CASCADE, related_name="lignes")
-    produit_id = models.UUIDField()  # Référence au service produits
+    produit_id = models.UUIDField(db_index=True)  # Référence au service produits
     quantite = models.IntegerField()
     prix_unitaire = models.DecimalField(max_digits=10, decimal_places=2)
 
@@ -0,0 +1,20 @@
+"""
+Signaux du service Ventes
+Invalident les réponses mises en cache quand les magasins changent
+"""
+
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Magasin
+
+# Liste sérialisée des magasins (GET /api/ddd/magasins/)
+CLE_CACHE_MAGASINS = "magasins:liste"
+
+
+@receiver(post_save, sender=Magasin)
+@receiver(post_delete, sender=Magasin)
+def invalider_cache_magasins(sender, **kwargs):
+    """Toute création, modification ou suppression de magasin vide le cache"""
+    cache.delete(CLE_CACHE_MAGASINS)
@@ -32,10 +32,11 @@ class CommandeEcommerceRepository(ABC):
 
     @abstractmethod
     def get_by_client_id(
-        self, client_id: UUID, limit: int = 50
+        self, client_id: UUID, limit: int = 50, curseur: Optional[UUID] = None
     ) -> List[CommandeEcommerceDomain]:
         """
-        Récupère toutes les commandes d'un client
+        Récupère les commandes d'un client, de la plus récente à la plus ancienne
+        curseur: ID de la dernière commande de la page précédente
         """
         pass
 
@@ -4,17 +4,43 @@ Pour récupérer et valider les paniers lors du check-out
 """
 
 import logging
-from typing import Dict, Any, Optional
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Dict, Any, List, Optional
 from uuid import UUID
 
 # Import local du module panier du service-ecommerce
-from panier.application.use_cases.voir_panier_use_case import VoirPanierUseCase
 from panier.application.use_cases.vider_panier_use_case import ViderPanierUseCase
 from panier.infrastructure.django_panier_repository import DjangoPanierRepository
 
 logger = logging.getLogger("commandes")
 
 
+@dataclass(slots=True)
+class LignePanier:
+    """Ligne d'un panier lue pour le check-out, déjà dans ses types métier"""
+
+    produit_id: UUID
+    nom_produit: str
+    quantite: int
+    prix_unitaire: Decimal
+    prix_total: Decimal
+
+
+@dataclass(slots=True)
+class PanierInfo:
+    """
+    Panier non vide lu pour le check-out
+    Accès par attribut: parcouru plusieurs fois au cours d'un même check-out
+    """
+
+    client_id: str
+    nombre_articles: int
+    nombre_produits: int
+    total: Decimal
+    produits: List[LignePanier]
+
+
 class PanierService:
     """
     Service pour communiquer avec le module panier local
@@ -24,12 +50,47 @@ class PanierService:
     def __init__(self):
         # Initialisation des use cases du module panier
         self.panier_repository = DjangoPanierRepository()
-        self.voir_panier_use_case = VoirPanierUseCase(self.panier_repository)
         self.vider_panier_use_case = ViderPanierUseCase(self.panier_repository)
 
+    def lire_panier_client(self, client_id: str) -> Optional[PanierInfo]:
+        """
+        Lit le panier d'un client sous forme typée, pour le check-out
+
+        Args:
+            client_id: UUID du client
+
+        Returns:
+            PanierInfo, ou None si le panier est inexistant ou vide
+        """
+        client_uuid = UUID(client_id) if isinstance(client_id, str) else client_id
+        # Entité lue directement: UUID et Decimal sans passer par str/float
+        # comme le fait le VoirPanierUseCase, destiné à l'affichage
+        panier = self.panier_repository.get_by_client_id(client_uuid)
+
+        if not panier or panier.est_vide():
+            return None
+
+        return PanierInfo(
+            client_id=str(client_id),
+            nombre_articles=panier.nombre_articles(),
+            nombre_produits=len(panier.produits),
+            total=panier.prix_total(),
+            produits=[
+                LignePanier(
+                    produit_id=produit.produit_id,
+                    nom_produit=produit.nom_produit,
+                    quantite=produit.quantite.valeur,
+                    prix_unitaire=produit.prix_unitaire,
+                    prix_total=produit.prix_total(),
+                )
+                for produit in panier.produits
+            ],
+        )
+
     def recuperer_panier_client(self, client_id: str) -> Dict[str, Any]:
         """
         Récupère le panier d'un client avec tous ses produits
+        Format dictionnaire conservé pour les événements de la saga chorégraphiée
 
         Args:
             client_id: UUID du client
@@ -38,51 +99,7 @@ class PanierService:
             Dict avec les informations du panier
         """
         try:
-            # Utiliser le use case existant du module panier
-            client_uuid = UUID(client_id) if isinstance(client_id, str) else client_id
-            resultat = self.voir_panier_use_case.execute(client_uuid)
-
-            # Le VoirPanierUseCase retourne directement les données (pas de clé 'success')
-            if resultat.get("panier_existe", False):
-                return {
-                    "success": True,
-                    "panier_existe": True,
-                    "panier_vide": resultat.get("est_vide", True),
-                    "client_id": client_id,
-                    "nombre_articles": resultat.get("resume", {}).get(
-                        "nombre_articles", 0
-                    ),
-                    "nombre_produits": resultat.get("resume", {}).get(
-                        "nombre_produits_differents", 0
-                    ),
-                    "total": resultat.get("resume", {}).get("prix_total", 0.0),
-                    "produits": [
-                        {
-                            "produit_id": produit["produit_id"],
-                            "nom_produit": produit["nom_produit"],
-                            "quantite": produit["quantite"],
-                            "prix_unitaire": produit["prix_unitaire"],
-                            "prix_total": produit[
-                                "prix_ligne"
-                            ],  # Note: dans VoirPanierUseCase c'est 'prix_ligne'
-                        }
-                        for produit in resultat.get("produits", [])
-                    ],
-                }
-            else:
-                # Panier non trouvé ou vide
-                return {
-                    "success": True,
-                    "panier_existe": False,
-                    "panier_vide": True,
-                    "client_id": client_id,
-                    "nombre_articles": 0,
-                    "nombre_produits": 0,
-                    "total": 0.0,
-                    "produits": [],
-                    "message": "Panier non trouvé ou vide",
-                }
-
+            panier = self.lire_panier_client(client_id)
         except Exception as e:
             logger.error(f"Erreur récupération panier client {client_id}: {e}")
             return {
@@ -93,6 +110,40 @@ class PanierService:
                 "error": f"Erreur lors de la récupération du panier: {str(e)}",
             }
 
+        if panier is None:
+            # Panier non trouvé ou vide
+            return {
+                "success": True,
+                "panier_existe": False,
+                "panier_vide": True,
+                "client_id": client_id,
+                "nombre_articles": 0,
+                "nombre_produits": 0,
+                "total": 0.0,
+                "produits": [],
+                "message": "Panier non trouvé ou vide",
+            }
+
+        return {
+            "success": True,
+            "panier_existe": True,
+            "panier_vide": False,
+            "client_id": client_id,
+            "nombre_articles": panier.nombre_articles,
+            "nombre_produits": panier.nombre_produits,
+            "total": float(panier.total),
+            "produits": [
+                {
+                    "produit_id": str(ligne.produit_id),
+                    "nom_produit": ligne.nom_produit,
+                    "quantite": ligne.quantite,
+                    "prix_unitaire": float(ligne.prix_unitaire),
+                    "prix_total": float(ligne.prix_total),
+                }
+                for ligne in panier.produits
+            ],
+        }
+
     def valider_panier_pour_checkout(self, client_id: str) -> Dict[str, Any]:
         """
         Valide qu'un panier est prêt pour le check-out
@@ -103,44 +154,45 @@ class PanierService:
         Returns:
             Dict avec le résultat de validation
         """
-        panier_info = self.recuperer_panier_client(client_id)
-
-        if not panier_info["success"]:
+        try:
+            panier = self.lire_panier_client(client_id)
+        except Exception as e:
+            logger.error(f"Erreur récupération panier client {client_id}: {e}")
             return {
                 "valide": False,
                 "raison": "Erreur récupération panier",
-                "details": panier_info.get("error", "Erreur inconnue"),
+                "details": f"Erreur lors de la récupération du panier: {str(e)}",
             }
 
-        if not panier_info["panier_existe"]:
+        if panier is None:
             return {
                 "valide": False,
                 "raison": "Panier inexistant",
                 "details": f"Aucun panier trouvé pour le client {client_id}",
             }
 
-        if panier_info["panier_vide"]:
+        if not panier.produits:
             return {
                 "valide": False,
                 "raison": "Panier vide",
                 "details": "Impossible de faire un check-out avec un panier vide",
             }
 
-        if panier_info["total"] <= 0:
+        if panier.total <= 0:
             return {
                 "valide": False,
                 "raison": "Total invalide",
-                "details": f'Total du panier invalide: {panier_info["total"]}€',
+                "details": f"Total du panier invalide: {panier.total}€",
             }
 
         return {
             "valide": True,
-            "panier": panier_info,
+            "panier": panier,
             "resume": {
                 "client_id": client_id,
-                "nombre_articles": panier_info["nombre_articles"],
-                "nombre_produits": panier_info["nombre_produits"],
-                "total": panier_info["total"],
+                "nombre_articles": panier.nombre_articles,
+                "nombre_produits": panier.nombre_produits,
+                "total": float(panier.total),
             },
         }
 
@@ -182,30 +234,22 @@ class PanierService:
                 "error": f"Erreur lors du vidage du panier: {str(e)}",
             }
 
-    def obtenir_produits_pour_stock(self, client_id: str) -> list:
+    def extraire_produits_pour_stock(self, panier: PanierInfo) -> list:
         """
-        Obtient la liste des produits du panier au format pour vérification de stock
+        Formate les produits d'un panier déjà récupéré pour le service stock
+        Évite de relire le panier quand il vient d'être validé
 
         Args:
-            client_id: UUID du client
+            panier: Panier retourné par lire_panier_client
 
         Returns:
             Liste des produits formatés pour le service stock
         """
-        panier_info = self.recuperer_panier_client(client_id)
-
-        if (
-            not panier_info["success"]
-            or not panier_info["panier_existe"]
-            or panier_info["panier_vide"]
-        ):
-            return []
-
         return [
             {
-                "produit_id": produit["produit_id"],
-                "quantite": produit["quantite"],
-                "nom_produit": produit["nom_produit"],
+                "produit_id": str(ligne.produit_id),
+                "quantite": ligne.quantite,
+                "nom_produit": ligne.nom_produit,
             }
-            for produit in panier_info["produits"]
+            for ligne in panier.produits
         ]
@@ -1,15 +1,71 @@
 """
 Service de communication avec le service-inventaire
-Pour la décrémentation des stocks centraux lors du check-out
+Pour la décrémentation des stocks centraux lors du check-out (et sa compensation)
 """
 
 import requests
 import logging
 from typing import Dict, Any
 from uuid import UUID
+from django.core.cache import cache
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 logger = logging.getLogger("commandes")
 
+# Stock central relu au plus toutes les 5 s par produit et par processus (cache
+# Django par défaut, LocMem: aucun CACHES partagé n'est configuré). Les
+# mouvements, seule source de vérité, restent toujours transmis
+TTL_STOCK_CENTRAL_SECONDES = 5
+PREFIXE_CACHE_STOCK = "stock_central:"
+
+
+def _cle_cache_stock(produit_id) -> str:
+    """Clé de cache d'un produit, sur la forme canonique de son UUID"""
+    return f"{PREFIXE_CACHE_STOCK}{UUID(str(produit_id))}"
+
+
+def _invalider_stocks(produit_ids) -> None:
+    """Oublie le stock mis en cache des produits dont le stock a pu changer"""
+    cache.delete_many([_cle_cache_stock(produit_id) for produit_id in produit_ids])
+
+
+def _message_erreur(response: requests.Response) -> str:
+    """
+    Message d'erreur renvoyé par l'inventaire, lu dans le corps JSON s'il y en a
+    un (quel que soit le charset annoncé), sinon le statut HTTP
+    """
+    try:
+        error_data = response.json()
+    except ValueError:
+        error_data = None
+    if isinstance(error_data, dict) and error_data.get("error"):
+        return error_data["error"]
+    return f"HTTP {response.status_code}"
+
+
+def _construire_session() -> requests.Session:
+    """
+    Session keep-alive vers le service-inventaire, partagée par les instances:
+    un check-out de N produits réutilise les connexions au lieu d'en ouvrir N
+    """
+    session = requests.Session()
+    # Retry ne rejoue que les méthodes idempotentes (GET) sur 502/503/504:
+    # une diminution de stock (POST) n'est jamais envoyée deux fois
+    adapter = HTTPAdapter(
+        pool_connections=16,
+        pool_maxsize=32,
+        max_retries=Retry(
+            total=2, backoff_factor=0.1, status_forcelist=[502, 503, 504]
+        ),
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+_SESSION = _construire_session()
+
 
 class StockService:
     """
@@ -19,93 +75,153 @@ class StockService:
 
     def __init__(self, inventaire_base_url: str = "http://inventaire-service:8000"):
         self.base_url = inventaire_base_url.rstrip("/")
+        self._session = _SESSION
 
-    def verifier_stock_central(self, produit_id: str) -> Dict[str, Any]:
+    def verifier_stocks_centraux(self, produit_ids: list) -> Dict[str, Dict[str, Any]]:
         """
-        Vérifie le stock central disponible pour un produit
+        Vérifie le stock central de plusieurs produits en un seul appel
 
         Args:
-            produit_id: UUID du produit
+            produit_ids: UUID des produits
 
         Returns:
-            Dict avec les infos de stock {quantite, niveau, nom_produit}
+            Dict {produit_id: {success, quantite, niveau}} pour chaque produit
         """
+        # Forme canonique des UUID: clés du cache et de la réponse de l'inventaire
+        canoniques = {
+            produit_id: str(UUID(str(produit_id))) for produit_id in produit_ids
+        }
+        en_cache = cache.get_many(
+            [f"{PREFIXE_CACHE_STOCK}{canonique}" for canonique in canoniques.values()]
+        )
+        resultats = {}
+        manquants = []
+        for produit_id, canonique in canoniques.items():
+            stock = en_cache.get(f"{PREFIXE_CACHE_STOCK}{canonique}")
+            if stock is None:
+                manquants.append(produit_id)
+            else:
+                resultats[produit_id] = stock
+        if not manquants:
+            return resultats
+
         try:
-            response = requests.get(
-                f"{self.base_url}/api/ddd/inventaire/stock-central/{produit_id}/",
+            response = self._session.post(
+                f"{self.base_url}/api/ddd/inventaire/stock-central/lot/",
+                json={"produit_ids": [str(produit_id) for produit_id in manquants]},
                 timeout=10,
             )
 
             if response.status_code == 200:
-                data = response.json()
-                return {
-                    "success": True,
-                    "quantite": data.get("quantite", 0),
-                    "niveau": data.get("niveau", "Indisponible"),
-                    "nom_produit": data.get("nom_produit", "Produit inconnu"),
-                }
-            else:
-                logger.warning(f"Produit {produit_id} non trouvé dans stock central")
-                return {
-                    "success": False,
-                    "quantite": 0,
-                    "niveau": "Indisponible",
-                    "error": "Produit non trouvé",
-                }
+                stocks = response.json().get("stocks", {})
+                a_memoriser = {}
+                for produit_id in manquants:
+                    canonique = canoniques[produit_id]
+                    stock = stocks.get(canonique)
+                    if stock is None:
+                        resultats[produit_id] = {
+                            "success": False,
+                            "quantite": 0,
+                            "niveau": "Indisponible",
+                            "error": "Produit non trouvé",
+                        }
+                    else:
+                        cle = f"{PREFIXE_CACHE_STOCK}{canonique}"
+                        resultats[produit_id] = a_memoriser[cle] = {
+                            "success": True,
+                            "quantite": stock.get("quantite", 0),
+                            "niveau": stock.get("niveau", "Indisponible"),
+                        }
+                cache.set_many(a_memoriser, TTL_STOCK_CENTRAL_SECONDES)
+                return {produit_id: resultats[produit_id] for produit_id in canoniques}
 
-        except requests.RequestException as e:
+            logger.warning(
+                f"Consultation groupée du stock central refusée: "
+                f"HTTP {response.status_code}"
+            )
+            erreur = "Produit non trouvé"
+
+        except (requests.RequestException, ValueError) as e:
             logger.error(f"Erreur communication service-inventaire: {e}")
-            return {
+            erreur = f"Erreur réseau: {str(e)}"
+
+        for produit_id in manquants:
+            resultats[produit_id] = {
                 "success": False,
                 "quantite": 0,
                 "niveau": "Indisponible",
-                "error": f"Erreur réseau: {str(e)}",
+                "error": erreur,
             }
+        return {produit_id: resultats[produit_id] for produit_id in canoniques}
+
+    def diminuer_stocks_centraux(self, lignes: list) -> Dict[str, Any]:
+        """
+        Diminue le stock central de plusieurs produits en un seul appel
+        Tout ou rien: l'inventaire applique le lot dans une transaction
+
+        Args:
+            lignes: [{'produit_id': str, 'quantite': int}]
+
+        Returns:
+            Dict avec le résultat de l'opération et le détail par produit
+        """
+        return self._mouvement_stocks_centraux(
+            "diminuer-stock-lot", lignes, "Stocks diminués"
+        )
 
-    def diminuer_stock_central(self, produit_id: str, quantite: int) -> Dict[str, Any]:
+    def augmenter_stocks_centraux(self, lignes: list) -> Dict[str, Any]:
         """
-        Diminue le stock central d'un produit
+        Augmente le stock central de plusieurs produits en un seul appel
+        Compense une diminution dont la commande n'a pas pu être enregistrée
 
         Args:
-            produit_id: UUID du produit
-            quantite: Quantité à décrémenter
+            lignes: [{'produit_id': str, 'quantite': int}]
 
         Returns:
-            Dict avec le résultat de l'opération
+            Dict avec le résultat de l'opération et le détail par produit
         """
+        return self._mouvement_stocks_centraux(
+            "augmenter-stock-lot", lignes, "Stocks augmentés"
+        )
+
+    def _mouvement_stocks_centraux(
+        self, operation: str, lignes: list, message: str
+    ) -> Dict[str, Any]:
+        """Poste un mouvement groupé du stock central (sans magasin_id)"""
         try:
-            response = requests.post(
-                f"{self.base_url}/api/ddd/inventaire/diminuer-stock/",
-                json={"produit_id": produit_id, "quantite": quantite},
-                headers={"Content-Type": "application/json"},
+            response = self._session.post(
+                f"{self.base_url}/api/ddd/inventaire/{operation}/",
+                json={
+                    "lignes": [
+                        {
+                            "produit_id": ligne["produit_id"],
+                            "quantite": ligne["quantite"],
+                        }
+                        for ligne in lignes
+                    ]
+                },
                 timeout=10,
             )
 
             if response.status_code == 200:
                 data = response.json()
-                logger.info(
-                    f"Stock diminué: {produit_id} -{quantite} = {data.get('nouvelle_quantite')}"
-                )
                 return {
                     "success": True,
-                    "message": data.get("message", "Stock diminué"),
-                    "nouvelle_quantite": data.get("nouvelle_quantite"),
-                    "niveau": data.get("niveau"),
+                    "message": data.get("message", message),
+                    "resultats": data.get("resultats", []),
                 }
-            else:
-                error_data = (
-                    response.json()
-                    if response.headers.get("content-type") == "application/json"
-                    else {}
-                )
-                error_msg = error_data.get("error", f"HTTP {response.status_code}")
-                logger.error(f"Erreur diminution stock {produit_id}: {error_msg}")
-                return {"success": False, "error": error_msg}
+
+            error_msg = _message_erreur(response)
+            logger.error(f"Erreur {operation} du stock central: {error_msg}")
+            return {"success": False, "error": error_msg}
 
         except requests.RequestException as e:
-            logger.error(f"Erreur réseau diminution stock {produit_id}: {e}")
+            logger.error(f"Erreur réseau {operation} du stock central: {e}")
             return {"success": False, "error": f"Erreur réseau: {str(e)}"}
 
+        finally:
+            _invalider_stocks([ligne["produit_id"] for ligne in lignes])
+
     def valider_stocks_suffisants(self, produits_demandes: list) -> Dict[str, Any]:
         """
         Valide que tous les produits demandés ont un stock suffisant
@@ -119,11 +235,16 @@ class StockService:
         stocks_insuffisants = []
         stocks_valides = []
 
+        # Un seul appel pour tout le panier au lieu d'un GET par produit
+        stocks_info = self.verifier_stocks_centraux(
+            [produit["produit_id"] for produit in produits_demandes]
+        )
+
         for produit in produits_demandes:
             produit_id = produit["produit_id"]
             quantite_demandee = produit["quantite"]
 
-            stock_info = self.verifier_stock_central(produit_id)
+            stock_info = stocks_info[produit_id]
 
             if not stock_info["success"]:
                 stocks_insuffisants.append(
@@ -139,9 +260,7 @@ class StockService:
                 stocks_insuffisants.append(
                     {
                         "produit_id": produit_id,
-                        "nom_produit": produit.get(
-                            "nom_produit", stock_info["nom_produit"]
-                        ),
+                        "nom_produit": produit.get("nom_produit", "Produit inconnu"),
                         "quantite_demandee": quantite_demandee,
                         "quantite_disponible": stock_info["quantite"],
                         "raison": "Quantité insuffisante",
@@ -151,9 +270,7 @@ class StockService:
                 stocks_valides.append(
                     {
                         "produit_id": produit_id,
-                        "nom_produit": produit.get(
-                            "nom_produit", stock_info["nom_produit"]
-                        ),
+                        "nom_produit": produit.get("nom_produit", "Produit inconnu"),
                         "quantite_demandee": quantite_demandee,
                         "quantite_disponible": stock_info["quantite"],
                     }
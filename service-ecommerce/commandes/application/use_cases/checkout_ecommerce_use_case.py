@@ -6,10 +6,11 @@ Orchestration complète du processus de commande avec validation panier et décr
 import uuid
 import logging
 from decimal import Decimal
-from datetime import datetime
-from typing import Dict, Any
+from typing import Dict, Any, List
 
-from ..services.panier_service import PanierService
+from django.db import transaction
+
+from ..services.panier_service import PanierInfo, PanierService
 from ..services.stock_service import StockService
 from ..repositories.commande_ecommerce_repository import CommandeEcommerceRepository
 from ...infrastructure.django_commande_ecommerce_repository import (
@@ -32,6 +33,18 @@ from ...domain.exceptions import (
 
 logger = logging.getLogger("commandes")
 
+# Barème de livraison, construit une fois plutôt qu'à chaque check-out
+SEUIL_LIVRAISON_GRATUITE = Decimal("100.00")
+FRAIS_LIVRAISON_EXPRESS = Decimal("15.00")
+FRAIS_LIVRAISON_STANDARD = Decimal("7.50")
+LIVRAISON_GRATUITE = Decimal("0.00")
+
+# Dépendances sans état propre à un check-out, créées une fois par processus:
+# la session HTTP du StockService est ainsi réutilisée d'un check-out à l'autre
+_PANIER_SERVICE = PanierService()
+_STOCK_SERVICE = StockService()
+_COMMANDE_REPOSITORY = DjangoCommandeEcommerceRepository()
+
 
 class CheckoutEcommerceUseCase:
     """
@@ -43,14 +56,15 @@ class CheckoutEcommerceUseCase:
     3. Vérification des stocks centraux
     4. Calcul des frais de livraison
     5. Décrémentation des stocks
-    6. Vidage du panier
+    6. Sauvegarde de la commande et vidage du panier (même transaction),
+       stocks restitués si cette transaction échoue
     7. Retour des détails de commande
     """
 
     def __init__(self):
-        self.panier_service = PanierService()
-        self.stock_service = StockService()
-        self.commande_repository = DjangoCommandeEcommerceRepository()
+        self.panier_service = _PANIER_SERVICE
+        self.stock_service = _STOCK_SERVICE
+        self.commande_repository = _COMMANDE_REPOSITORY
 
     def execute(self, demande_checkout: DemandeCheckout) -> Dict[str, Any]:
         """
@@ -77,9 +91,13 @@ class CheckoutEcommerceUseCase:
                 raise PanierVideError(panier_validation["details"])
 
             panier_info = panier_validation["panier"]
+            # Panier déjà lu par _valider_panier: pas de seconde lecture en base
+            produits_stock = self.panier_service.extraire_produits_pour_stock(
+                panier_info
+            )
 
             # 2. Vérification des stocks centraux
-            stock_validation = self._verifier_stocks_centraux(panier_info)
+            stock_validation = self._verifier_stocks_centraux(produits_stock)
             if not stock_validation["tous_suffisants"]:
                 raise StockInsuffisantError(
                     f"Stocks insuffisants pour {stock_validation['resume']['produits_ko']} produits",
@@ -87,36 +105,44 @@ class CheckoutEcommerceUseCase:
                 )
 
             # 3. Calcul des frais de livraison
-            sous_total = Decimal(str(panier_info["total"]))
+            sous_total = panier_info.total
             frais_livraison = self._calculer_frais_livraison(
                 sous_total, demande_checkout.adresse_livraison.livraison_express
             )
             total = sous_total + frais_livraison
 
             # 4. Décrémentation des stocks (action critique)
-            self._decrémenter_stocks_centraux(panier_info)
+            self._decrémenter_stocks_centraux(produits_stock)
 
-            # 5. Vidage du panier après succès
-            vidage_result = self.panier_service.vider_panier_apres_commande(client_id)
+            # 5. Sauvegarde de la commande puis vidage du panier, dans une seule
+            # transaction: commande, lignes et panier validés en un seul COMMIT,
+            # et un panier n'est jamais vidé sans commande enregistrée
+            # Si la transaction échoue, le stock décrémenté en 4 est restitué
+            commande_id = uuid.uuid4()
+            try:
+                with transaction.atomic():
+                    commande_data = self._construire_commande_finale(
+                        commande_id=commande_id,
+                        checkout_id=checkout_id,
+                        client_id=demande_checkout.client_id,
+                        panier_info=panier_info,
+                        adresse_livraison=demande_checkout.adresse_livraison,
+                        sous_total=sous_total,
+                        frais_livraison=frais_livraison,
+                        total=total,
+                        notes=demande_checkout.notes or "",
+                    )
+                    vidage_result = self.panier_service.vider_panier_apres_commande(
+                        client_id
+                    )
+            except Exception:
+                self._restaurer_stocks_centraux(checkout_id, produits_stock)
+                raise
             if not vidage_result["success"]:
                 logger.warning(
                     f"Échec vidage panier {client_id}: {vidage_result.get('error')}"
                 )
 
-            # 6. Construction de la commande finale
-            commande_id = uuid.uuid4()
-            commande_data = self._construire_commande_finale(
-                commande_id=commande_id,
-                checkout_id=checkout_id,
-                client_id=client_id,
-                panier_info=panier_info,
-                adresse_livraison=demande_checkout.adresse_livraison,
-                sous_total=sous_total,
-                frais_livraison=frais_livraison,
-                total=total,
-                notes=demande_checkout.notes or "",
-            )
-
             logger.info(
                 f"Checkout {checkout_id} terminé avec succès - Commande {commande_id}"
             )
@@ -135,12 +161,11 @@ class CheckoutEcommerceUseCase:
         """Valide que le panier existe et n'est pas vide"""
         return self.panier_service.valider_panier_pour_checkout(client_id)
 
-    def _verifier_stocks_centraux(self, panier_info: Dict[str, Any]) -> Dict[str, Any]:
+    def _verifier_stocks_centraux(
+        self, produits_stock: List[Dict[str, Any]]
+    ) -> Dict[str, Any]:
         """Vérifie que tous les produits du panier ont un stock suffisant"""
-        produits_panier = self.panier_service.obtenir_produits_pour_stock(
-            panier_info["client_id"]
-        )
-        return self.stock_service.valider_stocks_suffisants(produits_panier)
+        return self.stock_service.valider_stocks_suffisants(produits_stock)
 
     def _calculer_frais_livraison(
         self, sous_total: Decimal, livraison_express: bool
@@ -148,43 +173,57 @@ class CheckoutEcommerceUseCase:
         """
         Calcule les frais de livraison selon la logique métier e-commerce
         """
-        if sous_total >= Decimal("100.00"):
+        if sous_total >= SEUIL_LIVRAISON_GRATUITE:
             # Livraison gratuite pour commandes ≥ 100€
-            return Decimal("0.00")
+            return LIVRAISON_GRATUITE
         elif livraison_express:
             # Livraison express
-            return Decimal("15.00")
+            return FRAIS_LIVRAISON_EXPRESS
         else:
             # Livraison standard
-            return Decimal("7.50")
+            return FRAIS_LIVRAISON_STANDARD
 
-    def _decrémenter_stocks_centraux(self, panier_info: Dict[str, Any]) -> None:
+    def _decrémenter_stocks_centraux(self, produits: List[Dict[str, Any]]) -> None:
         """
         Décrémente les stocks centraux pour tous les produits du panier
+        Un seul appel tout-ou-rien: un échec ne laisse aucun stock décrémenté
         """
-        for produit in panier_info["produits"]:
-            produit_id = produit["produit_id"]
-            quantite = produit["quantite"]
+        result = self.stock_service.diminuer_stocks_centraux(produits)
 
-            result = self.stock_service.diminuer_stock_central(produit_id, quantite)
-
-            if not result["success"]:
-                error_msg = (
-                    f"Échec décrémentation stock {produit_id}: {result.get('error')}"
-                )
-                logger.error(error_msg)
-                raise ServiceExterneIndisponibleError("inventaire", error_msg)
+        if not result["success"]:
+            error_msg = f"Échec décrémentation stocks: {result.get('error')}"
+            logger.error(error_msg)
+            raise ServiceExterneIndisponibleError("inventaire", error_msg)
 
+        # Résultats dans l'ordre des lignes envoyées
+        for produit, resultat in zip(produits, result["resultats"]):
             logger.info(
-                f"Stock décrementé: {produit['nom_produit']} -{quantite} = {result['nouvelle_quantite']}"
+                f"Stock décrementé: {produit['nom_produit']} -{produit['quantite']} "
+                f"= {resultat.get('nouvelle_quantite')}"
+            )
+
+    def _restaurer_stocks_centraux(
+        self, checkout_id: uuid.UUID, produits: List[Dict[str, Any]]
+    ) -> None:
+        """
+        Compensation: restitue le stock central décrémenté pour une commande
+        qui n'a pas pu être enregistrée. Un échec de la restitution ne masque
+        pas l'erreur d'origine: il est journalisé pour réconciliation manuelle
+        """
+        result = self.stock_service.augmenter_stocks_centraux(produits)
+        if not result["success"]:
+            logger.critical(
+                f"Stock non restitué après échec du checkout {checkout_id}: "
+                f"{result.get('error')} - lignes à réconcilier: "
+                + ", ".join(f"{p['produit_id']} +{p['quantite']}" for p in produits)
             )
 
     def _construire_commande_finale(
         self,
         commande_id: uuid.UUID,
         checkout_id: uuid.UUID,
-        client_id: str,
-        panier_info: Dict[str, Any],
+        client_id: uuid.UUID,
+        panier_info: PanierInfo,
         adresse_livraison: AdresseLivraison,
         sous_total: Decimal,
         frais_livraison: Decimal,
@@ -198,7 +237,7 @@ class CheckoutEcommerceUseCase:
         # Créer l'entité commande e-commerce
         commande_domaine = CommandeEcommerceDomain(
             id=commande_id,
-            client_id=uuid.UUID(client_id),
+            client_id=client_id,
             checkout_id=checkout_id,
             statut="validee",
         )
@@ -210,12 +249,12 @@ class CheckoutEcommerceUseCase:
         commande_domaine.definir_adresse_livraison(adresse_livraison)
 
         # Ajouter les lignes de commande
-        for produit in panier_info["produits"]:
+        for produit in panier_info.produits:
             ligne = LigneCommande(
-                produit_id=uuid.UUID(produit["produit_id"]),
-                nom_produit=produit["nom_produit"],
-                quantite=produit["quantite"],
-                prix_unitaire=Decimal(str(produit["prix_unitaire"])),
+                produit_id=produit.produit_id,
+                nom_produit=produit.nom_produit,
+                quantite=produit.quantite,
+                prix_unitaire=produit.prix_unitaire,
             )
             commande_domaine.ajouter_ligne(ligne)
 
@@ -234,32 +273,33 @@ class CheckoutEcommerceUseCase:
             "commande_id": str(commande_id),
             "statut": "finalise",
             "message": "Check-out terminé avec succès",
-            "timestamp": datetime.now().isoformat(),
+            # Même instant que la date de la commande, sans relire l'horloge
+            "timestamp": commande_domaine.date_commande.isoformat(),
             "commande": {
                 "client_id": client_id,
                 "total": float(total),
                 "sous_total": float(sous_total),
                 "frais_livraison": float(frais_livraison),
-                "livraison_gratuite": frais_livraison == Decimal("0.00"),
+                "livraison_gratuite": frais_livraison == LIVRAISON_GRATUITE,
                 "adresse_livraison": {
                     "nom_destinataire": adresse_livraison.nom_destinataire,
                     "adresse_complete": adresse_livraison.adresse_complete(),
                     "livraison_express": adresse_livraison.livraison_express,
                     "instructions": adresse_livraison.instructions_livraison,
                 },
-                "nombre_articles": panier_info["nombre_articles"],
-                "nombre_produits": panier_info["nombre_produits"],
+                "nombre_articles": panier_info.nombre_articles,
+                "nombre_produits": panier_info.nombre_produits,
                 "notes": notes,
             },
             "produits": [
                 {
-                    "produit_id": produit["produit_id"],
-                    "nom_produit": produit["nom_produit"],
-                    "quantite": produit["quantite"],
-                    "prix_unitaire": produit["prix_unitaire"],
-                    "prix_total": produit["prix_total"],
+                    "produit_id": produit.produit_id,
+                    "nom_produit": produit.nom_produit,
+                    "quantite": produit.quantite,
+                    "prix_unitaire": float(produit.prix_unitaire),
+                    "prix_total": float(produit.prix_total),
                 }
-                for produit in panier_info["produits"]
+                for produit in panier_info.produits
             ],
             "operations": {
                 "panier_vide": True,
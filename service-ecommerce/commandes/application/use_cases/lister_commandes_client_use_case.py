@@ -5,9 +5,11 @@ Permet de consulter l'historique des commandes e-commerce d'un client
 
 import uuid
 import logging
-from typing import Dict, Any, List
+from decimal import Decimal
+from typing import Dict, Any, List, Optional
 
 from ..repositories.commande_ecommerce_repository import CommandeEcommerceRepository
+from ...domain.entities import CommandeEcommerce
 from ...domain.exceptions import ClientInvalideError
 
 logger = logging.getLogger("commandes")
@@ -23,16 +25,20 @@ class ListerCommandesClientUseCase:
     def __init__(self, commande_repository: CommandeEcommerceRepository):
         self._commande_repo = commande_repository
 
-    def execute(self, client_id: str, limite: int = 50) -> Dict[str, Any]:
+    def execute(
+        self, client_id: str, limite: int = 50, curseur: Optional[uuid.UUID] = None
+    ) -> Dict[str, Any]:
         """
-        Récupère l'historique des commandes d'un client
+        Récupère une page de l'historique des commandes d'un client
 
         Args:
             client_id: UUID du client
             limite: Nombre maximum de commandes à retourner
+            curseur: curseur_suivant de la page précédente (None: première page)
 
         Returns:
-            Dict contenant la liste des commandes et les statistiques
+            Dict contenant la liste des commandes, les statistiques de la page
+            et le curseur de la page suivante
         """
 
         logger.debug(f"Récupération historique commandes pour client {client_id}")
@@ -44,7 +50,9 @@ class ListerCommandesClientUseCase:
             raise ClientInvalideError(f"UUID client invalide: {client_id}")
 
         # Récupération des commandes
-        commandes_domaine = self._commande_repo.get_by_client_id(client_uuid, limite)
+        commandes_domaine = self._commande_repo.get_by_client_id(
+            client_uuid, limite, curseur
+        )
 
         if not commandes_domaine:
             logger.debug(f"Aucune commande trouvée pour client {client_id}")
@@ -57,58 +65,21 @@ class ListerCommandesClientUseCase:
                     "commande_moyenne": 0.0,
                     "derniere_commande": None,
                 },
+                "curseur_suivant": None,
             }
 
         # Formatage des commandes pour l'API
-        commandes_formatees = []
-        total_depense = 0.0
-
-        for commande in commandes_domaine:
-            commande_dict = {
-                "commande_id": str(commande.id),
-                "checkout_id": str(commande.checkout_id),
-                "statut": commande.statut,
-                "date_commande": commande.date_commande.isoformat(),
-                "date_modification": commande.date_modification.isoformat(),
-                "montants": {
-                    "sous_total": float(commande.sous_total),
-                    "frais_livraison": float(commande.frais_livraison),
-                    "total": float(commande.total),
-                    "livraison_gratuite": commande.frais_livraison == 0,
-                },
-                "details": {
-                    "nombre_articles": commande.nombre_articles,
-                    "nombre_produits": commande.nombre_produits,
-                    "notes": commande.notes,
-                },
-                "adresse_livraison": (
-                    commande.adresse_livraison.to_dict()
-                    if commande.adresse_livraison
-                    else None
-                ),
-                "produits": [
-                    {
-                        "produit_id": str(ligne.produit_id),
-                        "nom_produit": ligne.nom_produit,
-                        "quantite": ligne.quantite,
-                        "prix_unitaire": float(ligne.prix_unitaire),
-                        "prix_total": float(ligne.prix_total()),
-                    }
-                    for ligne in commande.lignes
-                ],
-            }
+        commandes_formatees = [
+            self._formater_commande(commande) for commande in commandes_domaine
+        ]
 
-            commandes_formatees.append(commande_dict)
-            total_depense += float(commande.total)
-
-        # Calcul des statistiques
+        # Calcul des statistiques: somme exacte en Decimal, convertie une fois
         nombre_commandes = len(commandes_formatees)
-        commande_moyenne = (
-            total_depense / nombre_commandes if nombre_commandes > 0 else 0.0
-        )
-        derniere_commande = (
-            commandes_formatees[0]["date_commande"] if commandes_formatees else None
+        total_depense = sum(
+            (commande.total for commande in commandes_domaine), Decimal("0")
         )
+        commande_moyenne = total_depense / nombre_commandes
+        derniere_commande = commandes_formatees[0]["date_commande"]
 
         logger.debug(
             f"Historique récupéré: {nombre_commandes} commandes, total {total_depense}€"
@@ -119,8 +90,55 @@ class ListerCommandesClientUseCase:
             "commandes": commandes_formatees,
             "statistiques": {
                 "nombre_commandes": nombre_commandes,
-                "total_depense": round(total_depense, 2),
-                "commande_moyenne": round(commande_moyenne, 2),
+                "total_depense": round(float(total_depense), 2),
+                "commande_moyenne": round(float(commande_moyenne), 2),
                 "derniere_commande": derniere_commande,
             },
+            # Page pleine: d'autres commandes peuvent suivre la dernière
+            "curseur_suivant": (
+                commandes_domaine[-1].id if nombre_commandes == limite else None
+            ),
+        }
+
+    def _formater_commande(self, commande: CommandeEcommerce) -> Dict[str, Any]:
+        """
+        Formate une commande et ses lignes pour l'API
+        UUID et dates sont laissés tels quels: le renderer orjson les encode
+        """
+        produits = []
+        # La propriété lignes copie la liste: lue une seule fois
+        for ligne in commande.lignes:
+            produits.append(
+                {
+                    "produit_id": ligne.produit_id,
+                    "nom_produit": ligne.nom_produit,
+                    "quantite": ligne.quantite,
+                    "prix_unitaire": float(ligne.prix_unitaire),
+                    "prix_total": float(ligne.prix_total()),
+                }
+            )
+
+        return {
+            "commande_id": commande.id,
+            "checkout_id": commande.checkout_id,
+            "statut": commande.statut,
+            "date_commande": commande.date_commande,
+            "date_modification": commande.date_modification,
+            "montants": {
+                "sous_total": float(commande.sous_total),
+                "frais_livraison": float(commande.frais_livraison),
+                "total": float(commande.total),
+                "livraison_gratuite": commande.frais_livraison == 0,
+            },
+            "details": {
+                "nombre_articles": commande.nombre_articles,
+                "nombre_produits": commande.nombre_produits,
+                "notes": commande.notes,
+            },
+            "adresse_livraison": (
+                commande.adresse_livraison.to_dict()
+                if commande.adresse_livraison
+                else None
+            ),
+            "produits": produits,
         }
@@ -49,7 +49,8 @@ class LigneCommande:
 
     def prix_total(self) -> Decimal:
         """Calcule le prix total pour cette ligne"""
-        return self.prix_unitaire * Decimal(str(self.quantite))
+        # Decimal * int est exact: pas de conversion de la quantité en Decimal
+        return self.prix_unitaire * self.quantite
 
     def __str__(self):
         return f"{self.nom_produit} x{self.quantite} = {self.prix_total()}€"
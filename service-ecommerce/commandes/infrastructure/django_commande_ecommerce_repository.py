@@ -7,6 +7,8 @@ from uuid import UUID
 from datetime import datetime, timedelta
 from decimal import Decimal
 
+from django.db.models import Q, Subquery
+
 from ..application.repositories.commande_ecommerce_repository import (
     CommandeEcommerceRepository,
 )
@@ -111,12 +113,30 @@ class DjangoCommandeEcommerceRepository(CommandeEcommerceRepository):
             return None
 
     def get_by_client_id(
-        self, client_id: UUID, limit: int = 50
+        self, client_id: UUID, limit: int = 50, curseur: Optional[UUID] = None
     ) -> List[CommandeEcommerceDomain]:
-        """Récupère toutes les commandes d'un client"""
-        django_commandes = CommandeEcommerceDjango.objects.filter(
-            client_id=client_id
-        ).order_by("-date_commande")[:limit]
+        """Récupère une page des commandes d'un client, les plus récentes d'abord"""
+        commandes = CommandeEcommerceDjango.objects.filter(client_id=client_id)
+
+        if curseur is not None:
+            # Pagination par clé (date, id) plutôt que par OFFSET: la page reprend
+            # juste après la commande curseur, lue dans l'index client/date par
+            # une sous-requête (curseur inconnu: page vide)
+            date_curseur = Subquery(
+                CommandeEcommerceDjango.objects.filter(
+                    id=curseur, client_id=client_id
+                ).values("date_commande")[:1]
+            )
+            commandes = commandes.filter(
+                Q(date_commande__lt=date_curseur)
+                | Q(date_commande=date_curseur, id__lt=curseur)
+            )
+
+        # Lignes préchargées en une requête: le mapping ne relit pas la base
+        # pour chaque commande (l'adresse est portée par la commande elle-même)
+        django_commandes = commandes.prefetch_related("lignes").order_by(
+            "-date_commande", "-id"
+        )[:limit]
 
         return [self._mapper_vers_domaine(cmd) for cmd in django_commandes]
 
@@ -138,9 +158,11 @@ class DjangoCommandeEcommerceRepository(CommandeEcommerceRepository):
         """Récupère les commandes récentes"""
         date_limite = datetime.now() - timedelta(days=days)
 
-        django_commandes = CommandeEcommerceDjango.objects.filter(
-            date_commande__gte=date_limite
-        ).order_by("-date_commande")[:limit]
+        django_commandes = (
+            CommandeEcommerceDjango.objects.filter(date_commande__gte=date_limite)
+            .prefetch_related("lignes")
+            .order_by("-date_commande")[:limit]
+        )
 
         return [self._mapper_vers_domaine(cmd) for cmd in django_commandes]
 
@@ -0,0 +1,103 @@
+"""
+Tests du check-out e-commerce: compensation du stock central
+Services externes et transaction remplacés par des doublures (aucune base requise)
+"""
+
+import uuid
+from contextlib import nullcontext
+from decimal import Decimal
+from unittest.mock import Mock, patch
+
+from django.test import SimpleTestCase
+
+from commandes.application.use_cases import checkout_ecommerce_use_case as module
+from commandes.domain.exceptions import CheckoutError
+from commandes.domain.value_objects import AdresseLivraison, DemandeCheckout
+
+LIGNES_STOCK = [
+    {"produit_id": str(uuid.uuid4()), "quantite": 2, "nom_produit": "Clavier"},
+    {"produit_id": str(uuid.uuid4()), "quantite": 1, "nom_produit": "Souris"},
+]
+
+
+class CompensationCheckoutTest(SimpleTestCase):
+    """Le stock décrémenté est restitué si la commande n'est pas enregistrée"""
+
+    def setUp(self):
+        self.use_case = module.CheckoutEcommerceUseCase()
+        self.use_case.panier_service = Mock()
+        self.use_case.panier_service.valider_panier_pour_checkout.return_value = {
+            "valide": True,
+            "panier": Mock(total=Decimal("50.00")),
+        }
+        self.use_case.panier_service.extraire_produits_pour_stock.return_value = (
+            LIGNES_STOCK
+        )
+        self.use_case.stock_service = Mock()
+        self.use_case.stock_service.valider_stocks_suffisants.return_value = {
+            "tous_suffisants": True
+        }
+        self.use_case.stock_service.diminuer_stocks_centraux.return_value = {
+            "success": True,
+            "resultats": [{}, {}],
+        }
+        self.demande = DemandeCheckout(
+            client_id=uuid.uuid4(),
+            panier_id=uuid.uuid4(),
+            adresse_livraison=AdresseLivraison(
+                nom_destinataire="Jean Tremblay",
+                rue="123 rue Principale",
+                ville="Montréal",
+                code_postal="H2X 1Y4",
+                province="QC",
+                pays="Canada",
+            ),
+        )
+        # Pas de base de données: la transaction est neutralisée
+        transaction = patch.object(module, "transaction")
+        self.addCleanup(transaction.stop)
+        transaction.start().atomic.side_effect = nullcontext
+
+    def _echouer_enregistrement(self):
+        self.use_case._construire_commande_finale = Mock(
+            side_effect=RuntimeError("base indisponible")
+        )
+
+    def test_stock_restitue_si_enregistrement_echoue(self):
+        self._echouer_enregistrement()
+        self.use_case.stock_service.augmenter_stocks_centraux.return_value = {
+            "success": True
+        }
+
+        with self.assertRaises(CheckoutError):
+            self.use_case.execute(self.demande)
+
+        self.use_case.stock_service.augmenter_stocks_centraux.assert_called_once_with(
+            LIGNES_STOCK
+        )
+        self.use_case.panier_service.vider_panier_apres_commande.assert_not_called()
+
+    def test_echec_restitution_journalise_sans_masquer_l_erreur(self):
+        self._echouer_enregistrement()
+        self.use_case.stock_service.augmenter_stocks_centraux.return_value = {
+            "success": False,
+            "error": "HTTP 503",
+        }
+
+        with self.assertLogs("commandes", level="CRITICAL") as logs:
+            with self.assertRaisesMessage(CheckoutError, "base indisponible"):
+                self.use_case.execute(self.demande)
+
+        self.assertIn("HTTP 503", logs.output[0])
+        self.assertIn(f"{LIGNES_STOCK[0]['produit_id']} +2", logs.output[0])
+
+    def test_aucune_restitution_si_commande_enregistree(self):
+        self.use_case._construire_commande_finale = Mock(
+            return_value={"commande_id": "c1"}
+        )
+        self.use_case.panier_service.vider_panier_apres_commande.return_value = {
+            "success": True
+        }
+
+        self.assertEqual(self.use_case.execute(self.demande), {"commande_id": "c1"})
+        self.use_case.stock_service.augmenter_stocks_centraux.assert_not_called()
@@ -228,8 +228,9 @@ def verifier_prerequis_checkout(request, client_id):
             # 2. Vérification des stocks si le panier est valide
             stocks_validation = {"tous_suffisants": True, "stocks_insuffisants": []}
             if panier_validation["valide"]:
-                produits_panier = panier_service.obtenir_produits_pour_stock(
-                    str(client_uuid)
+                # Panier déjà lu par la validation: pas de seconde lecture en base
+                produits_panier = panier_service.extraire_produits_pour_stock(
+                    panier_validation["panier"]
                 )
                 if produits_panier:
                     stocks_validation = stock_service.valider_stocks_suffisants(
@@ -249,9 +250,7 @@ def verifier_prerequis_checkout(request, client_id):
                 "details": {
                     "client": {"id": str(client_uuid), "status": "actif"},
                     "panier": {
-                        "existe": panier_validation.get("panier", {}).get(
-                            "panier_existe", False
-                        ),
+                        "existe": "panier" in panier_validation,
                         "nombre_articles": panier_validation.get("resume", {}).get(
                             "nombre_articles", 0
                         ),
@@ -311,6 +310,7 @@ def historique_commandes_client(request, client_id):
 
     Query params:
     - limite: nombre maximum de commandes (défaut: 50)
+    - curseur: curseur_suivant de la page précédente (pagination)
     """
     try:
         # Validation UUID (Django convertit automatiquement via <uuid:client_id>)
@@ -333,6 +333,21 @@ def historique_commandes_client(request, client_id):
         if limite <= 0 or limite > 100:
             limite = 50
 
+        curseur = request.GET.get("curseur")
+        if curseur:
+            try:
+                curseur = uuid.UUID(curseur)
+            except ValueError:
+                return Response(
+                    {
+                        "error": "Curseur invalide",
+                        "details": f"Format UUID attendu, reçu: {curseur}",
+                    },
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+        else:
+            curseur = None
+
         # Utilisation du Use Case pour récupérer l'historique
         try:
             from .application.use_cases.lister_commandes_client_use_case import (
@@ -345,7 +360,7 @@ def historique_commandes_client(request, client_id):
             repository = DjangoCommandeEcommerceRepository()
             use_case = ListerCommandesClientUseCase(repository)
 
-            historique = use_case.execute(str(client_uuid), limite)
+            historique = use_case.execute(str(client_uuid), limite, curseur)
 
             logger.info(
                 f"Historique récupéré pour client {client_id}: {historique['statistiques']['nombre_commandes']} commandes"
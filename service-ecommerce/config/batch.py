@@ -0,0 +1,194 @@
+"""
+Endpoint de batch pour le service e-commerce
+Exécute plusieurs appels d'API du service en un seul aller-retour Kong
+"""
+
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+from django.db import close_old_connections
+from django.http import HttpRequest, QueryDict
+from django.urls import Resolver404, resolve
+from rest_framework import status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import AllowAny
+from rest_framework.response import Response
+
+logger = logging.getLogger("batch")
+
+BATCH_PATH = "/api/batch/"
+MAX_APPELS = 20
+METHODES_AUTORISEES = {"GET", "POST", "PUT", "PATCH", "DELETE"}
+
+# Pool partagé pour exécuter en parallèle les appels sans dépendance
+_EXECUTOR = ThreadPoolExecutor(max_workers=8, thread_name_prefix="batch")
+
+
+def _construire_sous_requete(
+    request, methode: str, chemin: str, query: str, corps
+) -> HttpRequest:
+    """Construit la requête Django interne d'un appel du batch (query string incluse)"""
+    brut = json.dumps(corps).encode() if corps is not None else b""
+    sous_requete = HttpRequest()
+    sous_requete.method = methode
+    sous_requete.path = sous_requete.path_info = chemin
+    sous_requete.META = {
+        **request.META,
+        "REQUEST_METHOD": methode,
+        "PATH_INFO": chemin,
+        "QUERY_STRING": query,
+        "CONTENT_TYPE": "application/json",
+        "CONTENT_LENGTH": str(len(brut)),
+    }
+    sous_requete.GET = QueryDict(query)
+    sous_requete._body = brut
+    sous_requete._read_started = True
+    return sous_requete
+
+
+def _executer_appel(request, appel: dict):
+    """Résout le chemin sur l'URLconf du service et exécute la vue"""
+    methode = str(appel.get("method", "GET")).upper()
+    # Paramètres de requête (pagination de l'historique...) séparés du chemin
+    url = urlsplit(appel.get("path", ""))
+    chemin = url.path
+    if methode not in METHODES_AUTORISEES:
+        return status.HTTP_400_BAD_REQUEST, {"error": f"Méthode {methode} refusée"}
+    if not chemin.startswith("/api/") or chemin.startswith(BATCH_PATH):
+        return status.HTTP_400_BAD_REQUEST, {"error": f"Chemin {chemin} refusé"}
+
+    try:
+        match = resolve(chemin)
+    except Resolver404:
+        return status.HTTP_404_NOT_FOUND, {"error": f"Chemin {chemin} inconnu"}
+
+    sous_requete = _construire_sous_requete(
+        request, methode, chemin, url.query, appel.get("body")
+    )
+    response = match.func(sous_requete, *match.args, **match.kwargs)
+    if hasattr(response, "render"):
+        response.render()
+    if hasattr(response, "data"):
+        return response.status_code, response.data
+    return response.status_code, json.loads(response.content or b"null")
+
+
+def _resultat_appel(request, appel_id, appel: dict) -> dict:
+    """Exécute un appel et met en forme son résultat (500 si la vue lève)"""
+    try:
+        code, donnees = _executer_appel(request, appel)
+    except Exception as e:
+        logger.error("Erreur appel batch %s: %s", appel_id, e)
+        code, donnees = status.HTTP_500_INTERNAL_SERVER_ERROR, {"error": str(e)}
+    return {"id": appel_id, "status": code, "data": donnees}
+
+
+def _resultat_appel_pool(request, appel_id, appel: dict) -> dict:
+    """
+    Exécute un appel sur un thread du pool: ce thread a ses propres connexions
+    à la base, fermées après l'appel comme en fin de requête Django
+    """
+    close_old_connections()
+    try:
+        return _resultat_appel(request, appel_id, appel)
+    finally:
+        close_old_connections()
+
+
+def _appel_en_echec(resultat: dict) -> bool:
+    """
+    Un appel échoue sur un statut d'erreur, ou sur une réponse 200 qui signale
+    l'échec dans son corps (prérequis du check-out: peut_commander à False)
+    """
+    if resultat["status"] >= 400:
+        return True
+    donnees = resultat.get("data")
+    return isinstance(donnees, dict) and (
+        donnees.get("success") is False or donnees.get("peut_commander") is False
+    )
+
+
+@api_view(["POST"])
+@permission_classes([AllowAny])
+def batch_api(request):
+    """
+    Exécute une liste d'appels dans un seul aller-retour
+
+    POST /api/batch/
+    [
+        {"id": 0, "method": "GET", "path": "/api/commandes/clients/<id>/checkout/prerequis/"},
+        {"id": 1, "method": "POST", "path": "/api/commandes/clients/<id>/checkout/",
+         "body": {...}, "input_from": 0}
+    ]
+
+    Les appels sans `input_from` sont exécutés en parallèle; les autres ensuite,
+    dans l'ordre de la liste. Les résultats suivent l'ordre des appels.
+
+    `input_from` désigne l'appel dont celui-ci dépend: si la dépendance échoue
+    (statut d'erreur, ou `success`/`peut_commander` à False dans sa réponse),
+    l'appel n'est pas exécuté et retourne INVALID_ARGUMENT (échec en cascade).
+    """
+    appels = request.data
+    if not isinstance(appels, list) or not appels:
+        return Response(
+            {"success": False, "error": "Liste d'appels attendue"},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    if len(appels) > MAX_APPELS:
+        return Response(
+            {"success": False, "error": f"Maximum {MAX_APPELS} appels par batch"},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    for index, appel in enumerate(appels):
+        if not isinstance(appel, dict):
+            return Response(
+                {"success": False, "error": f"Appel {index} invalide"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+    ids = [appel.get("id", index) for index, appel in enumerate(appels)]
+
+    # 1. Appels indépendants (sans input_from): exécutés en parallèle
+    independants = [
+        (appel_id, appel)
+        for appel_id, appel in zip(ids, appels)
+        if appel.get("input_from", -1) in (-1, None)
+    ]
+    if len(independants) > 1:
+        futures = {
+            appel_id: _EXECUTOR.submit(_resultat_appel_pool, request, appel_id, appel)
+            for appel_id, appel in independants
+        }
+        resultats = {appel_id: future.result() for appel_id, future in futures.items()}
+    else:
+        resultats = {
+            appel_id: _resultat_appel(request, appel_id, appel)
+            for appel_id, appel in independants
+        }
+
+    # 2. Appels dépendants: exécutés dans l'ordre, après leur dépendance
+    for appel_id, appel in zip(ids, appels):
+        dependance = appel.get("input_from", -1)
+        if dependance in (-1, None):
+            continue
+        parent = resultats.get(dependance)
+        if parent is None or _appel_en_echec(parent):
+            resultats[appel_id] = {
+                "id": appel_id,
+                "status": status.HTTP_424_FAILED_DEPENDENCY,
+                "error": "INVALID_ARGUMENT",
+                "data": {"error": f"Dépendance {dependance} en échec"},
+            }
+        else:
+            resultats[appel_id] = _resultat_appel(request, appel_id, appel)
+
+    liste_resultats = [resultats[appel_id] for appel_id in dict.fromkeys(ids)]
+    return Response(
+        {
+            "success": not any(_appel_en_echec(r) for r in liste_resultats),
+            "results": liste_resultats,
+        },
+        status=status.HTTP_200_OK,
+    )
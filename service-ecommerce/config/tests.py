@@ -0,0 +1,203 @@
+"""
+Tests de l'endpoint de batch du service e-commerce
+Services externes remplacés par des doublures (aucune base requise)
+"""
+
+import threading
+import uuid
+from unittest.mock import patch
+
+from django.test import SimpleTestCase, override_settings
+from django.urls import path
+from rest_framework.decorators import api_view
+from rest_framework.response import Response
+from rest_framework.test import APIClient
+
+from config.batch import MAX_APPELS, batch_api
+
+BATCH_URL = "/api/batch/"
+
+
+@api_view(["GET"])
+def _echo(request):
+    return Response(
+        {
+            "query": request.query_params.dict(),
+            "thread": threading.current_thread().name,
+        }
+    )
+
+
+@api_view(["POST"])
+def _creer(request):
+    return Response({"recu": request.data}, status=201)
+
+
+@api_view(["GET"])
+def _introuvable(request):
+    return Response({"error": "Ressource absente"}, status=404)
+
+
+# URLconf de test: le batch et des vues factices sous /api/
+urlpatterns = [
+    path("api/batch/", batch_api),
+    path("api/test/echo/", _echo),
+    path("api/test/creer/", _creer),
+    path("api/test/introuvable/", _introuvable),
+    path("autre/echo/", _echo),
+]
+
+
+@override_settings(ROOT_URLCONF=__name__)
+class BatchApiTest(SimpleTestCase):
+    """Résolution, exécution et garde-fous des appels du batch"""
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def _batch(self, appels):
+        return self.client.post(BATCH_URL, appels, format="json")
+
+    def test_get_avec_query_string(self):
+        response = self._batch(
+            [{"id": "a", "method": "GET", "path": "/api/test/echo/?page=2&taille=5"}]
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.data["success"])
+        (resultat,) = response.data["results"]
+        self.assertEqual(resultat["id"], "a")
+        self.assertEqual(resultat["status"], 200)
+        self.assertEqual(resultat["data"]["query"], {"page": "2", "taille": "5"})
+
+    def test_post_transmet_le_corps(self):
+        response = self._batch(
+            [{"method": "POST", "path": "/api/test/creer/", "body": {"quantite": 3}}]
+        )
+
+        (resultat,) = response.data["results"]
+        self.assertEqual(resultat["id"], 0)
+        self.assertEqual(resultat["status"], 201)
+        self.assertEqual(resultat["data"], {"recu": {"quantite": 3}})
+
+    def test_appels_independants_en_parallele(self):
+        response = self._batch(
+            [
+                {"id": 0, "method": "GET", "path": "/api/test/echo/?n=0"},
+                {"id": 1, "method": "GET", "path": "/api/test/echo/?n=1"},
+            ]
+        )
+
+        resultats = response.data["results"]
+        self.assertEqual([r["id"] for r in resultats], [0, 1])
+        self.assertEqual([r["data"]["query"]["n"] for r in resultats], ["0", "1"])
+        for resultat in resultats:
+            self.assertTrue(resultat["data"]["thread"].startswith("batch"))
+
+    def test_dependance_executee_si_parent_reussit(self):
+        response = self._batch(
+            [
+                {"id": 0, "method": "GET", "path": "/api/test/echo/"},
+                {
+                    "id": 1,
+                    "method": "POST",
+                    "path": "/api/test/creer/",
+                    "body": {},
+                    "input_from": 0,
+                },
+            ]
+        )
+
+        self.assertTrue(response.data["success"])
+        self.assertEqual(response.data["results"][1]["status"], 201)
+
+    def test_echec_en_cascade_invalid_argument(self):
+        response = self._batch(
+            [
+                {"id": 0, "method": "GET", "path": "/api/test/introuvable/"},
+                {"id": 1, "method": "GET", "path": "/api/test/echo/", "input_from": 0},
+                {"id": 2, "method": "GET", "path": "/api/test/echo/", "input_from": 1},
+                {"id": 3, "method": "GET", "path": "/api/test/echo/", "input_from": 9},
+            ]
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.data["success"])
+        parent, *dependants = response.data["results"]
+        self.assertEqual(parent["status"], 404)
+        for resultat in dependants:
+            self.assertEqual(resultat["status"], 424)
+            self.assertEqual(resultat["error"], "INVALID_ARGUMENT")
+
+    def test_batch_imbrique_refuse(self):
+        response = self._batch([{"method": "POST", "path": BATCH_URL, "body": []}])
+
+        (resultat,) = response.data["results"]
+        self.assertEqual(resultat["status"], 400)
+        self.assertFalse(response.data["success"])
+
+    def test_chemin_hors_api_refuse(self):
+        response = self._batch([{"method": "GET", "path": "/autre/echo/"}])
+
+        self.assertEqual(response.data["results"][0]["status"], 400)
+
+    def test_chemin_inconnu_et_methode_refusee(self):
+        response = self._batch(
+            [
+                {"method": "GET", "path": "/api/test/absent/"},
+                {"method": "TRACE", "path": "/api/test/echo/"},
+            ]
+        )
+
+        statuts = [r["status"] for r in response.data["results"]]
+        self.assertEqual(statuts, [404, 400])
+
+    def test_limite_max_appels(self):
+        appel = {"method": "GET", "path": "/api/test/echo/"}
+
+        self.assertEqual(self._batch([appel] * MAX_APPELS).status_code, 200)
+        response = self._batch([appel] * (MAX_APPELS + 1))
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(response.data["success"])
+
+    def test_corps_invalide_refuse(self):
+        self.assertEqual(self._batch([]).status_code, 400)
+        self.assertEqual(self._batch({"method": "GET"}).status_code, 400)
+        self.assertEqual(self._batch(["/api/test/echo/"]).status_code, 400)
+
+
+class BatchPrerequisCheckoutTest(SimpleTestCase):
+    """Le checkout n'est pas exécuté si les prérequis ne sont pas remplis"""
+
+    def setUp(self):
+        self.client = APIClient()
+
+    @patch(
+        "commandes.application.services.panier_service.PanierService"
+        ".valider_panier_pour_checkout",
+        return_value={"valide": False, "raison": "Panier vide"},
+    )
+    def test_checkout_en_echec_si_prerequis_non_remplis(self, _):
+        commandes = f"/api/commandes/clients/{uuid.uuid4()}/checkout/"
+        response = self.client.post(
+            BATCH_URL,
+            [
+                {"id": 0, "method": "GET", "path": f"{commandes}prerequis/"},
+                {
+                    "id": 2,
+                    "method": "POST",
+                    "path": commandes,
+                    "body": {},
+                    "input_from": 0,
+                },
+            ],
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, 200)
+        prerequis, appel_checkout = response.data["results"]
+        self.assertEqual(prerequis["status"], 200)
+        self.assertFalse(prerequis["data"]["peut_commander"])
+        self.assertEqual(appel_checkout["status"], 424)
+        self.assertEqual(appel_checkout["error"], "INVALID_ARGUMENT")
+        self.assertFalse(response.data["success"])
@@ -11,6 +11,8 @@ from rest_framework import permissions
 from drf_yasg.views import get_schema_view
 from drf_yasg import openapi
 
+from .batch import batch_api
+
 # Configuration Swagger/OpenAPI
 schema_view = get_schema_view(
     openapi.Info(
@@ -42,6 +44,8 @@ urlpatterns = [
     path("api/clients/", include("clients.ddd_urls")),
     path("api/panier/", include("panier.ddd_urls")),
     path("api/commandes/", include("commandes.ddd_urls")),
+    # Batch: plusieurs appels en un seul aller-retour
+    path("api/batch/", batch_api, name="batch-api"),
     # Prometheus metrics
     path("metrics", lambda request: HttpResponse(generate_latest(), content_type=CONTENT_TYPE_LATEST)),
     # Health check
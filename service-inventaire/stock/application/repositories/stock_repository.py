@@ -4,7 +4,7 @@ Définit le contrat d'accès aux données pour les entités Stock.
 """
 
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import Dict, List, Optional
 from ...domain.entities import StockCentral, StockLocal
 from ...domain.value_objects import ProduitId, MagasinId, StockId
 
@@ -30,6 +30,16 @@ class StockRepository(ABC):
         """
         pass
 
+    @abstractmethod
+    def get_stocks_centraux_by_produits(
+        self, produit_ids: List[ProduitId]
+    ) -> Dict[str, StockCentral]:
+        """
+        Récupère les stocks centraux de plusieurs produits, indexés par produit
+        Les produits sans stock central sont absents du résultat
+        """
+        pass
+
     @abstractmethod
     def get_all_stocks_centraux(self) -> List[StockCentral]:
         """
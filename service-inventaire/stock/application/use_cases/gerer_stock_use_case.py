@@ -47,6 +47,14 @@ class DiminuerStockRequest:
     magasin_id: Optional[str] = None  # None = stock central
 
 
+@dataclass
+class MouvementStockLotRequest:
+    """DTO pour un mouvement de stock groupé sur un même emplacement"""
+
+    lignes: List[Dict[str, Any]]  # [{"produit_id": ..., "quantite": ...}]
+    magasin_id: Optional[str] = None  # None = stock central
+
+
 @dataclass
 class ConsulterStockResponse:
     """DTO pour la réponse de consultation de stock"""
@@ -117,6 +125,24 @@ class GererStockUseCase:
             self.magasin_service.valider_magasin_existe(magasin_id)
             return self._diminuer_stock_local(produit_id, magasin_id, quantite)
 
+    def augmenter_stock_lot(self, request: MouvementStockLotRequest) -> Dict[str, Any]:
+        """
+        Règle métier : Augmente le stock de plusieurs produits en un seul appel
+        Utilisé pour restaurer le stock d'une vente annulée
+        """
+        return self._appliquer_lot(
+            request, self._augmenter_stock_central, self._augmenter_stock_local
+        )
+
+    def diminuer_stock_lot(self, request: MouvementStockLotRequest) -> Dict[str, Any]:
+        """
+        Règle métier : Diminue le stock de plusieurs produits en un seul appel
+        Un stock insuffisant sur une ligne interrompt tout le lot
+        """
+        return self._appliquer_lot(
+            request, self._diminuer_stock_central, self._diminuer_stock_local
+        )
+
     def consulter_stock(
         self, produit_id: str, magasin_id: Optional[str] = None
     ) -> ConsulterStockResponse:
@@ -171,6 +197,33 @@ class GererStockUseCase:
                 nom_magasin=self.magasin_service.get_nom_magasin(magasin_id_vo),
             )
 
+    def consulter_stocks_centraux(
+        self, produit_ids: List[str]
+    ) -> Dict[str, ConsulterStockResponse]:
+        """
+        Règle métier : Consulte le stock central de plusieurs produits
+        Une seule requête pour tout le lot; les noms ne sont pas résolus (appel
+        catalogue par produit), l'appelant les connaît déjà. Un produit sans
+        stock central est rapporté à 0, comme dans consulter_stock
+        """
+        produit_ids_vo = [ProduitId(produit_id) for produit_id in produit_ids]
+        stocks = self.stock_repository.get_stocks_centraux_by_produits(produit_ids_vo)
+
+        resultats = {}
+        for produit_id in produit_ids_vo:
+            stock = stocks.get(str(produit_id))
+            if stock is None:
+                resultats[str(produit_id)] = ConsulterStockResponse(
+                    produit_id=str(produit_id), quantite=0, niveau="Indisponible"
+                )
+            else:
+                resultats[str(produit_id)] = ConsulterStockResponse(
+                    produit_id=str(produit_id),
+                    quantite=int(stock.quantite),
+                    niveau=self._evaluer_niveau_stock_central(stock.quantite),
+                )
+        return resultats
+
     def lister_tous_stocks_centraux(self) -> List[ConsulterStockResponse]:
         """
         Règle métier : Liste tous les stocks centraux
@@ -252,6 +305,32 @@ class GererStockUseCase:
 
     # Méthodes privées pour l'implémentation
 
+    def _appliquer_lot(
+        self, request: MouvementStockLotRequest, operation_centrale, operation_locale
+    ) -> Dict[str, Any]:
+        """Applique une opération à chaque ligne, magasin validé une seule fois"""
+        magasin_id = None
+        if request.magasin_id is not None:
+            magasin_id = MagasinId(request.magasin_id)
+            self.magasin_service.valider_magasin_existe(magasin_id)
+
+        resultats = []
+        for ligne in request.lignes:
+            produit_id = ProduitId(ligne["produit_id"])
+            quantite = Quantite.from_int(ligne["quantite"])
+            self.produit_service.valider_produit_existe(produit_id)
+
+            if magasin_id is None:
+                resultats.append(operation_centrale(produit_id, quantite))
+            else:
+                resultats.append(operation_locale(produit_id, magasin_id, quantite))
+
+        return {
+            "success": True,
+            "message": f"{len(resultats)} ligne(s) de stock mise(s) à jour",
+            "resultats": resultats,
+        }
+
     def _augmenter_stock_central(
         self, produit_id: ProduitId, quantite: Quantite
     ) -> Dict[str, Any]:
@@ -23,7 +23,23 @@ urlpatterns = [
         ddd_views.diminuer_stock,
         name="diminuer_stock_ddd",
     ),
+    # Opérations groupées (un seul aller-retour pour plusieurs produits)
+    path(
+        "api/ddd/inventaire/augmenter-stock-lot/",
+        ddd_views.augmenter_stock_lot,
+        name="augmenter_stock_lot_ddd",
+    ),
+    path(
+        "api/ddd/inventaire/diminuer-stock-lot/",
+        ddd_views.diminuer_stock_lot,
+        name="diminuer_stock_lot_ddd",
+    ),
     # Consultation des stocks
+    path(
+        "api/ddd/inventaire/stock-central/lot/",
+        ddd_views.consulter_stocks_centraux_lot,
+        name="stocks_centraux_lot_ddd",
+    ),
     path(
         "api/ddd/inventaire/stock-central/<uuid:produit_id>/",
         ddd_views.consulter_stock_central,
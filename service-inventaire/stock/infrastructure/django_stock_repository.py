@@ -3,7 +3,7 @@ Implémentation Django du repository Stock
 Convertit entre les modèles Django et les entités DDD.
 """
 
-from typing import List, Optional
+from typing import Dict, List, Optional
 from datetime import datetime
 import uuid
 
@@ -40,6 +40,18 @@ class DjangoStockRepository(StockRepository):
         except ObjectDoesNotExist:
             return None
 
+    def get_stocks_centraux_by_produits(
+        self, produit_ids: List[ProduitId]
+    ) -> Dict[str, StockCentral]:
+        """Récupère les stocks centraux de plusieurs produits en une requête"""
+        django_stocks = DjangoStockCentral.objects.filter(
+            produit_id__in=[str(produit_id) for produit_id in produit_ids]
+        )
+        stocks = [
+            self._mapper_stock_central_vers_domaine(stock) for stock in django_stocks
+        ]
+        return {str(stock.produit_id): stock for stock in stocks}
+
     def get_all_stocks_centraux(self) -> List[StockCentral]:
         """Récupère tous les stocks centraux"""
         django_stocks = DjangoStockCentral.objects.all()
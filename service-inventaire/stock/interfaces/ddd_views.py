@@ -3,6 +3,7 @@ Vues DDD pour le service Stock (Inventaire)
 Orchestration des Use Cases pour toutes les fonctionnalités métier.
 """
 
+from django.db import transaction
 from django.http import JsonResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
@@ -10,11 +11,13 @@ from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
 from rest_framework.decorators import api_view
 import json
+import uuid
 
 from ..application.use_cases.gerer_stock_use_case import (
     GererStockUseCase,
     AugmenterStockRequest,
     DiminuerStockRequest,
+    MouvementStockLotRequest,
 )
 from ..application.use_cases.gerer_demandes_use_case import (
     GererDemandesUseCase,
@@ -213,6 +216,101 @@ def diminuer_stock(request):
         return JsonResponse({"error": f"Erreur interne: {str(e)}"}, status=500)
 
 
+def _lire_mouvement_lot(request) -> MouvementStockLotRequest:
+    """Construit le DTO d'un mouvement groupé depuis le corps JSON"""
+    data = json.loads(request.body)
+    lignes = [
+        {"produit_id": ligne["produit_id"], "quantite": ligne["quantite"]}
+        for ligne in data["lignes"]
+    ]
+    if not lignes:
+        raise ValueError("Aucune ligne de stock fournie")
+    return MouvementStockLotRequest(lignes=lignes, magasin_id=data.get("magasin_id"))
+
+
+_SCHEMA_MOUVEMENT_LOT = openapi.Schema(
+    type=openapi.TYPE_OBJECT,
+    properties={
+        "magasin_id": openapi.Schema(
+            type=openapi.TYPE_STRING,
+            description="ID du magasin (optionnel pour stock central)",
+        ),
+        "lignes": openapi.Schema(
+            type=openapi.TYPE_ARRAY,
+            items=openapi.Schema(
+                type=openapi.TYPE_OBJECT,
+                properties={
+                    "produit_id": openapi.Schema(type=openapi.TYPE_STRING),
+                    "quantite": openapi.Schema(type=openapi.TYPE_INTEGER),
+                },
+            ),
+        ),
+    },
+    required=["lignes"],
+)
+
+
+@swagger_auto_schema(
+    method="post",
+    operation_description="Augmente le stock de plusieurs produits en un seul appel",
+    request_body=_SCHEMA_MOUVEMENT_LOT,
+    responses={200: "Stocks augmentés avec succès", 400: "Erreur de validation"},
+)
+@csrf_exempt
+@api_view(["POST"])
+def augmenter_stock_lot(request):
+    """
+    API DDD : Augmente le stock de plusieurs produits d'un même emplacement
+    Un seul aller-retour pour restaurer toutes les lignes d'une vente annulée
+    """
+    try:
+        request_dto = _lire_mouvement_lot(request)
+
+        use_case = _get_gerer_stock_use_case()
+        # Tout ou rien: une ligne invalide annule les lignes précédentes
+        with transaction.atomic():
+            result = use_case.augmenter_stock_lot(request_dto)
+
+        return JsonResponse(result, status=200)
+
+    except (KeyError, TypeError, ValueError, json.JSONDecodeError) as e:
+        return JsonResponse({"error": f"Données invalides: {str(e)}"}, status=400)
+    except InventaireDomainError as e:
+        return JsonResponse({"error": str(e)}, status=400)
+    except Exception as e:
+        return JsonResponse({"error": f"Erreur interne: {str(e)}"}, status=500)
+
+
+@swagger_auto_schema(
+    method="post",
+    operation_description="Diminue le stock de plusieurs produits en un seul appel",
+    request_body=_SCHEMA_MOUVEMENT_LOT,
+    responses={200: "Stocks diminués avec succès", 400: "Stock insuffisant ou erreur"},
+)
+@csrf_exempt
+@api_view(["POST"])
+def diminuer_stock_lot(request):
+    """
+    API DDD : Diminue le stock de plusieurs produits d'un même emplacement
+    Tout ou rien: un stock insuffisant sur une ligne annule tout le lot
+    """
+    try:
+        request_dto = _lire_mouvement_lot(request)
+
+        use_case = _get_gerer_stock_use_case()
+        with transaction.atomic():
+            result = use_case.diminuer_stock_lot(request_dto)
+
+        return JsonResponse(result, status=200)
+
+    except (KeyError, TypeError, ValueError, json.JSONDecodeError) as e:
+        return JsonResponse({"error": f"Données invalides: {str(e)}"}, status=400)
+    except InventaireDomainError as e:
+        return JsonResponse({"error": str(e)}, status=400)
+    except Exception as e:
+        return JsonResponse({"error": f"Erreur interne: {str(e)}"}, status=500)
+
+
 @swagger_auto_schema(
     method="get",
     operation_description="Consulte le stock central d'un produit",
@@ -245,6 +343,60 @@ def consulter_stock_central(request, produit_id):
         return JsonResponse({"error": f"Erreur interne: {str(e)}"}, status=500)
 
 
+@swagger_auto_schema(
+    method="post",
+    operation_description="Consulte le stock central de plusieurs produits",
+    request_body=openapi.Schema(
+        type=openapi.TYPE_OBJECT,
+        properties={
+            "produit_ids": openapi.Schema(
+                type=openapi.TYPE_ARRAY,
+                items=openapi.Schema(type=openapi.TYPE_STRING),
+            ),
+        },
+        required=["produit_ids"],
+    ),
+    responses={200: "Stock central de chaque produit", 400: "IDs invalides"},
+)
+@csrf_exempt
+@api_view(["POST"])
+def consulter_stocks_centraux_lot(request):
+    """
+    API DDD : Consulte le stock central de plusieurs produits en un appel
+    Remplace N appels à /stock-central/{produit_id}/ lors d'un check-out
+    """
+    try:
+        data = json.loads(request.body)
+        # Forme canonique des UUID: clés de la réponse
+        produit_ids = [
+            str(uuid.UUID(str(produit_id))) for produit_id in data["produit_ids"]
+        ]
+        if not produit_ids:
+            raise ValueError("Aucun produit fourni")
+
+        use_case = _get_gerer_stock_use_case()
+        results = use_case.consulter_stocks_centraux(produit_ids)
+
+        return JsonResponse(
+            {
+                "stocks": {
+                    produit_id: {
+                        "quantite": result.quantite,
+                        "niveau": result.niveau,
+                    }
+                    for produit_id, result in results.items()
+                }
+            }
+        )
+
+    except (KeyError, TypeError, ValueError, json.JSONDecodeError) as e:
+        return JsonResponse({"error": f"Données invalides: {str(e)}"}, status=400)
+    except InventaireDomainError as e:
+        return JsonResponse({"error": str(e)}, status=400)
+    except Exception as e:
+        return JsonResponse({"error": f"Erreur interne: {str(e)}"}, status=500)
+
+
 @swagger_auto_schema(
     method="get",
     operation_description="Consulte le stock local d'un produit dans un magasin",
@@ -15,6 +15,8 @@ import time
 import uuid
 from typing import Dict, Any, Optional
 
+from magasin.infrastructure._http import invalider_cache, invalider_cache_partage
+
 # Configuration Kong Gateway (Tests d'intégration)
 KONG_GATEWAY_URL = "http://localhost:8080"
 KONG_ADMIN_URL = "http://localhost:8081"
@@ -28,6 +30,14 @@ KONG_HEADERS = {
 }
 
 
+@pytest.fixture(autouse=True)
+def vider_cache_clients():
+    """Isole chaque test des caches (mémoire et Redis) des clients HTTP"""
+    invalider_cache()
+    invalider_cache_partage("inventaire", "supply-chain")
+    yield
+
+
 @pytest.fixture(scope="session")
 def kong_client():
     """Client HTTP configuré pour Kong Gateway"""
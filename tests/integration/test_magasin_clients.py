@@ -7,11 +7,15 @@ import pytest
 import requests
 import responses
 from unittest.mock import patch
+from django.test import override_settings
 from magasin.infrastructure.catalogue_client import CatalogueClient
 from magasin.infrastructure.inventaire_client import InventaireClient
 from magasin.infrastructure.commandes_client import CommandesClient
 from magasin.infrastructure.supply_chain_client import SupplyChainClient
 from magasin.infrastructure.ecommerce_client import EcommerceClient
+from magasin.infrastructure._http import activer_memo_requete, creer_adaptateur
+
+CACHE_LOCAL = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
 
 
 @pytest.mark.integration
@@ -130,6 +134,26 @@ class TestInventaireClientIntegration:
         assert len(result["stocks"]) == 2
         assert result["stocks"][1]["quantite"] == 5
 
+    @responses.activate
+    def test_lister_tous_magasins_lu_en_flux(self):
+        """Test décodage en flux d'une grosse liste de magasins"""
+        # Arrange
+        magasins = [{"id": str(i), "stocks": [{"quantite": i}]} for i in range(2000)]
+        responses.add(
+            responses.GET,
+            f"{self.client.base_url}/api/ddd/inventaire/tous-magasins-stocks/",
+            json={"success": True, "magasins": magasins},
+            status=200,
+        )
+
+        # Act
+        result = self.client.lister_tous_magasins_avec_stocks()
+
+        # Assert
+        assert result["success"] is True
+        assert len(result["magasins"]) == 2000
+        assert result["magasins"][-1]["stocks"][0]["quantite"] == 1999
+
     @responses.activate
     def test_creer_demande_reapprovisionnement_mock(self):
         """Test création demande avec API mockée"""
@@ -154,6 +178,71 @@ class TestInventaireClientIntegration:
         assert result["success"] is True
         assert result["demande_id"] == "demande-456"
 
+    @responses.activate
+    def test_approuver_demande_reponse_204(self):
+        """Test qu'une écriture sans corps (204) est un succès"""
+        # Arrange
+        responses.add(
+            responses.PUT,
+            f"{self.client.base_url}/api/ddd/inventaire/demandes/d-1/approuver/",
+            status=204,
+        )
+
+        # Act
+        result = self.client.approuver_demande("d-1")
+
+        # Assert
+        assert result == {"success": True}
+
+    @override_settings(CACHES=CACHE_LOCAL)
+    @responses.activate
+    def test_stocks_centraux_cache_partage_invalide_par_ecriture(self):
+        """Test cache read-through des stocks, invalidé par un mouvement de stock"""
+        # Arrange
+        url = f"{self.client.base_url}/api/ddd/inventaire/stocks-centraux/"
+        responses.add(responses.GET, url, json={"stocks": []}, status=200)
+        responses.add(
+            responses.POST,
+            f"{self.client.base_url}/api/ddd/inventaire/augmenter-stock/",
+            json={"success": True},
+            status=200,
+        )
+
+        # Act
+        self.client.lister_stocks_centraux()
+        self.client.lister_stocks_centraux()
+        self.client.augmenter_stock(produit_id="1", quantite=5)
+        self.client.lister_stocks_centraux()
+
+        # Assert
+        appels_get = [c for c in responses.calls if c.request.url == url]
+        assert len(appels_get) == 2
+
+    @override_settings(
+        CACHES={"default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}}
+    )
+    @responses.activate
+    def test_memo_requete_evite_les_appels_en_double(self):
+        """Test qu'un même GET pendant une requête Django ne part qu'une fois"""
+        # Arrange
+        responses.add(
+            responses.GET,
+            f"{self.client.base_url}/api/ddd/inventaire/stocks-centraux/",
+            json={"stocks": []},
+            status=200,
+        )
+
+        # Act
+        activer_memo_requete({})
+        try:
+            self.client.lister_stocks_centraux()
+            InventaireClient().lister_stocks_centraux()
+        finally:
+            activer_memo_requete(None)
+
+        # Assert
+        assert len(responses.calls) == 1
+
     @responses.activate
     def test_stocks_centraux_timeout_error(self):
         """Test gestion timeout"""
@@ -255,6 +344,116 @@ class TestCommandesClientIntegration:
         assert len(result) == 1
         assert result[0]["performance"] == 95.5
 
+    @responses.activate
+    def test_obtenir_statistiques_ventes_agregation_en_flux(self):
+        """Test statistiques agrégées en une passe sur la réponse streamée"""
+        # Arrange
+        responses.add(
+            responses.GET,
+            f"{self.client.base_url}/api/v1/ventes-ddd/",
+            json={
+                "success": True,
+                "ventes": [
+                    {"id": "v1", "total": 100.0, "statut": "active"},
+                    {"id": "v2", "total": 50.5, "statut": "annulee"},
+                    {"id": "v3", "total": 20.0, "statut": "active"},
+                ],
+                "total_ventes": 3,
+            },
+            status=200,
+        )
+
+        # Act
+        stats = self.client.obtenir_statistiques_ventes()
+
+        # Assert
+        assert stats["total_ventes"] == 3
+        assert stats["ventes_actives"] == 2
+        assert stats["ventes_annulees"] == 1
+        assert stats["chiffre_affaires_total"] == 170.5
+        assert stats["chiffre_affaires_actif"] == 120.0
+
+    @responses.activate
+    def test_obtenir_ventes_groupees_par_magasin_une_seule_requete(self):
+        """Test index par magasin construit en une passe et mis en cache"""
+        # Arrange
+        responses.add(
+            responses.GET,
+            f"{self.client.base_url}/api/v1/ventes-ddd/",
+            json={
+                "success": True,
+                "ventes": [
+                    {"id": "v1", "magasin_id": "m1"},
+                    {"id": "v2", "magasin_id": "m2"},
+                    {"id": "v3", "magasin_id": "m1"},
+                ],
+            },
+            status=200,
+        )
+
+        # Act
+        index = self.client.obtenir_ventes_groupees_par_magasin()
+        self.client.obtenir_ventes_groupees_par_magasin()
+
+        # Assert
+        assert [v["id"] for v in index["m1"]] == ["v1", "v3"]
+        assert [v["id"] for v in index["m2"]] == ["v2"]
+        assert len(responses.calls) == 1
+
+    @responses.activate
+    def test_content_type_seulement_avec_un_corps(self):
+        """Test que seuls les appels avec corps JSON envoient Content-Type"""
+        # Arrange
+        responses.add(
+            responses.GET,
+            f"{self.client.base_url}/api/v1/ventes-ddd/v1/",
+            json={"success": True},
+            status=200,
+        )
+        responses.add(
+            responses.PATCH,
+            f"{self.client.base_url}/api/v1/ventes-ddd/v1/annuler/",
+            json={"success": True},
+            status=200,
+        )
+
+        # Act
+        self.client.consulter_vente("v1")
+        self.client.annuler_vente("v1", "Erreur de saisie")
+
+        # Assert
+        get, patch_ = (call.request for call in responses.calls)
+        assert "Content-Type" not in get.headers
+        assert patch_.headers["Content-Type"] == "application/json"
+
+    @responses.activate
+    def test_generer_indicateurs_cache_invalide_par_vente(self):
+        """Test cache TTL des indicateurs, invalidé par un enregistrement de vente"""
+        # Arrange
+        responses.add(
+            responses.GET,
+            f"{self.client.base_url}/api/v1/indicateurs/",
+            json={"success": True, "indicateurs": []},
+            status=200,
+        )
+        responses.add(
+            responses.POST,
+            f"{self.client.base_url}/api/v1/ventes-ddd/enregistrer/",
+            json={"success": True, "vente_id": "vente-1"},
+            status=201,
+        )
+
+        # Act
+        self.client.generer_indicateurs()
+        CommandesClient().generer_indicateurs()
+        appels_avant_vente = len(responses.calls)
+        self.client.enregistrer_vente("mag-1", "prod-1", 1, "client-1")
+        self.client.generer_indicateurs()
+
+        # Assert
+        assert appels_avant_vente == 1
+        assert len(responses.calls) == 3
+
 
 @pytest.mark.integration
 class TestSupplyChainClientIntegration:
@@ -334,6 +533,41 @@ class TestSupplyChainClientIntegration:
         assert result["success"] is True
         assert len(result["demandes"]) == 2
 
+    @responses.activate
+    def test_obtenir_statistiques_workflow_top_produits(self):
+        """Test agrégation en une passe et top produits par nombre de demandes"""
+        # Arrange
+        responses.add(
+            responses.GET,
+            f"{self.client.base_url}/api/ddd/supply-chain/demandes-en-attente/",
+            json={
+                "success": True,
+                "demandes": [
+                    {"produit_id": "p1", "quantite": 10},
+                    {
+                        "produit_id": "p2",
+                        "quantite": 80,
+                        "est_quantite_importante": True,
+                    },
+                    {"produit_id": "p1", "quantite": 5},
+                ],
+            },
+            status=200,
+        )
+
+        # Act
+        stats = self.client.obtenir_statistiques_workflow()
+
+        # Assert
+        assert stats["total_demandes"] == 3
+        assert stats["demandes_importantes"] == 1
+        assert stats["quantite_totale_demandee"] == 95
+        assert stats["produits_uniques"] == 2
+        assert stats["produits_les_plus_demandes"][0] == (
+            "p1",
+            {"count": 2, "quantite_totale": 15},
+        )
+
 
 @pytest.mark.integration
 class TestEcommerceClientIntegration:
@@ -444,3 +678,78 @@ class TestClientsErrorHandling:
                 assert client.session is not None
                 assert hasattr(client, "base_url")
                 assert client.base_url.startswith("http")
+
+    def test_session_partagee_entre_instances(self):
+        """Test que les clients réutilisent la session keep-alive du module"""
+        for client_cls in (
+            CatalogueClient,
+            InventaireClient,
+            CommandesClient,
+            SupplyChainClient,
+            EcommerceClient,
+        ):
+            assert client_cls().session is client_cls().session
+
+    def test_timeout_transmis_a_chaque_appel(self):
+        """Test que chaque appel borne la connexion et la lecture"""
+        appels = [
+            (CatalogueClient, "health_check", "get", ()),
+            (CommandesClient, "consulter_vente", "get", ("id-1",)),
+            (EcommerceClient, "valider_client", "get", ("id-1",)),
+            (InventaireClient, "health_check", "get", ()),
+            (InventaireClient, "lister_demandes_par_magasin", "get", ("id-1",)),
+            (InventaireClient, "diminuer_stock", "post", ("id-1", 2)),
+            (InventaireClient, "approuver_demande", "put", ("id-1",)),
+            (InventaireClient, "supprimer_demande", "delete", ("id-1",)),
+            (SupplyChainClient, "valider_demande", "post", ("id-1",)),
+            (SupplyChainClient, "rejeter_demande", "post", ("id-1", "motif")),
+        ]
+        for client_cls, methode, verbe, args in appels:
+            client = client_cls(timeout=(0.5, 2.0))
+            with patch.object(client.session, verbe) as mock_appel:
+                mock_appel.side_effect = requests.exceptions.Timeout("Read timeout")
+                getattr(client, methode)(*args)
+                assert mock_appel.call_args.kwargs["timeout"] == (0.5, 2.0)
+
+    def test_prechauffer_ne_propage_pas_les_erreurs(self):
+        """Test que le préchauffage au démarrage ne lève jamais"""
+        client = CatalogueClient()
+        with patch.object(client.session, "head") as mock_head:
+            mock_head.side_effect = requests.exceptions.ConnectionError("Kong down")
+            assert client.prechauffer() is False
+
+    def test_retry_borne_et_limite_aux_methodes_idempotentes(self):
+        """Test que les POST ne sont jamais rejoués et que le backoff est plafonné"""
+        retry = creer_adaptateur().max_retries
+        assert "POST" not in retry.allowed_methods
+        assert {"GET", "PUT", "DELETE"} <= set(retry.allowed_methods)
+        assert retry.get_backoff_time() <= retry.backoff_max
+
+    def test_singleflight_un_seul_appel_pour_des_requetes_concurrentes(self):
+        """Test que des appels concurrents sur la même clé partagent un appel"""
+        import threading
+        import time
+        from concurrent.futures import ThreadPoolExecutor
+        from magasin.infrastructure._http import _Singleflight
+
+        singleflight = _Singleflight()
+        liberer = threading.Event()
+        appels = []
+
+        def appel_lent():
+            appels.append(1)
+            liberer.wait(timeout=5)
+            return {"success": True}
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            futures = [
+                executor.submit(singleflight.executer, "stocks", appel_lent)
+                for _ in range(4)
+            ]
+            # Laisser les autres threads rejoindre l'appel en vol
+            time.sleep(0.2)
+            liberer.set()
+            resultats = [future.result() for future in futures]
+
+        assert len(appels) == 1
+        assert all(r == {"success": True} for r in resultats)
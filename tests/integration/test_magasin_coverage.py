@@ -329,7 +329,7 @@ class TestMagasinCoverageConfiguration:
             assert client.session is not None
             assert hasattr(client, "base_url")
             assert client.base_url.startswith("http")
-            assert "Content-Type" in client.session.headers
+            assert "Accept" in client.session.headers
             assert "X-API-Key" in client.session.headers
 
     def test_urls_configuration(self):
@@ -363,6 +363,23 @@ class TestMagasinCoverageConfiguration:
         # Doit avoir des handlers configurés (au moins console)
         assert len(logger.handlers) > 0 or len(logging.getLogger().handlers) > 0
 
+    def test_logging_format_json_avec_extra(self):
+        """Test que chaque log est une ligne JSON valide incluant les champs extra"""
+        import json
+        import logging
+        from magasin.log_formatter import OrjsonFormatter
+
+        record = logging.LogRecord(
+            "magasin", logging.INFO, __file__, 1, 'Fin de "requête"', (), None
+        )
+        record.status_code = 200
+
+        ligne = json.loads(OrjsonFormatter().format(record))
+
+        assert ligne["message"] == 'Fin de "requête"'
+        assert ligne["status_code"] == 200
+        assert ligne["level"] == "INFO"
+
 
 @pytest.mark.integration
 class TestMagasinCoverageMetrics: